@@ -93,6 +93,11 @@ apply_sql "sql/custom_fields_table.sql" "Creating custom fields table"
 # Poller enhancements (polling address, DNS config)
 apply_sql "sql/patches/20251030_add_poll_address.sql" "Applying poller address patch"
 apply_sql "sql/patches/20251030_add_sanitization_rules_setting.sql" "Seeding poller sanitization rules"
+apply_sql "sql/patches/20261017_add_poll_interval.sql" "Adding per-asset poll interval"
+apply_sql "sql/patches/20261017_add_poll_ssh_auth_options.sql" "Adding per-asset SSH auth options"
+apply_sql "sql/patches/20261017_add_poller_leases.sql" "Creating poller lease queue"
+apply_sql "sql/patches/20261017_add_poller_breakers.sql" "Creating poller circuit breakers"
+apply_sql "sql/patches/20261017_add_poller_capabilities.sql" "Creating poller capability cache"
 
 # Admin user
 apply_sql "sql/admin_user.sql" "Creating admin user"
@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+"""Micro-benchmarks for the poller's command output parsers.
+
+Every file under ``bench_corpus/<parser>/`` is recorded output from a real
+platform (Linux, *BSD, macOS, IOS, IOS-XE, NX-OS); the ``huge/*`` cases are
+generated here to cover 500-port switches and hosts with thousands of mounts.
+For each case the script reports throughput and the peak memory allocated by
+a single parse, and can compare a run against a saved baseline:
+
+    python3 bench_parsers.py --json > baseline.json
+    python3 bench_parsers.py --baseline baseline.json --tolerance 0.25
+
+The comparison exits with status 1 when a case got slower or allocates more
+than the tolerance allows, so it can gate a CI job. So does any case that
+parses to no records unless it is listed in ``EXPECTED_EMPTY``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from poller_db import parse_df_output, parse_ifconfig, parse_key_value_lines, parse_uptime_load
+from cisco_collectors import (
+    _parse_interface_brief,
+    _parse_ipv6_interface_brief,
+    _parse_show_version,
+    _parse_vrf_table,
+)
+
+CORPUS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "bench_corpus")
+
+PARSERS: Dict[str, Callable[[str], Any]] = {
+    "ifconfig": parse_ifconfig,
+    "df": parse_df_output,
+    "uptime": parse_uptime_load,
+    "os_release": parse_key_value_lines,
+    "show_version": _parse_show_version,
+    "interface_brief": _parse_interface_brief,
+    "ipv6_brief": _parse_ipv6_interface_brief,
+    "vrf": _parse_vrf_table,
+}
+
+# Minimum wall time spent timing each case when --iterations is not given
+DEFAULT_MIN_TIME = 0.2
+
+
+def _huge_interface_brief(ports: int = 500) -> str:
+    lines = ["Interface              IP-Address      OK? Method Status                Protocol"]
+    for vlan in range(1, 65):
+        lines.append(f"Vlan{vlan:<19}10.{vlan}.0.1       YES NVRAM  up                    up")
+    for index in range(ports):
+        member, port = divmod(index, 48)
+        status = "up                    up" if index % 3 else "down                  down"
+        lines.append(f"GigabitEthernet{member + 1}/0/{port + 1:<6} unassigned      YES unset  {status}")
+    return "\n".join(lines) + "\n"
+
+
+def _huge_ipv6_brief(ports: int = 500) -> str:
+    lines = []
+    for index in range(ports):
+        member, port = divmod(index, 48)
+        lines.append(f"GigabitEthernet{member + 1}/0/{port + 1:<6}[up/up]")
+        if index % 4:
+            lines.append("    unassigned")
+        else:
+            lines.append(f"    FE80::2ACB:EBFF:FE31:{index:04X}")
+            lines.append(f"    2001:DB8:{index:X}::1")
+    return "\n".join(lines) + "\n"
+
+
+def _huge_vrf(count: int = 300) -> str:
+    # NX-OS layout: names start in column 0, which is what _parse_vrf_table reads
+    lines = ["VRF-Name                           VRF-ID State   Reason"]
+    for index in range(count):
+        lines.append(f"tenant-{index:<28}{index + 3:>6} Up      --")
+    return "\n".join(lines) + "\n"
+
+
+def _huge_df(mounts: int = 2000) -> str:
+    lines = [
+        "Filesystem     1024-blocks      Used Available Capacity Mounted on",
+        "/dev/nvme0n1p2   479597248 201334108 253827880      45% /",
+    ]
+    for index in range(mounts):
+        lines.append(
+            f"overlay          479597248 201334108 253827880      45% "
+            f"/var/lib/docker/overlay2/{index:064x}/merged"
+        )
+    return "\n".join(lines) + "\n"
+
+
+def _huge_ifconfig(count: int = 400) -> str:
+    lines = [
+        "eth0: flags=4163<UP,BROADCAST,RUNNING,MULTICAST>  mtu 1500",
+        "        inet 10.0.0.15  netmask 255.255.255.0  broadcast 10.0.0.255",
+        "        ether 52:54:00:12:34:56  txqueuelen 1000  (Ethernet)",
+    ]
+    for index in range(count):
+        lines.extend([
+            f"veth{index:07x}: flags=4163<UP,BROADCAST,RUNNING,MULTICAST>  mtu 1500",
+            f"        inet6 fe80::{index:x}:ff:fe00:1  prefixlen 64  scopeid 0x20<link>",
+            f"        ether 02:42:{index >> 8 & 0xff:02x}:{index & 0xff:02x}:00:01  txqueuelen 0  (Ethernet)",
+            "        RX packets 1024  bytes 65536 (64.0 KiB)",
+            "        TX packets 2048  bytes 131072 (128.0 KiB)",
+        ])
+    return "\n".join(lines) + "\n"
+
+
+# Recorded outputs the parser cannot read yet; every other case must parse to
+# at least one record, so a benchmark never silently times a no-op.
+EXPECTED_EMPTY = {
+    "ipv6_brief/nxos",  # multi-column NX-OS layout with a VRF banner
+    "uptime/macos",  # "load averages:" wording
+    "vrf/ios",  # IOS indents every row
+}
+
+GENERATED_CASES: Dict[str, Tuple[str, Callable[[], str]]] = {
+    "interface_brief/huge_500_ports": ("interface_brief", _huge_interface_brief),
+    "ipv6_brief/huge_500_ports": ("ipv6_brief", _huge_ipv6_brief),
+    "vrf/huge_300_vrfs": ("vrf", _huge_vrf),
+    "df/huge_2000_mounts": ("df", _huge_df),
+    "ifconfig/huge_400_veths": ("ifconfig", _huge_ifconfig),
+}
+
+
+def load_cases(pattern: Optional[str] = None) -> List[Tuple[str, str, str]]:
+    """``(case, parser, text)`` for every recorded and generated case matching ``pattern``."""
+    cases = []
+    for parser in sorted(PARSERS):
+        directory = os.path.join(CORPUS_DIR, parser)
+        if not os.path.isdir(directory):
+            continue
+        for filename in sorted(os.listdir(directory)):
+            path = os.path.join(directory, filename)
+            with open(path, "r", encoding="utf-8") as handle:
+                cases.append((f"{parser}/{os.path.splitext(filename)[0]}", parser, handle.read()))
+    for case, (parser, generate) in GENERATED_CASES.items():
+        cases.append((case, parser, generate()))
+    if pattern:
+        cases = [entry for entry in cases if pattern in entry[0]]
+    return cases
+
+
+def _result_size(result: Any) -> int:
+    if result is None:
+        return 0
+    if isinstance(result, (list, dict)):
+        return len(result)
+    return 1
+
+
+def measure(func: Callable[[str], Any], text: str, iterations: Optional[int] = None) -> Dict[str, Any]:
+    """Time ``func(text)`` and measure the memory one call allocates at its peak."""
+    result = func(text)
+    if not iterations:
+        # Grow the loop until it runs long enough to time reliably
+        iterations = 1
+        while True:
+            started = time.perf_counter()
+            for _ in range(iterations):
+                func(text)
+            if time.perf_counter() - started >= DEFAULT_MIN_TIME / 10:
+                break
+            iterations *= 2
+        iterations *= 10
+    started = time.perf_counter()
+    for _ in range(iterations):
+        func(text)
+    elapsed = time.perf_counter() - started
+
+    tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        baseline, _ = tracemalloc.get_traced_memory()
+        func(text)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    size = len(text.encode("utf-8"))
+    per_op = elapsed / iterations
+    return {
+        "bytes": size,
+        "records": _result_size(result),
+        "iterations": iterations,
+        "us_per_op": per_op * 1e6,
+        "mb_per_s": size / per_op / 1e6 if per_op else 0.0,
+        "peak_alloc": max(0, peak - baseline),
+    }
+
+
+def run(cases: Iterable[Tuple[str, str, str]], iterations: Optional[int] = None) -> Dict[str, Dict[str, Any]]:
+    return {case: measure(PARSERS[parser], text, iterations) for case, parser, text in cases}
+
+
+def empty_cases(results: Dict[str, Dict[str, Any]]) -> List[str]:
+    """Cases that parsed to no records without being listed in ``EXPECTED_EMPTY``."""
+    return [case for case, row in results.items() if not row["records"] and case not in EXPECTED_EMPTY]
+
+
+def compare(results: Dict[str, Dict[str, Any]], baseline: Dict[str, Dict[str, Any]], tolerance: float) -> List[str]:
+    """Regressions of ``results`` against ``baseline`` beyond ``tolerance`` (a fraction)."""
+    regressions = []
+    for case, current in results.items():
+        previous = baseline.get(case)
+        if not previous:
+            continue
+        if current["records"] != previous.get("records", current["records"]):
+            regressions.append(f"{case}: parsed {current['records']} records, baseline {previous['records']}")
+        for key, label in (("us_per_op", "time"), ("peak_alloc", "allocation")):
+            before = previous.get(key) or 0
+            if before and current[key] > before * (1 + tolerance):
+                regressions.append(f"{case}: {label} {current[key]:.1f} vs baseline {before:.1f} (+{(current[key] / before - 1) * 100:.0f}%)")
+    return regressions
+
+
+def _print_table(results: Dict[str, Dict[str, Any]]) -> None:
+    header = f"{'case':<34} {'bytes':>9} {'records':>7} {'iters':>7} {'us/op':>10} {'MB/s':>8} {'peak KiB':>9}"
+    print(header)
+    print("-" * len(header))
+    for case, row in results.items():
+        print(
+            f"{case:<34} {row['bytes']:>9} {row['records']:>7} {row['iterations']:>7} "
+            f"{row['us_per_op']:>10.1f} {row['mb_per_s']:>8.1f} {row['peak_alloc'] / 1024:>9.1f}"
+        )
+
+
+def main(argv: Optional[Iterable[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the poller's output parsers")
+    parser.add_argument("--filter", help="Only run cases whose name contains this text, e.g. 'df/' or 'huge'")
+    parser.add_argument("--iterations", type=int, help="Fixed iteration count per case (default: auto)")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON, e.g. to save a baseline")
+    parser.add_argument("--baseline", help="JSON results of an earlier run to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed slowdown as a fraction (default 0.25)")
+    args = parser.parse_args(list(argv) if argv is not None else None)
+
+    cases = load_cases(args.filter)
+    if not cases:
+        print("No benchmark cases matched", file=sys.stderr)
+        return 2
+    results = run(cases, args.iterations)
+
+    if args.json:
+        print(json.dumps(results, indent=2, sort_keys=True))
+    else:
+        _print_table(results)
+
+    empty = empty_cases(results)
+    for case in empty:
+        print(f"EMPTY {case}: parsed 0 records; fix the input or add it to EXPECTED_EMPTY", file=sys.stderr)
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as handle:
+            regressions = compare(results, json.load(handle), args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}", file=sys.stderr)
+        if regressions:
+            return 1
+    return 1 if empty else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
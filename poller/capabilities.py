@@ -0,0 +1,99 @@
+import threading
+from typing import Any, Callable, Dict, Optional
+
+__all__ = ["CapabilityCache"]
+
+
+class CapabilityCache:
+    """Which command variant works on each asset, e.g. ``ifconfig -a`` over ``ip -j``.
+
+    Collectors try their variants in a fixed order; once one has worked the
+    probe goes straight to it on later polls instead of re-running the ones
+    that fail. Entries are tied to the asset's OS family and kernel release
+    and are dropped when either changes. State is kept in memory and written
+    through to ``poller_capabilities`` so it survives restarts.
+    """
+
+    def __init__(self, connect: Callable[[], Any], log: Optional[Callable[..., None]] = None) -> None:
+        self._connect = connect
+        self._log = log or (lambda level, message, target=None: None)
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def _execute(self, sql: str, params: tuple) -> None:
+        # Persistence is best effort: a failed write only costs a rediscovery
+        # after the next restart, so it must never fail the probe.
+        try:
+            conn = self._connect()
+            try:
+                conn.cursor().execute(sql, params)
+                conn.commit()
+            finally:
+                conn.close()
+        except Exception as exc:
+            self._log('error', f"Failed to persist poller capabilities: {exc}")
+
+    def load(self) -> int:
+        """Read the persisted capabilities; returns the number of assets loaded."""
+        conn = self._connect()
+        try:
+            cursor = conn.cursor()
+            cursor.execute("SELECT asset_id, capability, variant, os_family, kernel_release FROM poller_capabilities")
+            rows = cursor.fetchall()
+        finally:
+            conn.close()
+        entries: Dict[str, Dict[str, Any]] = {}
+        for asset_id, capability, variant, os_family, kernel_release in rows:
+            entry = entries.setdefault(str(asset_id), {"fingerprint": (os_family or "", kernel_release or ""), "variants": {}})
+            entry["variants"][capability] = variant
+        with self._lock:
+            self._entries = entries
+        return len(entries)
+
+    def known(self, asset_id: Any) -> Dict[str, str]:
+        """Recorded variants without checking the fingerprint, e.g. to plan a prefetch."""
+        with self._lock:
+            entry = self._entries.get(str(asset_id))
+            return dict(entry["variants"]) if entry else {}
+
+    def variants(self, asset_id: Any, os_family: Any, kernel_release: Any) -> Dict[str, str]:
+        """Recorded variants for the asset, dropped first if its OS or kernel changed."""
+        asset_id = str(asset_id)
+        fingerprint = (str(os_family or ""), str(kernel_release or ""))
+        with self._lock:
+            entry = self._entries.get(asset_id)
+            if entry is None:
+                return {}
+            if entry["fingerprint"] == fingerprint:
+                return dict(entry["variants"])
+            del self._entries[asset_id]
+        self._log('info', f"OS or kernel changed on asset {asset_id}; rediscovering command variants", asset_id)
+        self._execute("DELETE FROM poller_capabilities WHERE asset_id = %s", (asset_id,))
+        return {}
+
+    def update(self, asset_id: Any, os_family: Any, kernel_release: Any, variants: Dict[str, str]) -> None:
+        """Record the variants that worked in this probe, persisting only changes."""
+        asset_id = str(asset_id)
+        fingerprint = (str(os_family or ""), str(kernel_release or ""))
+        with self._lock:
+            entry = self._entries.setdefault(asset_id, {"fingerprint": fingerprint, "variants": {}})
+            entry["fingerprint"] = fingerprint
+            changed = {
+                capability: variant
+                for capability, variant in variants.items()
+                if entry["variants"].get(capability) != variant
+            }
+            entry["variants"].update(changed)
+        for capability, variant in changed.items():
+            self._execute(
+                """
+                INSERT INTO poller_capabilities (asset_id, capability, variant, os_family, kernel_release, updated_at)
+                VALUES (%s, %s, %s, %s, %s, NOW())
+                ON DUPLICATE KEY UPDATE
+                    variant = VALUES(variant),
+                    os_family = VALUES(os_family),
+                    kernel_release = VALUES(kernel_release),
+                    updated_at = VALUES(updated_at)
+                """,
+                (asset_id, capability, variant, fingerprint[0], fingerprint[1]),
+            )
@@ -1,10 +1,15 @@
+import codecs
+import json
 import re
+import select
 import time
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
 
 import paramiko
 
-__all__ = ["collect_cisco_asset", "CiscoProbeError"]
+from ssh_stream import DEFAULT_OUTPUT_LIMIT
+
+__all__ = ["collect_cisco_asset", "open_cisco_session", "CiscoProbeError", "CiscoSession", "CiscoShell"]
 
 
 class CiscoProbeError(RuntimeError):
@@ -12,17 +17,36 @@ class CiscoProbeError(RuntimeError):
 
 
 _PROMPT_RE = re.compile(r"[>#] ?$")
+_PASSWORD_RE = re.compile(r"[Pp]assword: ?$")
+# Errors meaning the device does not know a command, as opposed to e.g. an
+# authorization failure that may pass on the next poll
+_UNSUPPORTED_RE = re.compile(r"% ?(?:Invalid (?:input|command)|Ambiguous command|Incomplete command)|Unrecognized command")
 _READ_CHUNK = 8192
+# Longest line still examined as a possible prompt
+_PROMPT_TAIL = 256
 _DEFAULT_TIMEOUT = 10
+# Interface table commands, tried in this order; the last one works everywhere
+_INTERFACE_BRIEF_VARIANTS = ("show ip interface brief vrf all", "show ip interface brief")
+# Capability key of a rejected command; the value is the CLI mode it failed in
+_UNSUPPORTED_PREFIX = "unsupported:"
+# Capability key recorded when the device's echoes defeat pipelining; the
+# value is the CLI mode, as for rejected commands
+_PIPELINE_UNSUPPORTED = "pipeline:unsupported"
+
 
+def open_cisco_session(target: Dict[str, Any]) -> "CiscoSession":
+    """Log in to a Cisco device and return a shell ready for show commands.
 
-def collect_cisco_asset(target: Dict[str, Any]) -> Dict[str, Any]:
+    Paging is disabled, the prompt learned and, given an enable password,
+    privileged mode entered.
+    """
     host = target.get("host")
     username = target.get("username")
     password = target.get("password")
     port = int(target.get("port") or 22)
     enable_password = target.get("enable_password") or target.get("enablePassword")
     timeout = int(target.get("timeout") or _DEFAULT_TIMEOUT)
+    output_limit = int(target.get("output_limit") or DEFAULT_OUTPUT_LIMIT)
 
     if not host:
         raise CiscoProbeError("Missing host for Cisco target")
@@ -42,41 +66,144 @@ def collect_cisco_asset(target: Dict[str, Any]) -> Dict[str, Any]:
             port=port,
             username=username,
             password=password,
-            allow_agent=False,
-            look_for_keys=False,
+            allow_agent=bool(target.get("allow_agent")),
+            look_for_keys=bool(target.get("look_for_keys")),
             timeout=timeout,
         )
-        shell = ssh.invoke_shell()
-        try:
-            _read_until_prompt(shell, timeout)
-            _run_command(shell, "terminal length 0", timeout)
-
-            enabled = False
-            if enable_password:
-                enabled = _try_enable(shell, enable_password, timeout)
-                if not enabled:
-                    warnings.append("Enable password may be invalid; continuing without privilege mode")
-            else:
-                # Attempt enable without password to detect if prompt already privileged
-                enabled = _is_privileged_prompt(shell)
+        channel = ssh.invoke_shell()
+        shell = CiscoShell(channel, timeout, output_limit)
+        shell.read_until_prompt()
+        shell.run("terminal length 0")
+        # The banner is behind us now, so the prompt line is the real one
+        shell.learn_prompt()
+
+        if enable_password and not shell.privileged:
+            if not shell.enable(enable_password):
+                warnings.append("Enable password may be invalid; continuing without privilege mode")
+    except Exception as exc:
+        ssh.close()
+        if isinstance(exc, CiscoProbeError):
+            raise
+        raise CiscoProbeError(str(exc)) from exc
+    return CiscoSession(ssh, channel, shell, warnings)
 
-            show_version = _run_command(shell, "show version", timeout)
-            show_inventory = _run_command(shell, "show inventory", timeout, allow_failure=True)
 
-            int_brief = _run_command(shell, "show ip interface brief vrf all", timeout, allow_failure=True)
-            if not int_brief.strip():
-                int_brief = _run_command(shell, "show ip interface brief", timeout)
+def collect_cisco_asset(target: Dict[str, Any], session: Optional["CiscoSession"] = None) -> Dict[str, Any]:
+    """Run the show commands on a Cisco device and normalise them into an asset payload.
 
-            int_desc = _run_command(shell, "show interface description", timeout, allow_failure=True)
-            ipv6_brief = _run_command(shell, "show ipv6 interface brief", timeout, allow_failure=True)
-            vrf_table = _run_command(shell, "show vrf", timeout, allow_failure=True)
+    Without ``session`` the probe logs in and out again; a session kept by
+    the caller (see ``cisco_sessions``) is used as is and left open.
+    """
+    host = target.get("host")
+    timeout = int(target.get("timeout") or _DEFAULT_TIMEOUT)
+    output_limit = int(target.get("output_limit") or DEFAULT_OUTPUT_LIMIT)
+    # Tiers the poller needs this cycle; show version is always run since it
+    # carries the uptime used to detect reboots.
+    tiers = target.get("collect_tiers")
+    collect_hardware = tiers is None or "hardware" in tiers
+    collect_network = tiers is None or "network" in tiers
+    # Send the show commands in one write instead of waiting for each prompt
+    pipeline = bool(target.get("pipeline"))
+    # Ask for "| json" output where the device supports it; what was learned
+    # is recorded in this dict, which the poller keeps per device
+    structured = target.get("structured", True)
+    capabilities = target.get("capabilities")
+    if capabilities is None:
+        capabilities = {}
+
+    own_session = session is None
+    try:
+        if own_session:
+            session = open_cisco_session(target)
+        try:
+            shell = session.shell
+            shell.timeout = timeout
+            shell.output_limit = output_limit
+            shell.warnings = []
+            shell.rejected = set()
+            warnings: List[str] = list(session.warnings)
+
+            # Commands, in the form sent, that this device rejects. Rejections
+            # depend on privilege, so a record only applies in the same mode.
+            mode = "enable" if shell.privileged else "user"
+            unsupported = {
+                key[len(_UNSUPPORTED_PREFIX):]
+                for key, value in capabilities.items()
+                if key.startswith(_UNSUPPORTED_PREFIX) and value == mode
+            }
 
-            version_info = _parse_show_version(show_version)
-            inventory_info = _parse_show_inventory(show_inventory) if show_inventory else {}
-            interfaces = _parse_interface_brief(int_brief)
-            descriptions = _parse_interface_descriptions(int_desc)
-            ipv6_interfaces = _parse_ipv6_interface_brief(ipv6_brief)
-            vrfs = _parse_vrf_table(vrf_table)
+            outputs: Dict[str, str] = {}
+            output_format = capabilities.get("output") if structured else "text"
+            if output_format is None:
+                # Learned once per device: NX-OS answers in JSON, IOS rejects the pipe
+                outputs["show version | json"] = shell.run("show version | json", allow_failure=True)
+                output_format = "json" if _load_json(outputs["show version | json"]) is not None else "text"
+                capabilities["output"] = output_format
+            suffix = " | json" if output_format == "json" else ""
+
+            def form(command: str) -> Optional[str]:
+                """The form of ``command`` to send, or None when the device rejects it."""
+                for candidate in (command + suffix, command):
+                    if candidate not in unsupported or command == "show version":
+                        return candidate
+                return None
+
+            brief = capabilities.get("interface_brief") or _INTERFACE_BRIEF_VARIANTS[0]
+            if brief not in _INTERFACE_BRIEF_VARIANTS or form(brief) is None:
+                brief = _INTERFACE_BRIEF_VARIANTS[-1]
+
+            commands = ["show version"]
+            if collect_hardware:
+                commands.append("show inventory")
+            if collect_network:
+                commands.extend([brief, "show interface description", "show ipv6 interface brief", "show vrf"])
+            sent = [form(command) for command in commands]
+            pending = [command for command in sent if command is not None and command not in outputs]
+            required = [form("show version")]
+            fetched = None
+            if pipeline and capabilities.get(_PIPELINE_UNSUPPORTED) != mode:
+                fetched = shell.run_batch(pending, required=required)
+                if fetched is None and shell.echoes_typeahead is False:
+                    # Every command already ran once; go straight to serial on later polls
+                    capabilities[_PIPELINE_UNSUPPORTED] = mode
+            if fetched is None:
+                fetched = {command: shell.run(command, allow_failure=command not in required) for command in pending}
+            outputs.update(fetched)
+
+            if collect_network and brief != _INTERFACE_BRIEF_VARIANTS[-1] and not outputs.get(form(brief), "").strip():
+                # Empty or rejected; the last variant works everywhere
+                brief = _INTERFACE_BRIEF_VARIANTS[-1]
+                outputs[form(brief)] = shell.run(form(brief), allow_failure=form(brief) != brief)
+
+            def parse(command: str, parser: Callable[[str], Any]) -> Any:
+                chosen = form(command)
+                if chosen is None:
+                    return parser("")
+                output = outputs.get(chosen, "")
+                if chosen == command:
+                    return parser(output)
+                document = _load_json(output)
+                if document is not None:
+                    return _JSON_PARSERS[command](document)
+                if not output.strip() and chosen not in shell.rejected:
+                    return parser("")
+                # Rejected, or not JSON after all (e.g. cut off by the output limit); use the text form
+                if command not in unsupported:
+                    outputs[command] = shell.run(command, allow_failure=command != "show version")
+                return parser(outputs.get(command, ""))
+
+            version_info = parse("show version", _parse_show_version)
+            inventory_info = parse("show inventory", _parse_show_inventory) if collect_hardware else {}
+            interfaces = parse(brief, _parse_interface_brief) if collect_network else []
+            descriptions = parse("show interface description", _parse_interface_descriptions) if collect_network else {}
+            ipv6_interfaces = parse("show ipv6 interface brief", _parse_ipv6_interface_brief) if collect_network else {}
+            vrfs = parse("show vrf", _parse_vrf_table) if collect_network else []
+
+            if collect_network and interfaces:
+                capabilities["interface_brief"] = brief
+            for command in shell.rejected:
+                if not command.startswith("show version"):
+                    capabilities[_UNSUPPORTED_PREFIX + command] = mode
 
             interface_index = {iface["name"]: iface for iface in interfaces}
             for name, data in ipv6_interfaces.items():
@@ -180,102 +307,262 @@ def collect_cisco_asset(target: Dict[str, Any]) -> Dict[str, Any]:
                 "applications": None,
                 "probe_source": "cisco-ssh",
             }
+            warnings.extend(shell.warnings)
             if warnings:
                 result["warnings"] = warnings
 
             return result
         finally:
-            try:
-                shell.close()
-            except Exception:
-                pass
+            if own_session:
+                session.close()
     except (paramiko.AuthenticationException, paramiko.SSHException) as exc:
         raise CiscoProbeError(str(exc)) from exc
     except Exception as exc:  # pragma: no cover - network/runtime dependent
         raise CiscoProbeError(str(exc)) from exc
-    finally:
-        ssh.close()
 
 
-def _run_command(channel: paramiko.Channel, command: str, timeout: int, allow_failure: bool = False) -> str:
-    channel.send(command + "\n")
-    time.sleep(0.1)
-    raw = _read_until_prompt(channel, timeout)
-    output = _strip_command_output(command, raw)
-    cleaned = output.strip()
-    if cleaned.startswith("%") or "Invalid input" in cleaned or "Ambiguous" in cleaned:
-        if allow_failure:
-            return ""
-        raise CiscoProbeError(f"Command '{command}' failed: {cleaned}")
-    return output
-
-
-def _try_enable(channel: paramiko.Channel, enable_password: str, timeout: int) -> bool:
-    before = _read_remaining(channel)
-    channel.send("enable\n")
-    time.sleep(0.1)
-    prompt = _read_until(channel, "Password", timeout)
-    if "Password" in prompt:
-        channel.send(enable_password + "\n")
-        time.sleep(0.2)
-    response = _read_until_prompt(channel, timeout)
-    if "Password" in response and "%" in response:
-        return False
-    return _is_privileged_prompt(channel)
-
-
-def _is_privileged_prompt(channel: paramiko.Channel) -> bool:
-    snapshot = _read_remaining(channel)
-    last_line = snapshot.strip().splitlines()[-1] if snapshot.strip() else ""
-    return last_line.endswith("#")
-
-
-def _read_until_prompt(channel: paramiko.Channel, timeout: int) -> str:
-    end = time.time() + timeout
-    buf = ""
-    while time.time() < end:
-        if channel.recv_ready():
-            chunk = channel.recv(_READ_CHUNK).decode("utf-8", "ignore")
-            buf += chunk
-            if _PROMPT_RE.search(buf.splitlines()[-1] if buf.splitlines() else ""):
-                time.sleep(0.1)
-                while channel.recv_ready():
-                    buf += channel.recv(_READ_CHUNK).decode("utf-8", "ignore")
-                break
-        else:
-            time.sleep(0.1)
-    return buf
+class CiscoSession:
+    """A logged-in CLI session: the SSH client, its shell channel and the ``CiscoShell`` on it.
 
+    ``warnings`` holds what the login noticed, such as a rejected enable
+    secret, so every probe run on the session can report it.
+    """
 
-def _read_remaining(channel: paramiko.Channel) -> str:
-    buf = ""
-    while channel.recv_ready():
-        buf += channel.recv(_READ_CHUNK).decode("utf-8", "ignore")
-    return buf
+    def __init__(self, client: Any, channel: Any, shell: "CiscoShell", warnings: Optional[List[str]] = None) -> None:
+        self.client = client
+        self.channel = channel
+        self.shell = shell
+        self.warnings = list(warnings or [])
 
+    @property
+    def alive(self) -> bool:
+        transport = self.client.get_transport()
+        if transport is None or not transport.is_active():
+            return False
+        return not self.channel.closed and not self.channel.exit_status_ready()
 
-def _read_until(channel: paramiko.Channel, marker: str, timeout: int) -> str:
-    end = time.time() + timeout
-    buf = ""
-    while time.time() < end:
-        if channel.recv_ready():
-            chunk = channel.recv(_READ_CHUNK).decode("utf-8", "ignore")
-            buf += chunk
-            if marker in buf:
-                break
-        else:
-            time.sleep(0.1)
-    return buf
+    def close(self) -> None:
+        for closable in (self.channel, self.client):
+            try:
+                closable.close()
+            except Exception:
+                pass
 
 
-def _strip_command_output(command: str, output: str) -> str:
+class CiscoShell:
+    """Interactive CLI session on a Cisco device's SSH shell channel.
+
+    Reads block in ``select`` until the channel has data, so a command
+    returns as soon as the prompt arrives rather than on the next polling
+    tick. The device's prompt is learned from the first command, after
+    which only a line that is exactly that prompt (in any mode) ends a
+    command's output.
+    """
+
+    def __init__(
+        self,
+        channel: paramiko.Channel,
+        timeout: int = _DEFAULT_TIMEOUT,
+        output_limit: int = DEFAULT_OUTPUT_LIMIT,
+    ) -> None:
+        self.channel = channel
+        self.timeout = timeout
+        self.output_limit = output_limit
+        self.warnings: List[str] = []
+        # Commands the device answered with "% Invalid input" or similar
+        self.rejected: Set[str] = set()
+        # Set once a read gave up waiting; the session may be out of step
+        self.timed_out = False
+        self.prompt_re = _PROMPT_RE
+        # Prompt followed by whatever was typed after it; set once learned
+        self.prompt_line_re: Optional["re.Pattern[str]"] = None
+        self.prompt = ""
+        # Whether the last batch's echoes lined up; None until one was split
+        self.echoes_typeahead: Optional[bool] = None
+
+    @property
+    def privileged(self) -> bool:
+        return self.prompt.endswith("#")
+
+    def learn_prompt(self) -> None:
+        """Only accept the current prompt (``host>``, ``host#``, ``host(config)#``) from now on."""
+        base = re.sub(r"(?:\([^)]*\))?[>#] ?$", "", self.prompt)
+        if base:
+            prompt = r"^" + re.escape(base) + r"(?:\([^)\r\n]*\))?[>#] ?"
+            self.prompt_re = re.compile(prompt + "$")
+            self.prompt_line_re = re.compile(prompt)
+
+    def _recv(self, deadline: float) -> bytes:
+        while not self.channel.recv_ready():
+            if self.channel.closed or self.channel.exit_status_ready():
+                raise CiscoProbeError("Session closed by device")
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return b""
+            select.select([self.channel], [], [], remaining)
+        return self.channel.recv(_READ_CHUNK)
+
+    def _read(
+        self,
+        prompts: int = 1,
+        also: Optional["re.Pattern[str]"] = None,
+        limit: Optional[int] = None,
+        idle: bool = False,
+    ) -> Tuple[str, bool]:
+        """Read until the ``prompts``-th prompt, a match of ``also``, or the timeout.
+
+        Chunks are kept in a list and joined once, and only the current,
+        unterminated line is examined for the prompt, so a large output
+        costs linear time. Text beyond ``limit`` characters is read and
+        discarded to keep the session in step; the flag says whether that
+        happened. With ``idle`` the deadline restarts whenever data arrives.
+        """
+        limit = self.output_limit if limit is None else limit
+        decoder = codecs.getincrementaldecoder("utf-8")("ignore")
+        deadline = time.monotonic() + self.timeout
+        chunks: List[str] = []
+        size = 0
+        truncated = False
+        partial = ""
+        partial_clipped = False
+        seen = 0
+        while True:
+            data = self._recv(deadline)
+            if not data:
+                self.timed_out = True
+                break
+            if idle:
+                deadline = time.monotonic() + self.timeout
+            text = decoder.decode(data)
+            kept = text[: max(0, limit - size)]
+            if kept:
+                chunks.append(kept)
+                size += len(kept)
+            truncated = truncated or len(kept) < len(text)
+
+            head, newline, rest = text.rpartition("\n")
+            if newline:
+                if prompts > 1 and not partial_clipped:
+                    seen += sum(1 for line in (partial + head).split("\n") if self.prompt_line_re.match(line.strip()))
+                elif prompts > 1:
+                    seen += sum(1 for line in head.split("\n")[1:] if self.prompt_line_re.match(line.strip()))
+                partial = rest
+                partial_clipped = False
+            else:
+                partial += text
+            if len(partial) > _PROMPT_TAIL:
+                # Far too long for a prompt; keep only what "also" may need
+                partial = partial[-_PROMPT_TAIL:]
+                partial_clipped = True
+
+            tail = partial.strip()
+            if tail and not partial_clipped and self.prompt_re.search(tail) and seen + 1 >= prompts:
+                self.prompt = tail
+                break
+            if also is not None and also.search(partial):
+                break
+        return "".join(chunks), truncated
+
+    def read_until_prompt(self, also: Optional["re.Pattern[str]"] = None) -> str:
+        """Read until the current line is the prompt (or matches ``also``), or the timeout passes."""
+        return self._read(also=also)[0]
+
+    def _result(self, command: str, raw: str, allow_failure: bool) -> str:
+        output = _strip_command_output(command, raw, self.prompt_re)
+        cleaned = output.strip()
+        if cleaned.startswith("%") or "Invalid input" in cleaned or "Ambiguous" in cleaned:
+            if _UNSUPPORTED_RE.search(cleaned):
+                self.rejected.add(command)
+            if allow_failure:
+                return ""
+            raise CiscoProbeError(f"Command '{command}' failed: {cleaned}")
+        return output
+
+    def run(self, command: str, allow_failure: bool = False) -> str:
+        self.channel.send(command + "\n")
+        raw, truncated = self._read()
+        if truncated:
+            self.warnings.append(f"Output of '{command}' exceeded {self.output_limit} characters; using a partial result")
+        return self._result(command, raw, allow_failure)
+
+    def run_batch(self, commands: List[str], required: Iterable[str] = ()) -> Optional[Dict[str, str]]:
+        """Send ``commands`` in one write and split the combined output per command.
+
+        IOS and NX-OS echo type-ahead input after each prompt, so the output
+        of command N runs up to the prompt line that carries command N+1.
+        Returns None, with every command already run, when the output was too
+        long or the echoes do not line up that way (``echoes_typeahead`` is
+        then False), and without sending anything when the prompt has not
+        been learned; the caller then runs them one at a time. A batch whose
+        output stops before the last prompt raises, since the shell may still
+        be streaming it. Failed commands map to "" unless listed in
+        ``required``, which raise as ``run`` does.
+        """
+        self.echoes_typeahead = None
+        if not commands or self.prompt_line_re is None:
+            return None
+        stalled = self.timed_out
+        self.channel.send("".join(command + "\n" for command in commands))
+        # The deadline restarts whenever data arrives, so a long batch is
+        # only cut off when the device goes quiet
+        raw, truncated = self._read(len(commands), limit=self.output_limit * len(commands), idle=True)
+        if self.timed_out and not stalled:
+            raise CiscoProbeError(f"Pipelined commands did not finish within {self.timeout}s")
+        if truncated:
+            return None
+
+        segments: List[str] = []
+        echoes: List[str] = []
+        current: List[str] = []
+        for line in raw.splitlines():
+            match = self.prompt_line_re.match(line.strip())
+            if match:
+                segments.append("\n".join(current))
+                echoes.append(line.strip()[match.end():].strip())
+                current = []
+            else:
+                current.append(line)
+        first = next((line.strip() for line in segments[0].splitlines() if line.strip()), "") if segments else ""
+        self.echoes_typeahead = len(segments) == len(commands) and first == commands[0] and echoes == list(commands[1:]) + [""]
+        if not self.echoes_typeahead:
+            return None
+
+        required = set(required)
+        return {
+            command: self._result(command, segment, command not in required)
+            for command, segment in zip(commands, segments)
+        }
+
+    def ping(self) -> bool:
+        """Send an empty line and report whether the prompt came back, e.g. as a keepalive."""
+        self.channel.send("\n")
+        raw, _ = self._read()
+        lines = raw.strip().splitlines()
+        return bool(lines) and bool(self.prompt_re.search(lines[-1].strip()))
+
+    def enable(self, enable_password: str) -> bool:
+        """Enter privileged mode; returns whether the prompt ended up privileged."""
+        self.channel.send("enable\n")
+        response = self.read_until_prompt(also=_PASSWORD_RE)
+        if _PASSWORD_RE.search(response):
+            self.channel.send(enable_password + "\n")
+            response = self.read_until_prompt(also=_PASSWORD_RE)
+            if _PASSWORD_RE.search(response.rstrip().splitlines()[-1] if response.strip() else ""):
+                # Re-prompted: wrong secret. Abort the enable dialog.
+                self.channel.send("\x03")
+                self.read_until_prompt()
+                return False
+        return self.privileged
+
+
+def _strip_command_output(command: str, output: str, prompt_re: "re.Pattern[str]" = _PROMPT_RE) -> str:
     lines = output.splitlines()
     cleaned: List[str] = []
     for line in lines:
         stripped = line.rstrip()
         if stripped.strip().lower() == command.lower():
             continue
-        if _PROMPT_RE.match(stripped.strip()):
+        if prompt_re.match(stripped.strip()):
             continue
         cleaned.append(line)
     return "\n".join(cleaned).strip()
@@ -504,6 +791,149 @@ def _parse_interface_descriptions(output: str) -> Dict[str, Dict[str, str]]:
     return results
 
 
+def _load_json(output: str) -> Optional[Dict[str, Any]]:
+    text = (output or "").strip()
+    if not text.startswith("{"):
+        return None
+    try:
+        document = json.loads(text)
+    except ValueError:
+        return None
+    return document if isinstance(document, dict) else None
+
+
+def _json_rows(document: Dict[str, Any], table: str, row: str) -> List[Dict[str, Any]]:
+    """Rows of an NX-OS ``TABLE_x``/``ROW_x`` pair; either level may be a single dict or a list."""
+    tables = document.get(table)
+    rows: List[Dict[str, Any]] = []
+    for entry in tables if isinstance(tables, list) else [tables]:
+        if not isinstance(entry, dict):
+            continue
+        value = entry.get(row)
+        rows.extend(item for item in (value if isinstance(value, list) else [value]) if isinstance(item, dict))
+    return rows
+
+
+def _json_show_version(document: Dict[str, Any]) -> Dict[str, Any]:
+    data: Dict[str, Any] = {}
+    version = document.get("nxos_ver_str") or document.get("sys_ver_str") or document.get("kickstart_ver_str")
+    if version:
+        data["version"] = str(version)
+    chassis = str(document.get("chassis_id") or "").strip()
+    if chassis:
+        data["model"] = re.sub(r"\s+chassis$", "", chassis, flags=re.IGNORECASE)
+    if document.get("proc_board_id"):
+        data["serial"] = str(document["proc_board_id"])
+    if document.get("host_name"):
+        data["hostname"] = str(document["host_name"])
+    units = [("days", "kern_uptm_days"), ("hours", "kern_uptm_hrs"), ("minutes", "kern_uptm_mins"), ("seconds", "kern_uptm_secs")]
+    uptime = [f"{document[key]} {unit}" for unit, key in units if str(document.get(key, "")).isdigit()]
+    if uptime:
+        data["uptime"] = ", ".join(uptime)
+    image = document.get("nxos_image_file") or document.get("isan_file_name") or document.get("kick_file_name")
+    if image:
+        data["image"] = str(image)
+    return data
+
+
+def _json_show_inventory(document: Dict[str, Any]) -> Dict[str, Any]:
+    rows = _json_rows(document, "TABLE_inv", "ROW_inv")
+    chassis = next((row for row in rows if str(row.get("name", "")).strip('"').lower() == "chassis"), None)
+    if chassis is None:
+        return {}
+    data: Dict[str, Any] = {}
+    if chassis.get("productid"):
+        data["model"] = str(chassis["productid"]).strip()
+    if chassis.get("serialnum"):
+        data["serial"] = str(chassis["serialnum"]).strip()
+    return data
+
+
+def _json_interface_brief(document: Dict[str, Any]) -> List[Dict[str, Any]]:
+    interfaces: List[Dict[str, Any]] = []
+    index: Dict[str, Dict[str, Any]] = {}
+    # Older releases list each row's VRF in a parallel TABLE_vrf
+    vrf_rows = _json_rows(document, "TABLE_vrf", "ROW_vrf")
+    for position, row in enumerate(_json_rows(document, "TABLE_intf", "ROW_intf")):
+        name = row.get("intf-name")
+        if not name:
+            continue
+        entry = index.get(name)
+        if entry is None:
+            admin = str(row.get("admin-state") or "")
+            entry = {
+                "name": name,
+                "addresses": [],
+                "ipv4_addresses": [],
+                "ipv6_addresses": [],
+                "status": "administratively down" if admin == "down" else row.get("link-state"),
+                "protocol": row.get("proto-state"),
+            }
+            vrf = row.get("vrf-name-out")
+            if vrf is None and position < len(vrf_rows):
+                vrf = vrf_rows[position].get("vrf-name-out")
+            if vrf:
+                entry["vrf"] = vrf
+            interfaces.append(entry)
+            index[name] = entry
+        address = str(row.get("prefix") or "").split("/")[0]
+        if address and address.lower() != "unassigned" and address not in entry["addresses"]:
+            entry["addresses"].append(address)
+            entry["ipv4_addresses"].append(address)
+    return interfaces
+
+
+def _json_ipv6_interface_brief(document: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    results: Dict[str, Dict[str, Any]] = {}
+    for row in _json_rows(document, "TABLE_intf", "ROW_intf"):
+        name = row.get("intf-name")
+        if not name:
+            continue
+        entry = results.setdefault(name, {
+            "status": row.get("link-state"),
+            "protocol": row.get("proto-state"),
+            "addresses": [],
+        })
+        candidates = [row.get(key) for key in ("addr", "prefix", "ipv6-address", "linklocal-addr")]
+        candidates.extend(item.get("addr") for item in _json_rows(row, "TABLE_addr", "ROW_addr"))
+        for value in candidates:
+            address = str(value or "").split("/")[0]
+            if address and address.lower() != "unassigned" and address not in entry["addresses"]:
+                entry["addresses"].append(address)
+    return results
+
+
+def _json_vrf_table(document: Dict[str, Any]) -> List[Dict[str, Any]]:
+    # NX-OS reports neither route distinguishers nor members in show vrf
+    return [
+        {"name": row["vrf_name"], "route_distinguisher": None, "interfaces": []}
+        for row in _json_rows(document, "TABLE_vrf", "ROW_vrf")
+        if row.get("vrf_name")
+    ]
+
+
+def _json_interface_descriptions(document: Dict[str, Any]) -> Dict[str, Dict[str, str]]:
+    results: Dict[str, Dict[str, str]] = {}
+    for row in _json_rows(document, "TABLE_interface", "ROW_interface"):
+        name = row.get("interface")
+        description = row.get("desc")
+        if name and description:
+            results[name] = {"description": str(description)}
+    return results
+
+
+# "| json" counterparts of the text parsers, keyed by the plain command
+_JSON_PARSERS: Dict[str, Callable[[Dict[str, Any]], Any]] = {
+    "show version": _json_show_version,
+    "show inventory": _json_show_inventory,
+    "show ip interface brief vrf all": _json_interface_brief,
+    "show ip interface brief": _json_interface_brief,
+    "show interface description": _json_interface_descriptions,
+    "show ipv6 interface brief": _json_ipv6_interface_brief,
+    "show vrf": _json_vrf_table,
+}
+
+
 def _normalize_mac(value: str) -> str:
     text = value.replace(".", "").replace("-", "").replace(":", "")
     text = text.lower()
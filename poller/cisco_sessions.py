@@ -0,0 +1,228 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from cisco_collectors import CiscoSession, open_cisco_session
+from ssh_pool import SSHConnectionPool, credential_fingerprint
+
+__all__ = [
+    "CiscoSessionManager",
+    "DEFAULT_SESSION_POOL_SIZE",
+    "DEFAULT_SESSION_IDLE",
+    "DEFAULT_SESSION_KEEPALIVE",
+]
+
+
+DEFAULT_SESSION_POOL_SIZE = 64
+DEFAULT_SESSION_IDLE = 300
+# Well inside IOS's default exec-timeout of 10 minutes
+DEFAULT_SESSION_KEEPALIVE = 60
+
+# (host, port, username, credential fingerprint)
+SessionKey = Tuple[str, int, str, str]
+
+
+class CiscoSessionManager:
+    """Logged-in, privileged Cisco CLI sessions kept open between poll cycles.
+
+    Sessions are keyed on ``(host, port, username)`` plus a fingerprint of
+    the password and enable secret, so changed credentials log in afresh. A
+    shell serves one probe at a time: a probe that finds its device's
+    session busy logs in privately, and so does one whose enable attempt
+    failed, which is never kept. A background thread sends an empty line
+    to sessions that have been quiet for ``keepalive`` seconds, which resets
+    the device's exec-timeout and weeds out dead peers; a session that was
+    not kept alive that way is checked the same way before it is reused.
+    Sessions unused by probes for ``idle_timeout`` are logged out, and the
+    least recently used one is dropped once ``max_sessions`` is reached. If
+    a reused session dies during a probe, the probe runs once more after a
+    fresh login. A ``max_sessions`` of 0 disables keeping sessions.
+    """
+
+    def __init__(
+        self,
+        open_session: Callable[[Dict[str, Any]], CiscoSession] = open_cisco_session,
+        max_sessions: int = DEFAULT_SESSION_POOL_SIZE,
+        idle_timeout: float = DEFAULT_SESSION_IDLE,
+        keepalive: float = DEFAULT_SESSION_KEEPALIVE,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._open = open_session
+        self._clock = clock
+        self._entries: "OrderedDict[SessionKey, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.configure(max_sessions, idle_timeout, keepalive)
+
+    def configure(self, max_sessions: Any, idle_timeout: Any, keepalive: Any = DEFAULT_SESSION_KEEPALIVE) -> None:
+        self.max_sessions = max(0, int(max_sessions or 0))
+        self.idle_timeout = max(1.0, float(idle_timeout or DEFAULT_SESSION_IDLE))
+        self.keepalive = max(0.0, float(keepalive or 0))
+        self.prune()
+
+    @staticmethod
+    def key_for(target: Dict[str, Any]) -> SessionKey:
+        host, port, username, _ = SSHConnectionPool.key_for(target)
+        return host, port, username, credential_fingerprint(target, ("password", "enable_password", "enablePassword"))
+
+    def _start_keepalives(self) -> None:
+        # Started with the first kept session, so a poller that forks its
+        # workers before polling does not carry an idle thread around
+        with self._lock:
+            if self._thread is not None or not self.keepalive:
+                return
+            self._stop.clear()
+            thread = self._thread = threading.Thread(target=self._keepalive_loop, name="cisco-keepalive", daemon=True)
+        thread.start()
+
+    @staticmethod
+    def _usable(session: CiscoSession) -> bool:
+        return session.alive and not session.shell.timed_out
+
+    @staticmethod
+    def _ping(session: CiscoSession) -> bool:
+        try:
+            return session.alive and session.shell.ping()
+        except Exception:
+            return False
+
+    def _close(self, entries: Any) -> None:
+        for entry in entries:
+            entry["session"].close()
+
+    def prune(self) -> None:
+        """Log out of idle, dead and over-capacity sessions."""
+        now = self._clock()
+        closing = []
+        with self._lock:
+            for key, entry in list(self._entries.items()):
+                if entry["busy"]:
+                    continue
+                if now - entry["last_used"] > self.idle_timeout or not self._usable(entry["session"]):
+                    closing.append(self._entries.pop(key))
+            idle = [key for key, entry in self._entries.items() if not entry["busy"]]
+            while len(self._entries) > self.max_sessions and idle:
+                closing.append(self._entries.pop(idle.pop(0)))
+        self._close(closing)
+
+    def _checkout(self, key: SessionKey, target: Dict[str, Any]) -> Tuple[CiscoSession, bool]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and not entry["busy"]:
+                entry["busy"] = True
+                self._entries.move_to_end(key)
+            else:
+                entry = None
+        if entry is not None:
+            session = entry["session"]
+            quiet = self._clock() - entry["last_active"]
+            # The keepalive thread vouches for sessions it touched recently
+            if self._usable(session) and (self.keepalive and quiet < self.keepalive or self._ping(session)):
+                return session, True
+            self._checkin(key, session, discard=True)
+
+        with self._lock:
+            # Sessions of the same account logged in with credentials that have since changed
+            superseded = [other for other, item in self._entries.items() if other[:3] == key[:3] and other != key and not item["busy"]]
+            stale = [self._entries.pop(other) for other in superseded]
+        self._close(stale)
+
+        session = self._open(target)
+        if not self.max_sessions:
+            return session, False
+        if (target.get("enable_password") or target.get("enablePassword")) and not session.shell.privileged:
+            # Keep retrying enable on later polls, e.g. once the secret is fixed
+            return session, False
+        now = self._clock()
+        with self._lock:
+            if key in self._entries:
+                # Busy with another probe of the same device; this one is private
+                return session, False
+            self._entries[key] = {"session": session, "busy": True, "last_used": now, "last_active": now}
+        self.prune()
+        self._start_keepalives()
+        return session, False
+
+    def _checkin(self, key: SessionKey, session: CiscoSession, discard: bool = False, used: bool = True) -> None:
+        now = self._clock()
+        with self._lock:
+            entry = self._entries.get(key)
+            pooled = entry is not None and entry["session"] is session
+            if pooled:
+                if discard:
+                    del self._entries[key]
+                else:
+                    entry["busy"] = False
+                    entry["last_active"] = now
+                    if used:
+                        entry["last_used"] = now
+        if discard or not pooled:
+            session.close()
+
+    def run(self, target: Dict[str, Any], func: Callable[[CiscoSession], Any]) -> Any:
+        """Call ``func(session)`` on a kept session for ``target``, logging in if needed.
+
+        If a reused session turns out to be dead, ``func`` runs once more on
+        a fresh login.
+        """
+        key = self.key_for(target)
+        session, reused = self._checkout(key, target)
+        try:
+            result = func(session)
+        except Exception:
+            alive = session.alive
+            self._checkin(key, session, discard=True)
+            if not reused or alive:
+                raise
+            session, _ = self._checkout(key, target)
+            try:
+                result = func(session)
+            except BaseException:
+                self._checkin(key, session, discard=True)
+                raise
+        except BaseException:
+            self._checkin(key, session, discard=True)
+            raise
+        self._checkin(key, session, discard=not self._usable(session))
+        return result
+
+    def send_keepalives(self) -> int:
+        """Ping every idle session that has been quiet for ``keepalive`` seconds; returns how many."""
+        now = self._clock()
+        due: List[Tuple[SessionKey, CiscoSession]] = []
+        with self._lock:
+            for key, entry in self._entries.items():
+                if not entry["busy"] and now - entry["last_active"] >= self.keepalive:
+                    entry["busy"] = True
+                    due.append((key, entry["session"]))
+        for key, session in due:
+            self._checkin(key, session, discard=not self._ping(session), used=False)
+        return len(due)
+
+    def _keepalive_loop(self) -> None:
+        while not self._stop.wait(max(1.0, min(self.keepalive or DEFAULT_SESSION_KEEPALIVE, self.idle_timeout) / 2)):
+            if not self.keepalive:
+                continue
+            try:
+                self.prune()
+                self.send_keepalives()
+            except Exception:
+                # Never let one bad session end the keepalives for the rest
+                continue
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "in_use": sum(1 for entry in self._entries.values() if entry["busy"]),
+            }
+
+    def close(self) -> None:
+        self._stop.set()
+        with self._lock:
+            self._thread = None
+            entries = list(self._entries.values())
+            self._entries.clear()
+        self._close(entries)
@@ -0,0 +1,190 @@
+import copy
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, Optional, Set, Union
+
+__all__ = [
+    "TierCache",
+    "COLLECTION_TIERS",
+    "DEFAULT_TIER_TTLS",
+    "TIER_FIELDS",
+    "boot_time_from_uptime",
+    "parse_uptime_text",
+]
+
+
+COLLECTION_TIERS = ("identity", "hardware", "network", "applications", "metrics")
+
+# Seconds a tier's data is reused before it is collected again. Metrics are
+# volatile and always collected.
+DEFAULT_TIER_TTLS = {
+    "identity": 86400,
+    "hardware": 86400,
+    "network": 3600,
+    "applications": 86400,
+    "metrics": 0,
+}
+
+# Asset payload fields owned by each tier, as paths into the push payload.
+TIER_FIELDS = {
+    "identity": (("name",), ("attributes", "os")),
+    "hardware": (("attributes", "hardware"),),
+    "network": (("attributes", "network"), ("ips",), ("mac",)),
+    "applications": (("attributes", "apps"),),
+    "metrics": (("attributes", "metrics"),),
+}
+
+# Boot times derived from uptime drift with clock sync and the coarse uptime
+# granularity of some devices; differences below this are not a reboot.
+BOOT_TIME_TOLERANCE = 300
+
+BootMarker = Union[str, float, None]
+
+_UPTIME_UNITS = {
+    "year": 365 * 86400,
+    "month": 30 * 86400,
+    "week": 7 * 86400,
+    "day": 86400,
+    "hour": 3600,
+    "minute": 60,
+    "second": 1,
+}
+
+
+def parse_uptime_text(text: str) -> Optional[int]:
+    """Seconds from an uptime phrase such as ``1 week, 2 days, 3 hours, 4 minutes``."""
+    total = 0
+    found = False
+    tokens = (text or "").replace(",", " ").split()
+    for value, unit in zip(tokens, tokens[1:]):
+        if not value.isdigit():
+            continue
+        unit = unit.lower().rstrip("s")
+        if unit in _UPTIME_UNITS:
+            total += int(value) * _UPTIME_UNITS[unit]
+            found = True
+    return total if found else None
+
+
+def boot_time_from_uptime(seconds: Any, now: Optional[float] = None) -> Optional[float]:
+    """Epoch boot time for an uptime in seconds, usable as a boot marker."""
+    if seconds is None:
+        return None
+    return (time.time() if now is None else now) - float(seconds)
+
+
+def _get_path(payload: Dict[str, Any], path: tuple) -> Any:
+    value: Any = payload
+    for key in path:
+        if not isinstance(value, dict):
+            return None
+        value = value.get(key)
+    return value
+
+
+def _set_path(payload: Dict[str, Any], path: tuple, value: Any) -> None:
+    for key in path[:-1]:
+        payload = payload.setdefault(key, {})
+    payload[path[-1]] = value
+
+
+class TierCache:
+    """Per-asset cache of collected payload sections, grouped into tiers.
+
+    Each tier has a TTL; ``due`` names the tiers whose data is missing or
+    older than that, and collectors skip the commands of every other tier.
+    ``apply`` then stores the fresh sections of a payload and fills the
+    skipped ones in from the cache, so the pushed asset stays complete.
+
+    Every probe reports a boot marker (a boot id, a boot timestamp, or a boot
+    time derived from uptime); when it changes the asset's cache is dropped.
+    A TTL of 0 collects the tier on every poll.
+    """
+
+    def __init__(
+        self,
+        ttls: Optional[Dict[str, Any]] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._clock = clock
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self.configure(ttls or {})
+
+    def configure(self, ttls: Dict[str, Any]) -> None:
+        self.ttls = {
+            tier: max(0, int(ttls.get(tier, DEFAULT_TIER_TTLS[tier]) or 0))
+            for tier in COLLECTION_TIERS
+        }
+        self.ttls["metrics"] = 0
+
+    def due(self, asset_id: Any) -> Set[str]:
+        """Tiers that have to be collected for ``asset_id`` now."""
+        now = self._clock()
+        with self._lock:
+            entry = self._entries.get(str(asset_id)) or {}
+            collected = entry.get("tiers", {})
+            return {
+                tier for tier in COLLECTION_TIERS
+                if not self.ttls[tier] or tier not in collected or now - collected[tier][0] >= self.ttls[tier]
+            }
+
+    def observe_boot(self, asset_id: Any, marker: BootMarker) -> bool:
+        """Record the asset's boot marker; returns True (and drops the cache) on a reboot."""
+        if marker is None or marker == "":
+            return False
+        asset_id = str(asset_id)
+        with self._lock:
+            entry = self._entries.setdefault(asset_id, {"tiers": {}})
+            previous = entry.get("boot")
+            entry["boot"] = marker
+            if previous is None:
+                return False
+            if isinstance(marker, float) and isinstance(previous, float):
+                rebooted = abs(marker - previous) > BOOT_TIME_TOLERANCE
+            else:
+                rebooted = str(marker) != str(previous)
+            if rebooted:
+                entry["tiers"] = {}
+            return rebooted
+
+    def cached(self, asset_id: Any, tier: str) -> Dict[str, Any]:
+        """Copy of the cached sections of ``tier`` keyed by field path."""
+        with self._lock:
+            stored = ((self._entries.get(str(asset_id)) or {}).get("tiers") or {}).get(tier)
+            return copy.deepcopy(stored[1]) if stored else {}
+
+    def apply(self, asset_id: Any, payload: Dict[str, Any], collected: Iterable[str]) -> None:
+        """Cache the sections of the ``collected`` tiers; fill the others from the cache."""
+        asset_id = str(asset_id)
+        collected = set(collected)
+        now = self._clock()
+        with self._lock:
+            entry = self._entries.setdefault(asset_id, {"tiers": {}})
+            for tier in COLLECTION_TIERS:
+                paths = TIER_FIELDS[tier]
+                if tier in collected:
+                    if self.ttls[tier]:
+                        sections = {path: copy.deepcopy(_get_path(payload, path)) for path in paths}
+                        entry["tiers"][tier] = (now, sections)
+                    continue
+                stored = entry["tiers"].get(tier)
+                if not stored:
+                    continue
+                for path, value in stored[1].items():
+                    if value not in (None, [], {}):
+                        _set_path(payload, path, copy.deepcopy(value))
+
+    def invalidate(self, asset_id: Any = None) -> None:
+        with self._lock:
+            if asset_id is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(str(asset_id), None)
+
+    def prune(self, keep: Iterable[Any]) -> None:
+        """Forget assets that are no longer polled."""
+        keep = {str(asset_id) for asset_id in keep}
+        with self._lock:
+            for asset_id in [asset_id for asset_id in self._entries if asset_id not in keep]:
+                del self._entries[asset_id]
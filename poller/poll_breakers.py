@@ -0,0 +1,120 @@
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+__all__ = ["CircuitBreakers", "DEFAULT_BREAKER_THRESHOLD", "DEFAULT_BREAKER_MAX_BACKOFF"]
+
+
+DEFAULT_BREAKER_THRESHOLD = 3
+DEFAULT_BREAKER_MAX_BACKOFF = 3600
+
+
+class CircuitBreakers:
+    """Per-asset circuit breakers for targets whose probes keep failing.
+
+    After ``threshold`` consecutive failures an asset's breaker opens and the
+    asset is skipped for ``interval * 2 ** (failures - threshold)`` seconds,
+    capped at ``max_backoff``. Once that expires the breaker is half-open: one
+    probe is let through, a success closes it and a failure re-opens it with
+    the next, longer backoff.
+
+    State lives in memory and is written through to ``poller_breakers`` so the
+    UI can show it. ``observe`` re-reads the persisted row on every target
+    refresh; deleting the row (manual reset, or a credential change saved
+    through the asset API) therefore closes the breaker on the next refresh.
+    A ``threshold`` of 0 disables the breakers.
+    """
+
+    def __init__(
+        self,
+        connect: Callable[[], Any],
+        threshold: int = DEFAULT_BREAKER_THRESHOLD,
+        max_backoff: float = DEFAULT_BREAKER_MAX_BACKOFF,
+        log: Optional[Callable[..., None]] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._connect = connect
+        self._log = log or (lambda level, message, target=None: None)
+        self._clock = clock
+        self._states: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self.configure(threshold, max_backoff)
+
+    def configure(self, threshold: Any, max_backoff: Any) -> None:
+        self.threshold = max(0, int(threshold or 0))
+        self.max_backoff = max(1.0, float(max_backoff or DEFAULT_BREAKER_MAX_BACKOFF))
+
+    def _execute(self, sql: str, params: tuple) -> None:
+        conn = self._connect()
+        try:
+            conn.cursor().execute(sql, params)
+            conn.commit()
+        finally:
+            conn.close()
+
+    def observe(self, asset_id: Any, failures: Any, retry_in: Any) -> None:
+        """Adopt the persisted breaker row (or its absence) for ``asset_id``."""
+        asset_id = str(asset_id)
+        with self._lock:
+            if not failures:
+                self._states.pop(asset_id, None)
+                return
+            state = self._states.setdefault(asset_id, {"trial": False})
+            state["failures"] = int(failures)
+            state["retry_at"] = self._clock() + max(0, int(retry_in or 0))
+
+    def allow(self, asset_id: Any) -> bool:
+        """Whether the asset may be probed now; claims the half-open trial slot."""
+        if not self.threshold:
+            return True
+        with self._lock:
+            state = self._states.get(str(asset_id))
+            if state is None or state["failures"] < self.threshold:
+                return True
+            if self._clock() < state["retry_at"] or state["trial"]:
+                return False
+            state["trial"] = True
+            return True
+
+    def record(self, asset_id: Any, interval: float, error: Any = None) -> Optional[float]:
+        """Record a probe outcome; returns the backoff in seconds if the breaker opened."""
+        if not self.threshold:
+            return None
+        asset_id = str(asset_id)
+        with self._lock:
+            state = self._states.get(asset_id)
+            if not error:
+                self._states.pop(asset_id, None)
+                was_open = state is not None and state["failures"] >= self.threshold
+            else:
+                state = state or {"failures": 0}
+                state["failures"] += 1
+                state["trial"] = False
+                failures = state["failures"]
+                backoff = None
+                if failures >= self.threshold:
+                    backoff = min(self.max_backoff, float(interval) * 2 ** (failures - self.threshold))
+                state["retry_at"] = self._clock() + (backoff or 0)
+                self._states[asset_id] = state
+
+        if not error:
+            if state is not None:
+                self._execute("DELETE FROM poller_breakers WHERE asset_id = %s", (asset_id,))
+                if was_open:
+                    self._log('info', f"Asset {asset_id} recovered; circuit breaker closed", asset_id)
+            return None
+
+        self._execute(
+            """
+            INSERT INTO poller_breakers
+                (asset_id, consecutive_failures, last_error, last_failure_at, opened_until)
+            VALUES (%s, %s, %s, NOW(), IF(%s IS NULL, NULL, NOW() + INTERVAL %s SECOND))
+            ON DUPLICATE KEY UPDATE
+                consecutive_failures = VALUES(consecutive_failures),
+                last_error = VALUES(last_error),
+                last_failure_at = VALUES(last_failure_at),
+                opened_until = VALUES(opened_until)
+            """,
+            (asset_id, failures, str(error)[:1000], backoff, int(backoff or 0)),
+        )
+        return backoff
@@ -0,0 +1,227 @@
+import abc
+import asyncio
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, wait as wait_futures
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+__all__ = [
+    "ThreadPoolEngine",
+    "AsyncioEngine",
+    "create_engine",
+    "probe_group",
+    "ENGINE_SETTING_KEYS",
+    "MAX_POLL_CONCURRENCY",
+]
+
+
+MAX_POLL_CONCURRENCY = 512
+
+# Settings that require the engine to be rebuilt when they change.
+ENGINE_SETTING_KEYS = ("engine", "concurrency", "protocol_concurrency")
+
+_PROBE_GROUPS = {
+    "ssh": "ssh",
+    "ssh_cisco": "ssh_cisco",
+    "cisco": "ssh_cisco",
+    "ssh-cisco": "ssh_cisco",
+    "wmi": "windows",
+    "winrm": "windows",
+    "windows": "windows",
+    "ping": "ping",
+    "snmp": "ping",
+}
+
+_DEFAULT_GROUP_LIMITS = {
+    "ssh": 32,
+    "ssh_cisco": 16,
+    "windows": 16,
+    "ping": 64,
+}
+
+
+def probe_group(poll_type: Any) -> str:
+    """Map an asset ``poll_type`` onto the protocol group that bounds it."""
+    return _PROBE_GROUPS.get(str(poll_type or "ping").strip().lower(), "other")
+
+
+def _clamp_workers(value: Any, default: int = 1) -> int:
+    try:
+        workers = int(value)
+    except (TypeError, ValueError):
+        workers = default
+    return max(1, min(workers, MAX_POLL_CONCURRENCY))
+
+
+class _BatchMixin(abc.ABC):
+    @abc.abstractmethod
+    def submit(self, func: Callable[[Dict[str, Any]], Any], target: Dict[str, Any]) -> Future:
+        """Schedule ``func(target)`` and return a future for its result."""
+
+    def run_batch(
+        self, func: Callable[[Dict[str, Any]], Any], targets: Iterable[Dict[str, Any]]
+    ) -> List[Tuple[Dict[str, Any], Any, Optional[BaseException]]]:
+        """Run ``func`` for every target and wait for all of them to finish.
+
+        Returns ``(target, result, error)`` tuples in submission order.
+        """
+        pending = [(target, self.submit(func, target)) for target in targets]
+        results: List[Tuple[Dict[str, Any], Any, Optional[BaseException]]] = []
+        for target, future in pending:
+            error = future.exception()
+            results.append((target, None if error else future.result(), error))
+        return results
+
+
+class ThreadPoolEngine(_BatchMixin):
+    """Run probe callables on a bounded pool of worker threads.
+
+    With ``max_workers`` of 1 the callable runs inline on the calling thread,
+    which keeps the historical strictly sequential behaviour.
+    """
+
+    name = "threads"
+
+    def __init__(self, max_workers: int = 1) -> None:
+        self.max_workers = _clamp_workers(max_workers)
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def _ensure_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix="poll-worker",
+                )
+            return self._executor
+
+    def submit(self, func: Callable[[Dict[str, Any]], Any], target: Dict[str, Any]) -> Future:
+        if self.max_workers == 1:
+            future: Future = Future()
+            try:
+                future.set_result(func(target))
+            except Exception as exc:  # surfaced through the future like pooled work
+                future.set_exception(exc)
+            return future
+        return self._ensure_executor().submit(func, target)
+
+    def describe(self) -> str:
+        return f"concurrency {self.max_workers}"
+
+    def shutdown(self, wait: bool = True) -> None:
+        with self._lock:
+            executor = self._executor
+            self._executor = None
+        if executor is not None:
+            executor.shutdown(wait=wait)
+
+
+class AsyncioEngine(_BatchMixin):
+    """Schedule probes on an asyncio loop with one semaphore per protocol group.
+
+    The probe functions stay blocking (paramiko, impacket, pywinrm) and run in
+    an executor; the semaphores decide how many of each protocol may occupy an
+    executor thread at once, so a backlog of slow Windows hosts cannot starve
+    the SSH fleet. Waiting probes are plain coroutines and cost next to nothing.
+    """
+
+    name = "asyncio"
+
+    def __init__(self, group_limits: Optional[Dict[str, Any]] = None, default_limit: int = 1) -> None:
+        limits = dict(_DEFAULT_GROUP_LIMITS)
+        for key, value in (group_limits or {}).items():
+            group = probe_group(key) if key not in limits else key
+            limits[group] = _clamp_workers(value, limits.get(group, default_limit))
+        limits.setdefault("other", _clamp_workers(default_limit))
+        self.group_limits = limits
+        self.max_workers = _clamp_workers(sum(limits.values()))
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._pending: set = set()
+        self._lock = threading.Lock()
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix="poll-async",
+                )
+                loop = asyncio.new_event_loop()
+                loop.set_default_executor(self._executor)
+                ready = threading.Event()
+
+                def _serve() -> None:
+                    asyncio.set_event_loop(loop)
+                    loop.call_soon(ready.set)
+                    loop.run_forever()
+
+                self._thread = threading.Thread(target=_serve, name="poll-async-loop", daemon=True)
+                self._thread.start()
+                ready.wait()
+                self._loop = loop
+            return self._loop
+
+    def _semaphore(self, group: str) -> asyncio.Semaphore:
+        # Only ever called on the loop thread, so no locking is needed.
+        semaphore = self._semaphores.get(group)
+        if semaphore is None:
+            limit = self.group_limits.get(group, self.group_limits["other"])
+            semaphore = asyncio.Semaphore(limit)
+            self._semaphores[group] = semaphore
+        return semaphore
+
+    async def _run(self, func: Callable[[Dict[str, Any]], Any], target: Dict[str, Any]) -> Any:
+        group = probe_group(target.get("type"))
+        async with self._semaphore(group):
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, func, target)
+
+    def submit(self, func: Callable[[Dict[str, Any]], Any], target: Dict[str, Any]) -> Future:
+        loop = self._ensure_loop()
+        future = asyncio.run_coroutine_threadsafe(self._run(func, target), loop)
+        with self._lock:
+            self._pending.add(future)
+        future.add_done_callback(self._forget)
+        return future
+
+    def _forget(self, future: Future) -> None:
+        with self._lock:
+            self._pending.discard(future)
+
+    def describe(self) -> str:
+        limits = ", ".join(f"{group}={limit}" for group, limit in sorted(self.group_limits.items()))
+        return f"asyncio ({limits})"
+
+    def shutdown(self, wait: bool = True) -> None:
+        # Settle outstanding probes first so no caller is left holding a future
+        # that can never complete once the loop stops.
+        with self._lock:
+            pending = list(self._pending)
+        if wait:
+            wait_futures(pending)
+        else:
+            for future in pending:
+                future.cancel()
+        with self._lock:
+            loop, thread, executor = self._loop, self._thread, self._executor
+            self._loop = self._thread = self._executor = None
+            self._semaphores = {}
+        if loop is not None:
+            loop.call_soon_threadsafe(loop.stop)
+            if thread is not None and wait:
+                thread.join()
+            if not loop.is_running():
+                loop.close()
+        if executor is not None:
+            executor.shutdown(wait=wait)
+
+
+def create_engine(settings: Dict[str, Any]):
+    """Build the probe engine selected by the ``poller.engine`` setting."""
+    engine = str(settings.get("engine") or "threads").strip().lower()
+    if engine == "asyncio":
+        return AsyncioEngine(settings.get("protocol_concurrency"), settings.get("concurrency", 1))
+    return ThreadPoolEngine(settings.get("concurrency", 1))
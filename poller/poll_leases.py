@@ -0,0 +1,195 @@
+import threading
+import uuid
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+__all__ = ["LeaseQueue", "DEFAULT_LEASE_TTL"]
+
+
+DEFAULT_LEASE_TTL = 120
+MIN_LEASE_TTL = 15
+
+
+class LeaseQueue:
+    """Shared work queue backed by the ``poller_leases`` table.
+
+    Every poll-enabled asset has one row holding its next due time. A poller
+    claims due rows whose lease is free or expired with ``SKIP LOCKED`` so
+    concurrent pollers never block on, or double-claim, the same asset. Leases
+    are renewed by a heartbeat while the probe runs and released with the next
+    due time once it completes; a crashed poller simply stops renewing and its
+    assets are claimed by the others when the lease expires.
+
+    All timestamps come from the database clock, so pollers with skewed local
+    clocks still agree on what is due.
+    """
+
+    def __init__(
+        self,
+        connect: Callable[[], Any],
+        owner: str,
+        ttl: int = DEFAULT_LEASE_TTL,
+        log: Optional[Callable[..., None]] = None,
+    ) -> None:
+        self._connect = connect
+        self.owner = owner
+        self.set_ttl(ttl)
+        self._log = log or (lambda level, message, target=None: None)
+        self._held: Dict[str, str] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._heartbeat: Optional[threading.Thread] = None
+
+    def set_ttl(self, ttl: Any) -> None:
+        """Lease length in seconds; the heartbeat renews at a third of it."""
+        self.ttl = max(MIN_LEASE_TTL, int(ttl or DEFAULT_LEASE_TTL))
+
+    def _execute(self, statements: Iterable[Any]) -> List[Any]:
+        conn = self._connect()
+        try:
+            cursor = conn.cursor()
+            results = []
+            for sql, params in statements:
+                cursor.execute(sql, params)
+                results.append(cursor.fetchall() if cursor.with_rows else cursor.rowcount)
+            conn.commit()
+            return results
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+
+    def seed(self) -> int:
+        """Create queue rows for newly poll-enabled assets; returns rows added."""
+        (added,) = self._execute([(
+            "INSERT IGNORE INTO poller_leases (asset_id, next_due_at) "
+            "SELECT id, NOW() FROM assets WHERE poll_enabled = TRUE",
+            (),
+        )])
+        return added
+
+    def claim(self, limit: int) -> List[str]:
+        """Lease up to ``limit`` due assets to this poller and return their ids."""
+        if limit <= 0:
+            return []
+        token = uuid.uuid4().hex
+        conn = self._connect()
+        try:
+            cursor = conn.cursor()
+            cursor.execute(
+                """
+                SELECT l.asset_id
+                FROM poller_leases l
+                JOIN assets a ON a.id = l.asset_id
+                WHERE a.poll_enabled = TRUE
+                  AND l.next_due_at <= NOW()
+                  AND (l.lease_expires IS NULL OR l.lease_expires < NOW())
+                ORDER BY l.next_due_at
+                LIMIT %s
+                FOR UPDATE OF l SKIP LOCKED
+                """,
+                (int(limit),),
+            )
+            asset_ids = [row[0] for row in cursor.fetchall()]
+            if asset_ids:
+                placeholders = ", ".join(["%s"] * len(asset_ids))
+                cursor.execute(
+                    f"""
+                    UPDATE poller_leases
+                    SET poller_name = %s, lease_token = %s,
+                        lease_expires = NOW() + INTERVAL %s SECOND, acquired_at = NOW()
+                    WHERE asset_id IN ({placeholders})
+                    """,
+                    (self.owner, token, self.ttl, *asset_ids),
+                )
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+
+        with self._lock:
+            for asset_id in asset_ids:
+                self._held[str(asset_id)] = token
+        return [str(asset_id) for asset_id in asset_ids]
+
+    def held(self) -> int:
+        with self._lock:
+            return len(self._held)
+
+    def renew(self) -> int:
+        """Extend every lease this poller still holds; returns rows renewed."""
+        with self._lock:
+            tokens = sorted(set(self._held.values()))
+        if not tokens:
+            return 0
+        placeholders = ", ".join(["%s"] * len(tokens))
+        (renewed,) = self._execute([(
+            f"UPDATE poller_leases SET lease_expires = NOW() + INTERVAL %s SECOND "
+            f"WHERE poller_name = %s AND lease_token IN ({placeholders})",
+            (self.ttl, self.owner, *tokens),
+        )])
+        return renewed
+
+    def release(self, asset_id: Any, interval: float) -> bool:
+        """Give the asset back with its next due time ``interval`` seconds on.
+
+        The next slot is the previous due time plus the interval (fixed rate),
+        but never earlier than now. Returns ``False`` if the lease had already
+        expired and been taken over by another poller.
+        """
+        asset_id = str(asset_id)
+        with self._lock:
+            token = self._held.pop(asset_id, None)
+        if token is None:
+            return False
+        (released,) = self._execute([(
+            """
+            UPDATE poller_leases
+            SET lease_token = NULL, lease_expires = NULL, last_polled_at = NOW(),
+                next_due_at = GREATEST(next_due_at + INTERVAL %s SECOND, NOW())
+            WHERE asset_id = %s AND lease_token = %s
+            """,
+            (int(interval), asset_id, token),
+        )])
+        if not released:
+            self._log('warning', f"Lease on asset {asset_id} expired before the probe finished", asset_id)
+        return bool(released)
+
+    def release_all(self) -> None:
+        """Drop every held lease without rescheduling, e.g. on shutdown."""
+        with self._lock:
+            held, self._held = self._held, {}
+        if not held:
+            return
+        tokens = sorted(set(held.values()))
+        placeholders = ", ".join(["%s"] * len(tokens))
+        self._execute([(
+            f"UPDATE poller_leases SET lease_token = NULL, lease_expires = NULL "
+            f"WHERE poller_name = %s AND lease_token IN ({placeholders})",
+            (self.owner, *tokens),
+        )])
+
+    def _heartbeat_loop(self) -> None:
+        while not self._stop.wait(self.ttl / 3.0):
+            try:
+                self.renew()
+            except Exception as exc:
+                self._log('error', f"Failed to renew poller leases: {exc}")
+
+    def start(self) -> None:
+        if self._heartbeat is None:
+            self._stop.clear()
+            self._heartbeat = threading.Thread(target=self._heartbeat_loop, name="poller-lease-heartbeat", daemon=True)
+            self._heartbeat.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._heartbeat is not None:
+            self._heartbeat.join(timeout=5)
+            self._heartbeat = None
+        try:
+            self.release_all()
+        except Exception as exc:
+            self._log('error', f"Failed to release poller leases: {exc}")
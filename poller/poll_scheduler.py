@@ -0,0 +1,234 @@
+import hashlib
+import heapq
+import math
+import random
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+__all__ = [
+    "DueScheduler",
+    "MIN_POLL_INTERVAL",
+    "phase_offset",
+    "phase_delay",
+    "staggered_offsets",
+    "target_interval",
+]
+
+
+MIN_POLL_INTERVAL = 5
+MAX_JITTER = 0.5
+
+
+def _schedule_key(target: Dict[str, Any]) -> str:
+    return str(target.get("asset_id") or target.get("host") or "")
+
+
+def phase_offset(key: Any, interval: float) -> float:
+    """Deterministic offset in ``[0, interval)`` derived from a hash of ``key``."""
+    digest = hashlib.sha1(str(key).encode("utf-8")).digest()
+    fraction = int.from_bytes(digest[:8], "big") / float(1 << 64)
+    return fraction * float(interval)
+
+
+def phase_delay(key: Any, interval: float, wall_now: Optional[float] = None) -> float:
+    """Seconds until ``key``'s next slot on the wall-clock grid of ``interval``.
+
+    Anchoring phases to the wall clock keeps them stable across restarts and
+    identical on every poller instance.
+    """
+    wall_now = time.time() if wall_now is None else wall_now
+    return (phase_offset(key, interval) - wall_now) % float(interval)
+
+
+def clamp_jitter(value: Any) -> float:
+    try:
+        jitter = float(value or 0)
+    except (TypeError, ValueError):
+        return 0.0
+    return max(0.0, min(jitter, MAX_JITTER))
+
+
+def staggered_offsets(
+    targets: Iterable[Dict[str, Any]],
+    window: float,
+    jitter: float = 0.0,
+    rng: Optional[random.Random] = None,
+) -> List[Tuple[float, Dict[str, Any]]]:
+    """Spread ``targets`` across ``window`` seconds, sorted by start offset.
+
+    ``jitter`` is a fraction of the window added as a random +/- shift on top
+    of each target's hashed phase.
+    """
+    rng = rng or random
+    jitter = clamp_jitter(jitter)
+    schedule = []
+    for target in targets:
+        offset = phase_offset(_schedule_key(target), window)
+        if jitter:
+            offset = (offset + rng.uniform(-jitter, jitter) * window) % window
+        schedule.append((offset, target))
+    schedule.sort(key=lambda item: item[0])
+    return schedule
+
+
+def target_interval(target: Dict[str, Any], default_interval: float) -> float:
+    """Polling interval for ``target``: its ``poll_interval`` or the default, floored."""
+    value = target.get("poll_interval")
+    try:
+        interval = float(value) if value not in (None, "") else float(default_interval)
+    except (TypeError, ValueError):
+        interval = float(default_interval)
+    if interval <= 0:
+        interval = float(default_interval)
+    return max(float(MIN_POLL_INTERVAL), interval)
+
+
+class DueScheduler:
+    """Priority queue of polled assets keyed on each asset's next due time.
+
+    Assets are rescheduled at a fixed rate (``previous due + interval``) rather
+    than ``completion + interval``, so the effective interval does not grow
+    with probe duration. Slots missed while a probe overran are skipped instead
+    of being replayed back to back.
+
+    With ``stagger`` enabled new assets start at their hashed phase slot rather
+    than all at once, and ``jitter`` shifts each run by a random fraction of the
+    interval without letting the underlying schedule drift.
+    """
+
+    def __init__(
+        self,
+        default_interval: float,
+        clock: Callable[[], float] = time.monotonic,
+        stagger: bool = False,
+        jitter: float = 0.0,
+        wall_clock: Callable[[], float] = time.time,
+        rng: Optional[random.Random] = None,
+    ) -> None:
+        self.default_interval = max(float(MIN_POLL_INTERVAL), float(default_interval or MIN_POLL_INTERVAL))
+        self.stagger = bool(stagger)
+        self.jitter = clamp_jitter(jitter)
+        self._clock = clock
+        self._wall_clock = wall_clock
+        self._rng = rng or random.Random()
+        self._heap: List[Tuple[float, int, str]] = []
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._version = 0
+        self._lock = threading.Lock()
+
+    def _push(self, asset_id: str, entry: Dict[str, Any]) -> None:
+        # Heap entries are invalidated lazily: a stale version is skipped on pop.
+        self._version += 1
+        entry["version"] = self._version
+        heapq.heappush(self._heap, (entry["due"], self._version, asset_id))
+
+    def initial_due(self, target: Dict[str, Any], interval: float, now: float) -> float:
+        """Unjittered due time for an asset the scheduler has not seen before."""
+        if not self.stagger:
+            return now
+        return now + phase_delay(_schedule_key(target), interval, self._wall_clock())
+
+    def _jittered(self, base_due: float, interval: float) -> float:
+        if not self.jitter:
+            return base_due
+        return base_due + self._rng.uniform(-self.jitter, self.jitter) * interval
+
+    def sync(self, targets: Iterable[Dict[str, Any]], default_interval: Optional[float] = None) -> int:
+        """Reconcile the queue with the current target list.
+
+        New assets are queued, removed assets are dropped and interval changes
+        take effect from the asset's next run. Returns the number of tracked assets.
+        """
+        now = self._clock()
+        with self._lock:
+            if default_interval:
+                self.default_interval = max(float(MIN_POLL_INTERVAL), float(default_interval))
+            seen = set()
+            for target in targets:
+                asset_id = _schedule_key(target)
+                if not asset_id or asset_id in seen:
+                    continue
+                seen.add(asset_id)
+                interval = target_interval(target, self.default_interval)
+                entry = self._entries.get(asset_id)
+                if entry is None:
+                    base_due = self.initial_due(target, interval, now)
+                    entry = {
+                        "target": target,
+                        "interval": interval,
+                        "base_due": base_due,
+                        "due": self._jittered(base_due, interval),
+                        "in_flight": False,
+                    }
+                    self._entries[asset_id] = entry
+                    self._push(asset_id, entry)
+                    continue
+                entry["target"] = target
+                if entry["interval"] != interval:
+                    entry["interval"] = interval
+                    if not entry["in_flight"] and entry["base_due"] > now + interval:
+                        entry["base_due"] = now + interval
+                        entry["due"] = self._jittered(entry["base_due"], interval)
+                        self._push(asset_id, entry)
+            for asset_id in list(self._entries):
+                if asset_id not in seen:
+                    del self._entries[asset_id]
+            return len(self._entries)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._heap = []
+
+    def pop_due(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Return every asset whose due time has passed and mark it in flight."""
+        now = self._clock()
+        due: List[Dict[str, Any]] = []
+        with self._lock:
+            while self._heap and self._heap[0][0] <= now:
+                if limit is not None and len(due) >= limit:
+                    break
+                _, version, asset_id = heapq.heappop(self._heap)
+                entry = self._entries.get(asset_id)
+                if entry is None or entry["version"] != version or entry["in_flight"]:
+                    continue
+                entry["in_flight"] = True
+                due.append(entry["target"])
+        return due
+
+    def complete(self, asset_id: Any) -> None:
+        """Reschedule an asset once its probe has finished."""
+        now = self._clock()
+        with self._lock:
+            entry = self._entries.get(str(asset_id))
+            if entry is None:
+                return
+            entry["in_flight"] = False
+            interval = entry["interval"]
+            next_due = entry["base_due"] + interval
+            if next_due <= now:
+                missed = math.ceil((now - next_due) / interval)
+                next_due += missed * interval
+                if next_due <= now:
+                    next_due += interval
+            entry["base_due"] = next_due
+            entry["due"] = self._jittered(next_due, interval)
+            self._push(str(asset_id), entry)
+
+    def seconds_until_next_due(self, default: float = 1.0) -> float:
+        now = self._clock()
+        with self._lock:
+            while self._heap:
+                due, version, asset_id = self._heap[0]
+                entry = self._entries.get(asset_id)
+                if entry is None or entry["version"] != version or entry["in_flight"]:
+                    heapq.heappop(self._heap)
+                    continue
+                return max(0.0, due - now)
+        return default
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            in_flight = sum(1 for entry in self._entries.values() if entry["in_flight"])
+            return {"tracked": len(self._entries), "in_flight": in_flight}
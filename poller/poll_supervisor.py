@@ -0,0 +1,164 @@
+import hashlib
+import multiprocessing
+import os
+import queue
+import signal
+import threading
+import time
+from typing import Any, Callable, Dict, List
+
+__all__ = ["PollerSupervisor", "shard_for", "resolve_worker_count", "STAT_KEYS"]
+
+
+STAT_KEYS = ("probes", "online", "offline", "probe_errors", "errors", "skipped")
+
+_RESTART_BACKOFF_MAX = 60
+
+
+def shard_for(key: Any, shard_count: int) -> int:
+    """Stable shard index for ``key``; unlike ``hash()`` it survives restarts."""
+    if shard_count <= 1:
+        return 0
+    digest = hashlib.sha1(str(key).encode("utf-8")).digest()
+    return int.from_bytes(digest[:8], "big") % shard_count
+
+
+def resolve_worker_count(value: Any) -> int:
+    """Interpret a worker count; ``auto`` or ``0`` means one per CPU core."""
+    text = str(value or "").strip().lower()
+    if text in ("", "1"):
+        return 1
+    if text in ("auto", "0"):
+        return max(1, os.cpu_count() or 1)
+    try:
+        return max(1, int(text))
+    except ValueError:
+        return 1
+
+
+def _worker_main(factory: Callable[..., Any], shard_index: int, shard_count: int, stats_queue: Any) -> None:
+    # Workers leave Ctrl-C to the supervisor, which terminates them explicitly.
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    poller = factory(shard_index=shard_index, shard_count=shard_count, stats_queue=stats_queue)
+    poller.run()
+
+
+class PollerSupervisor:
+    """Fork one poller process per shard and merge their per-cycle statistics.
+
+    Each worker polls only the assets whose id hashes onto its shard, so the
+    CPU-bound parts of a probe (SSH crypto, JSON/regex parsing, sanitization)
+    spread across cores instead of sharing one GIL. Logs already converge in
+    ``poller_logs``; the supervisor adds one aggregated summary per interval
+    and restarts workers that exit unexpectedly.
+    """
+
+    def __init__(
+        self,
+        factory: Callable[..., Any],
+        workers: int,
+        log: Callable[[str, str], None],
+        report_interval: float = 60,
+    ) -> None:
+        self.factory = factory
+        self.workers = max(1, int(workers))
+        self.log = log
+        self.report_interval = max(5.0, float(report_interval or 60))
+        methods = multiprocessing.get_all_start_methods()
+        self._context = multiprocessing.get_context("fork" if "fork" in methods else "spawn")
+        self._stats_queue = self._context.Queue()
+        self._processes: Dict[int, Any] = {}
+        self._restarts: Dict[int, int] = {}
+        self._next_start: Dict[int, float] = {}
+        self._totals: Dict[int, Dict[str, float]] = {}
+        self._lock = threading.Lock()
+        self._stopping = threading.Event()
+
+    def _start_worker(self, shard_index: int) -> None:
+        process = self._context.Process(
+            target=_worker_main,
+            args=(self.factory, shard_index, self.workers, self._stats_queue),
+            name=f"poller-shard-{shard_index}",
+            daemon=True,
+        )
+        process.start()
+        self._processes[shard_index] = process
+
+    def _collect_stats(self) -> None:
+        while not self._stopping.is_set():
+            try:
+                message = self._stats_queue.get(timeout=1)
+            except queue.Empty:
+                continue
+            except (EOFError, OSError):
+                break
+            shard = message.get("shard", 0)
+            with self._lock:
+                totals = self._totals.setdefault(shard, {key: 0 for key in STAT_KEYS})
+                for key in STAT_KEYS:
+                    totals[key] += message.get(key, 0) or 0
+
+    def _drain_totals(self) -> Dict[int, Dict[str, float]]:
+        with self._lock:
+            totals, self._totals = self._totals, {}
+        return totals
+
+    def _report(self) -> None:
+        totals = self._drain_totals()
+        if not totals:
+            return
+        merged = {key: sum(shard.get(key, 0) for shard in totals.values()) for key in STAT_KEYS}
+        per_shard = ", ".join(
+            f"#{shard}={int(values.get('probes', 0))}" for shard, values in sorted(totals.items())
+        )
+        self.log(
+            'info',
+            f"Supervisor: {int(merged['probes'])} probes across {self.workers} workers "
+            f"({int(merged['online'])} online, {int(merged['offline'])} offline, "
+            f"{int(merged['probe_errors'])} probe errors, {int(merged['errors'])} unhandled errors; {per_shard})",
+        )
+
+    def _check_workers(self) -> None:
+        now = time.monotonic()
+        for shard_index in range(self.workers):
+            process = self._processes.get(shard_index)
+            if process is not None and process.is_alive():
+                continue
+            if process is not None:
+                restarts = self._restarts.get(shard_index, 0) + 1
+                self._restarts[shard_index] = restarts
+                delay = min(_RESTART_BACKOFF_MAX, 2 ** min(restarts, 6))
+                self._next_start[shard_index] = now + delay
+                self._processes.pop(shard_index, None)
+                self.log('warning', f"Poller worker #{shard_index} exited (code {process.exitcode}); restarting in {delay}s")
+                continue
+            if now >= self._next_start.get(shard_index, 0):
+                self._start_worker(shard_index)
+
+    def run(self) -> None:
+        self.log('info', f"Poller supervisor starting {self.workers} worker processes")
+        collector = threading.Thread(target=self._collect_stats, name="poller-stats", daemon=True)
+        collector.start()
+        next_report = time.monotonic() + self.report_interval
+        try:
+            while True:
+                self._check_workers()
+                if time.monotonic() >= next_report:
+                    self._report()
+                    next_report = time.monotonic() + self.report_interval
+                time.sleep(1)
+        except KeyboardInterrupt:
+            self.log('info', "Poller supervisor stopping workers")
+        finally:
+            self.stop()
+
+    def stop(self) -> None:
+        self._stopping.set()
+        processes: List[Any] = list(self._processes.values())
+        for process in processes:
+            if process.is_alive():
+                process.terminate()
+        for process in processes:
+            process.join(timeout=10)
+        self._processes.clear()
+        self._report()
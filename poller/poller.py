@@ -1,6 +1,5 @@
 import json
 import re
-import socket
 import time
 
 import paramiko
@@ -8,18 +7,15 @@ import requests
 import yaml
 
 from windows_collectors import collect_windows_asset, WindowsProbeError
+from reachability import sweep
 
 
 DEFAULT_INTERVAL = 120
 
 
 def ping(host, timeout=1):
-    """Lightweight reachability check using DNS resolution."""
-    try:
-        socket.gethostbyname(host)
-        return True
-    except Exception:
-        return False
+    """Reachability check via ICMP echo, falling back to TCP connects."""
+    return sweep([host], 'auto', timeout).get(host, False)
 
 
 def safe_json_loads(data):
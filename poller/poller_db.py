@@ -19,6 +19,8 @@ import re
 import ipaddress
 import copy
 import hashlib
+import threading
+import argparse
 from windows_collectors import collect_windows_asset, WindowsProbeError
 from cisco_collectors import collect_cisco_asset, CiscoProbeError
 try:
@@ -27,6 +29,19 @@ except ImportError:  # pragma: no cover - optional dependency
     dns_resolver = None
 from datetime import datetime
 from config_loader import load_php_config
+from poll_engines import create_engine, probe_group, ENGINE_SETTING_KEYS
+from poll_scheduler import DueScheduler, MIN_POLL_INTERVAL, clamp_jitter, staggered_offsets, target_interval
+from poll_leases import LeaseQueue, DEFAULT_LEASE_TTL
+from poll_breakers import CircuitBreakers, DEFAULT_BREAKER_THRESHOLD, DEFAULT_BREAKER_MAX_BACKOFF
+from ssh_pool import SSHConnectionPool, DEFAULT_POOL_SIZE, DEFAULT_POOL_IDLE
+from cisco_sessions import CiscoSessionManager, DEFAULT_SESSION_POOL_SIZE, DEFAULT_SESSION_IDLE, DEFAULT_SESSION_KEEPALIVE
+from ssh_batch import PrefetchedSSH, DEFAULT_SSH_CHANNELS, prefetch_commands, prefetch_files, prefetch_parallel, unix_commands_for, unix_foreign_commands
+from capabilities import CapabilityCache
+from unix_helper import run_unix_helper
+from ssh_stream import drain_channel, DEFAULT_OUTPUT_LIMIT
+from collection_tiers import TierCache, COLLECTION_TIERS, DEFAULT_TIER_TTLS, boot_time_from_uptime, parse_uptime_text
+from reachability import tcp_preflight, preflight_ports, sweep, DEFAULT_PREFLIGHT_TIMEOUT, REACHABILITY_METHODS
+from poll_supervisor import PollerSupervisor, STAT_KEYS, resolve_worker_count, shard_for
 
 
 def safe_json_loads(data):
@@ -171,10 +186,24 @@ def is_ip_literal(value):
 
 
 def run_ssh_command(ssh, command, timeout=10):
+    output_limit = DEFAULT_OUTPUT_LIMIT
+    if isinstance(ssh, PrefetchedSSH):
+        cached = ssh.lookup(command)
+        if cached is not None:
+            return cached, ''
+        timeout = ssh.timeout or timeout
+        output_limit = ssh.output_limit
     stdin, stdout, stderr = ssh.exec_command(command, timeout=timeout)
-    out = stdout.read().decode('utf-8', 'ignore').strip()
-    err = stderr.read().decode('utf-8', 'ignore').strip()
-    return out, err
+    result = drain_channel(stdout.channel, timeout, output_limit)
+    if result.truncated or result.timed_out:
+        reason = f"exceeded {output_limit} bytes" if result.truncated else f"did not finish within {timeout}s"
+        warning = f"Output of '{command}' {reason}; using a partial result"
+        if isinstance(ssh, PrefetchedSSH):
+            ssh.warnings.append(warning)
+        else:
+            # No probe to attach the warning to; at least show it on the console
+            print(f"[WARNING] {warning}", flush=True)
+    return result.text().strip(), result.stderr.decode('utf-8', 'ignore').strip()
 
 
 def connect_ssh(target, timeout=10):
@@ -191,10 +220,20 @@ def connect_ssh(target, timeout=10):
         kwargs['password'] = target['password']
     if target.get('ssh_key'):
         kwargs['key_filename'] = target['ssh_key']
+    for option in ('allow_agent', 'look_for_keys'):
+        if target.get(option) is not None:
+            kwargs[option] = bool(target[option])
     ssh.connect(**kwargs)
     return ssh
 
 
+def ssh_auth_method(ssh):
+    """Auth method that authenticated the client ('password', 'publickey', ...), if known"""
+    transport = ssh.get_transport()
+    handler = getattr(transport, 'auth_handler', None) if transport is not None else None
+    return getattr(handler, 'auth_method', None)
+
+
 def collect_unix_os_info(ssh, os_hint='linux'):
     hint = (os_hint or 'unknown').lower()
     if 'bsd' in hint:
@@ -266,7 +305,27 @@ def collect_unix_os_info(ssh, os_hint='linux'):
     return os_info
 
 
-def collect_unix_network_info(ssh):
+# Command variants the collectors fall back through, in order. The one that
+# worked is remembered per asset (see capabilities.py) and tried first.
+UNIX_NETWORK_VARIANTS = ('ip -j addr show', 'ifconfig -a', 'ifconfig')
+UNIX_CPU_VARIANTS = ('lscpu -J', 'lscpu', 'nproc')
+
+
+def unix_variant_skips(capabilities):
+    """Commands a host with these recorded capabilities does not need prefetched"""
+    skips = set()
+    network = capabilities.get('network')
+    if network in UNIX_NETWORK_VARIANTS:
+        skips.update(variant for variant in UNIX_NETWORK_VARIANTS if variant != network)
+        if network != 'ip -j addr show':
+            skips.add('ip -j link show')
+    cpu = capabilities.get('cpu')
+    if cpu:
+        skips.update(variant for variant in UNIX_CPU_VARIANTS if variant not in cpu.split(','))
+    return skips
+
+
+def _unix_interfaces_from_ip_json(ssh):
     interfaces = []
     ip_addresses = []
     primary_mac = None
@@ -306,30 +365,56 @@ def collect_unix_network_info(ssh):
             if mac and not primary_mac and not entry['name'].startswith(('lo', 'lo0')):
                 primary_mac = mac
 
-    if not interfaces:
-        ifconfig_raw, _ = run_ssh_command(ssh, 'ifconfig -a')
-        if ifconfig_raw.strip():
-            interfaces = parse_ifconfig(ifconfig_raw)
-            for iface in interfaces:
-                for addr in iface.get('addresses', []):
-                    ip = normalize_ip_literal(addr)
-                    if ip and not is_loopback_address(ip) and ip not in ip_addresses:
-                        ip_addresses.append(ip)
-                mac = iface.get('mac')
-                if mac and not primary_mac and not iface['name'].startswith(('lo', 'lo0')):
-                    primary_mac = mac
-    if not interfaces:
-        ifconfig_raw, _ = run_ssh_command(ssh, 'ifconfig')
-        if ifconfig_raw.strip():
-            interfaces = parse_ifconfig(ifconfig_raw)
-            for iface in interfaces:
-                for addr in iface.get('addresses', []):
-                    ip = normalize_ip_literal(addr)
-                    if ip and not is_loopback_address(ip) and ip not in ip_addresses:
-                        ip_addresses.append(ip)
-                mac = iface.get('mac')
-                if mac and not primary_mac and not iface['name'].startswith(('lo', 'lo0')):
-                    primary_mac = mac
+    return interfaces, ip_addresses, primary_mac
+
+
+def summarize_unix_interfaces(interfaces):
+    """Host addresses and primary MAC of parsed interfaces, as (ip_addresses, primary_mac)"""
+    ip_addresses = []
+    primary_mac = None
+    for iface in interfaces:
+        for addr in iface.get('addresses', []):
+            ip = normalize_ip_literal(addr)
+            if ip and not is_loopback_address(ip) and ip not in ip_addresses:
+                ip_addresses.append(ip)
+        mac = iface.get('mac')
+        if mac and not primary_mac and not iface['name'].startswith(('lo', 'lo0')):
+            primary_mac = mac
+    return ip_addresses, primary_mac
+
+
+def _unix_interfaces_from_ifconfig(ssh, command):
+    interfaces = []
+    ip_addresses = []
+    primary_mac = None
+
+    ifconfig_raw, _ = run_ssh_command(ssh, command)
+    if ifconfig_raw.strip():
+        interfaces = parse_ifconfig(ifconfig_raw)
+        ip_addresses, primary_mac = summarize_unix_interfaces(interfaces)
+
+    return interfaces, ip_addresses, primary_mac
+
+
+def collect_unix_network_info(ssh, capabilities=None):
+    capabilities = {} if capabilities is None else capabilities
+    interfaces = []
+    ip_addresses = []
+    primary_mac = None
+
+    preferred = capabilities.get('network')
+    variants = list(UNIX_NETWORK_VARIANTS)
+    if preferred in variants:
+        variants.remove(preferred)
+        variants.insert(0, preferred)
+    for variant in variants:
+        if variant == 'ip -j addr show':
+            interfaces, ip_addresses, primary_mac = _unix_interfaces_from_ip_json(ssh)
+        else:
+            interfaces, ip_addresses, primary_mac = _unix_interfaces_from_ifconfig(ssh, variant)
+        if interfaces:
+            capabilities['network'] = variant
+            break
 
     if not ip_addresses:
         for iface in interfaces:
@@ -345,43 +430,67 @@ def collect_unix_network_info(ssh):
     }
 
 
-def collect_unix_hardware_info(ssh, os_family):
+def _collect_unix_cpu_info(ssh, hardware, variants):
+    """Fill CPU fields from each variant in turn; returns the variants that contributed"""
+    used = []
+    for variant in variants:
+        before = dict(hardware)
+        if variant == 'lscpu -J':
+            lscpu_json_raw, _ = run_ssh_command(ssh, 'lscpu -J')
+            lscpu_data = safe_json_loads(lscpu_json_raw)
+            if isinstance(lscpu_data, dict):
+                for entry in lscpu_data.get('lscpu', []):
+                    field = (entry.get('field') or '').strip(':').lower()
+                    data = entry.get('data')
+                    if not field or data is None:
+                        continue
+                    if field == 'model name':
+                        hardware['cpu_model'] = data
+                    elif field == 'cpu(s)':
+                        try:
+                            hardware['cpu_count'] = int(data)
+                        except (TypeError, ValueError):
+                            hardware['cpu_count'] = data
+                    elif field == 'architecture':
+                        hardware['architecture'] = data
+        elif variant == 'lscpu':
+            if 'cpu_model' in hardware and 'cpu_count' in hardware:
+                continue
+            lscpu_text, _ = run_ssh_command(ssh, 'lscpu')
+            for line in lscpu_text.splitlines():
+                if 'Model name' in line and 'cpu_model' not in hardware:
+                    hardware['cpu_model'] = line.split(':', 1)[1].strip()
+                elif 'CPU(s):' in line and 'cpu_count' not in hardware:
+                    value = line.split(':', 1)[1].strip()
+                    if value.isdigit():
+                        hardware['cpu_count'] = int(value)
+                elif 'Architecture:' in line and 'architecture' not in hardware:
+                    hardware['architecture'] = line.split(':', 1)[1].strip()
+        elif variant == 'nproc':
+            if 'cpu_count' in hardware:
+                continue
+            nproc_raw, _ = run_ssh_command(ssh, 'nproc')
+            if nproc_raw.strip().isdigit():
+                hardware['cpu_count'] = int(nproc_raw.strip())
+        if hardware != before:
+            used.append(variant)
+    return used
+
+
+def collect_unix_hardware_info(ssh, os_family, capabilities=None):
+    capabilities = {} if capabilities is None else capabilities
     hardware = {}
 
-    lscpu_json_raw, _ = run_ssh_command(ssh, 'lscpu -J')
-    lscpu_data = safe_json_loads(lscpu_json_raw)
-    if isinstance(lscpu_data, dict):
-        for entry in lscpu_data.get('lscpu', []):
-            field = (entry.get('field') or '').strip(':').lower()
-            data = entry.get('data')
-            if not field or data is None:
-                continue
-            if field == 'model name':
-                hardware['cpu_model'] = data
-            elif field == 'cpu(s)':
-                try:
-                    hardware['cpu_count'] = int(data)
-                except (TypeError, ValueError):
-                    hardware['cpu_count'] = data
-            elif field == 'architecture':
-                hardware['architecture'] = data
-
-    if 'cpu_model' not in hardware or 'cpu_count' not in hardware:
-        lscpu_text, _ = run_ssh_command(ssh, 'lscpu')
-        for line in lscpu_text.splitlines():
-            if 'Model name' in line and 'cpu_model' not in hardware:
-                hardware['cpu_model'] = line.split(':', 1)[1].strip()
-            elif 'CPU(s):' in line and 'cpu_count' not in hardware:
-                value = line.split(':', 1)[1].strip()
-                if value.isdigit():
-                    hardware['cpu_count'] = int(value)
-            elif 'Architecture:' in line and 'architecture' not in hardware:
-                hardware['architecture'] = line.split(':', 1)[1].strip()
-
-    if 'cpu_count' not in hardware:
-        nproc_raw, _ = run_ssh_command(ssh, 'nproc')
-        if nproc_raw.strip().isdigit():
-            hardware['cpu_count'] = int(nproc_raw.strip())
+    recorded = capabilities.get('cpu')
+    if recorded == 'none':
+        used = []
+    elif recorded:
+        used = _collect_unix_cpu_info(ssh, hardware, [v for v in recorded.split(',') if v in UNIX_CPU_VARIANTS])
+        if not used:
+            used = _collect_unix_cpu_info(ssh, hardware, UNIX_CPU_VARIANTS)
+    else:
+        used = _collect_unix_cpu_info(ssh, hardware, UNIX_CPU_VARIANTS)
+    capabilities['cpu'] = ','.join(used) or 'none'
 
     os_family_lower = (os_family or '').lower()
     if os_family_lower.startswith('bsd'):
@@ -487,10 +596,80 @@ def collect_unix_resource_metrics(ssh, os_family):
     return metrics
 
 
+def collect_unix_boot_marker(ssh):
+    boot_id, _ = run_ssh_command(ssh, 'cat /proc/sys/kernel/random/boot_id')
+    if boot_id.strip():
+        return boot_id.strip()
+    boottime, _ = run_ssh_command(ssh, 'sysctl -n kern.boottime')
+    return boottime.strip() or None
+
+
 def current_timestamp():
     return datetime.utcnow().strftime('%Y-%m-%dT%H:%M:%SZ')
 
 
+DEFAULT_POLLER_SETTINGS = {
+    'interval': 30,
+    'timeout': 10,
+    'ping_timeout': 1,
+    'concurrency': 1,
+    'engine': 'threads',
+    'protocol_concurrency': {},
+    'scheduler': 'cycle',
+    'target_refresh': 60,
+    'stagger': False,
+    'jitter': 0.0,
+    'lease_ttl': DEFAULT_LEASE_TTL,
+    'breaker_threshold': DEFAULT_BREAKER_THRESHOLD,
+    'breaker_max_backoff': DEFAULT_BREAKER_MAX_BACKOFF,
+    'preflight': False,
+    'preflight_timeout': DEFAULT_PREFLIGHT_TIMEOUT,
+    'reachability': 'auto',
+    'unix_collection': 'serial',
+    'unix_sftp_reads': False,
+    'cisco_pipeline': False,
+    'cisco_structured_output': True,
+    'cisco_session_pool_size': DEFAULT_SESSION_POOL_SIZE,
+    'cisco_session_idle': DEFAULT_SESSION_IDLE,
+    'cisco_session_keepalive': DEFAULT_SESSION_KEEPALIVE,
+    'ssh_pool_size': DEFAULT_POOL_SIZE,
+    'ssh_pool_idle': DEFAULT_POOL_IDLE,
+    'ssh_channels': DEFAULT_SSH_CHANNELS,
+    'ssh_output_limit': DEFAULT_OUTPUT_LIMIT,
+    'tier_identity_ttl': DEFAULT_TIER_TTLS['identity'],
+    'tier_hardware_ttl': DEFAULT_TIER_TTLS['hardware'],
+    'tier_network_ttl': DEFAULT_TIER_TTLS['network'],
+    'tier_applications_ttl': DEFAULT_TIER_TTLS['applications'],
+}
+
+
+def coerce_setting(value, default):
+    """Convert a raw settings-table string to the type of its default."""
+    if value is None:
+        return copy.deepcopy(default)
+    if isinstance(default, bool):
+        lowered = str(value).strip().lower()
+        if lowered in ('true', '1', 'yes', 'y', 'on'):
+            return True
+        if lowered in ('false', '0', 'no', 'n', 'off'):
+            return False
+        return default
+    if isinstance(default, int):
+        try:
+            return int(str(value).strip())
+        except (TypeError, ValueError):
+            return default
+    if isinstance(default, float):
+        try:
+            return float(str(value).strip())
+        except (TypeError, ValueError):
+            return default
+    if isinstance(default, (dict, list)):
+        decoded = safe_json_loads(value) if isinstance(value, str) else value
+        return decoded if isinstance(decoded, type(default)) else copy.deepcopy(default)
+    return str(value).strip()
+
+
 DEFAULT_SANITIZATION_RULES = {
     "version": 1,
     "meta": {
@@ -517,6 +696,7 @@ class SanitizationManager:
         self.exclude_exact = set()
         self.exclude_prefix = []
         self.exclude_suffix = []
+        self._lock = threading.RLock()
         self.load()
 
     def current_checksum(self):
@@ -534,11 +714,12 @@ class SanitizationManager:
         directory = os.path.dirname(self.path)
         if directory and not os.path.exists(directory):
             os.makedirs(directory, exist_ok=True)
-        with open(self.path, 'w', encoding='utf-8') as handle:
-            if raw.endswith('\n'):
-                handle.write(raw)
-            else:
-                handle.write(raw + '\n')
+        with self._lock:
+            with open(self.path, 'w', encoding='utf-8') as handle:
+                if raw.endswith('\n'):
+                    handle.write(raw)
+                else:
+                    handle.write(raw + '\n')
         return True
 
     def _merge_dicts(self, base, override):
@@ -581,58 +762,71 @@ class SanitizationManager:
         return normalized
 
     def _rebuild_indexes(self):
+        # Build into locals and swap under the lock so concurrent probes never
+        # observe a half-rebuilt rule set.
         exclude = self.rules.get('rules', {}).get('ip_addresses', {}).get('exclude', {})
-        self.exclude_cidrs = []
+        exclude_cidrs = []
         for value in exclude.get('cidr', []) or []:
             try:
                 network = ipaddress.ip_network(str(value).strip(), strict=False)
-                self.exclude_cidrs.append(network)
+                exclude_cidrs.append(network)
             except (ValueError, TypeError):
                 continue
-        self.exclude_exact = set(str(value).strip().lower() for value in (exclude.get('exact', []) or []))
-        self.exclude_prefix = [str(value).strip().lower() for value in (exclude.get('prefix', []) or []) if str(value).strip()]
-        self.exclude_suffix = [str(value).strip().lower() for value in (exclude.get('suffix', []) or []) if str(value).strip()]
+        exclude_exact = set(str(value).strip().lower() for value in (exclude.get('exact', []) or []))
+        exclude_prefix = [str(value).strip().lower() for value in (exclude.get('prefix', []) or []) if str(value).strip()]
+        exclude_suffix = [str(value).strip().lower() for value in (exclude.get('suffix', []) or []) if str(value).strip()]
+        with self._lock:
+            self.exclude_cidrs = exclude_cidrs
+            self.exclude_exact = exclude_exact
+            self.exclude_prefix = exclude_prefix
+            self.exclude_suffix = exclude_suffix
 
     def load(self):
-        data = None
-        path_exists = bool(self.path and os.path.exists(self.path))
-        if path_exists:
-            try:
-                with open(self.path, 'r', encoding='utf-8') as handle:
-                    data = json.load(handle)
-            except Exception:
-                data = None
+        with self._lock:
+            data = None
+            path_exists = bool(self.path and os.path.exists(self.path))
+            if path_exists:
+                try:
+                    with open(self.path, 'r', encoding='utf-8') as handle:
+                        data = json.load(handle)
+                except Exception:
+                    data = None
 
-        self.rules = self._normalize_rules(data or {})
-        self._rebuild_indexes()
+            self.rules = self._normalize_rules(data or {})
+            self._rebuild_indexes()
 
-        if not path_exists and self.path:
-            try:
-                pretty = json.dumps(self.rules, indent=2)
-                self.write_raw(pretty)
-            except Exception:
-                pass
+            if not path_exists and self.path:
+                try:
+                    pretty = json.dumps(self.rules, indent=2)
+                    self.write_raw(pretty)
+                except Exception:
+                    pass
 
-        return self.rules
+            return self.rules
 
     def should_exclude(self, value):
         literal = normalize_ip_literal(value)
         if not literal:
             return False
+        with self._lock:
+            exclude_exact = self.exclude_exact
+            exclude_prefix = self.exclude_prefix
+            exclude_suffix = self.exclude_suffix
+            exclude_cidrs = self.exclude_cidrs
         lowered = literal.lower()
-        if lowered in self.exclude_exact:
+        if lowered in exclude_exact:
             return True
-        for prefix in self.exclude_prefix:
+        for prefix in exclude_prefix:
             if lowered.startswith(prefix):
                 return True
-        for suffix in self.exclude_suffix:
+        for suffix in exclude_suffix:
             if lowered.endswith(suffix):
                 return True
         try:
             ip_obj = ipaddress.ip_address(literal)
         except ValueError:
             return False
-        for network in self.exclude_cidrs:
+        for network in exclude_cidrs:
             if ip_obj in network:
                 return True
         return False
@@ -713,11 +907,23 @@ class SanitizationManager:
         return sanitized
 
 class DatabasePoller:
-    def __init__(self):
+    def __init__(self, shard_index=0, shard_count=1, stats_queue=None):
         self.poller_name = os.getenv('POLLER_NAME', 'default')
+        self.shard_index = shard_index
+        self.shard_count = max(1, shard_count)
+        self.stats_queue = stats_queue
+        self._stats = dict.fromkeys(STAT_KEYS, 0)
+        self._stats_lock = threading.Lock()
         self._dns_warning_logged = False
         self._dns_error_hosts = set()
         self._dns_cache = {}
+        self._dns_lock = threading.Lock()
+        self._log_lock = threading.Lock()
+        self._reachability = {}
+        self._reachability_lock = threading.Lock()
+        self._ssh_auth_methods = {}
+        self._ssh_auth_lock = threading.Lock()
+        self.engine = None
         self.sanitization_rules_path = os.path.join(os.path.dirname(__file__), 'sanitization_rules.json')
         self.sanitizer = SanitizationManager(self.sanitization_rules_path)
 
@@ -726,6 +932,28 @@ class DatabasePoller:
         self.api_config = self.config['api']
         self.poller_config = self.config['poller']
         self.poller_dns_servers = self.poller_config.get('dns_servers', [])
+        self.breakers = CircuitBreakers(
+            self.get_db_connection,
+            self.poller_config['breaker_threshold'],
+            self.poller_config['breaker_max_backoff'],
+            self.log_to_db
+        )
+        self.ssh_pool = SSHConnectionPool(
+            self.connect_ssh,
+            self.poller_config['ssh_pool_size'],
+            self.poller_config['ssh_pool_idle']
+        )
+        self.cisco_sessions = CiscoSessionManager(
+            max_sessions=self.poller_config['cisco_session_pool_size'],
+            idle_timeout=self.poller_config['cisco_session_idle'],
+            keepalive=self.poller_config['cisco_session_keepalive']
+        )
+        self.tier_cache = TierCache(self.tier_ttls())
+        self.capabilities = CapabilityCache(self.get_db_connection, self.log_to_db)
+        try:
+            self.capabilities.load()
+        except Exception as e:
+            self.log_to_db('error', f"Failed to load poller capabilities: {e}")
         self.refresh_sanitization_rules(fetch_from_server=True)
     
     def get_setting(self, conn, category, name, default=None):
@@ -766,11 +994,7 @@ class DatabasePoller:
             # Load poller configuration from database
             config = {
                 'database': db_config,
-                'poller': {
-                    'interval': int(self.get_setting(conn, 'poller', 'interval', '30')),
-                    'timeout': int(self.get_setting(conn, 'poller', 'timeout', '10')),
-                    'ping_timeout': int(self.get_setting(conn, 'poller', 'ping_timeout', '1')),
-                },
+                'poller': self.load_poller_settings(conn),
                 'api': {
                     'base_url': self.get_setting(conn, 'poller', 'api_url', 'http://localhost:8080/api.php'),
                     'api_key': self.get_setting(conn, 'poller', 'api_key', 'POLLR_ABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789')
@@ -800,21 +1024,27 @@ class DatabasePoller:
         except Exception as e:
             print(f"Error loading config from database: {e}")
             # Return defaults if database is unavailable
+            poller_defaults = copy.deepcopy(DEFAULT_POLLER_SETTINGS)
+            poller_defaults.update({
+                'dns_servers': [],
+                'name': self.poller_name
+            })
             return {
                 'database': db_config,
-                'poller': {
-                    'interval': 30,
-                    'timeout': 10,
-                    'ping_timeout': 1,
-                    'dns_servers': [],
-                    'name': self.poller_name
-                },
+                'poller': poller_defaults,
                 'api': {
                     'base_url': 'http://localhost:8080/api.php',
                     'api_key': 'POLLR_ABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789'
                 }
             }
     
+    def load_poller_settings(self, conn):
+        """Load every known poller.* setting, typed after DEFAULT_POLLER_SETTINGS"""
+        settings = {}
+        for name, default in DEFAULT_POLLER_SETTINGS.items():
+            settings[name] = coerce_setting(self.get_setting(conn, 'poller', name, None), default)
+        return settings
+
     def parse_dns_servers(self, raw):
         if raw is None:
             return []
@@ -883,31 +1113,35 @@ class DatabasePoller:
         """Get database connection"""
         return mysql.connector.connect(**self.db_config)
 
+    def _cache_dns_result(self, literal, value):
+        with self._dns_lock:
+            self._dns_cache[literal] = value
+        return value
+
     def resolve_host(self, address):
         literal = (address or '').strip()
-        if literal in self._dns_cache:
-            return self._dns_cache[literal]
+        with self._dns_lock:
+            if literal in self._dns_cache:
+                return self._dns_cache[literal]
 
         if literal == '':
-            self._dns_cache[literal] = ''
-            return ''
+            return self._cache_dns_result(literal, '')
 
         normalized = normalize_ip_literal(literal)
         if is_ip_literal(normalized):
-            self._dns_cache[literal] = normalized
-            return normalized
+            return self._cache_dns_result(literal, normalized)
 
         dns_servers = self.poller_dns_servers or []
         if not dns_servers:
-            self._dns_cache[literal] = literal
-            return literal
+            return self._cache_dns_result(literal, literal)
 
         if dns_resolver is None:
-            if not self._dns_warning_logged:
-                self.log_to_db('warning', f"Custom DNS servers configured but dnspython is not installed; using system resolver for {literal}")
+            with self._dns_lock:
+                should_warn = not self._dns_warning_logged
                 self._dns_warning_logged = True
-            self._dns_cache[literal] = literal
-            return literal
+            if should_warn:
+                self.log_to_db('warning', f"Custom DNS servers configured but dnspython is not installed; using system resolver for {literal}")
+            return self._cache_dns_result(literal, literal)
 
         resolved = None
         errors = []
@@ -945,17 +1179,19 @@ class DatabasePoller:
                 continue
 
         if resolved:
-            self._dns_cache[literal] = resolved
-            if literal in self._dns_error_hosts:
+            with self._dns_lock:
+                self._dns_cache[literal] = resolved
                 self._dns_error_hosts.discard(literal)
             return resolved
 
-        if errors and literal not in self._dns_error_hosts:
+        with self._dns_lock:
+            first_failure = bool(errors) and literal not in self._dns_error_hosts
+            if first_failure:
+                self._dns_error_hosts.add(literal)
+        if first_failure:
             self.log_to_db('debug', f"DNS lookup for {literal} via custom servers failed ({errors[0]})", literal)
-            self._dns_error_hosts.add(literal)
 
-        self._dns_cache[literal] = literal
-        return literal
+        return self._cache_dns_result(literal, literal)
 
     def download_sanitization_rules(self):
         if not self.api_config.get('base_url') or not self.api_config.get('api_key'):
@@ -1084,23 +1320,37 @@ class DatabasePoller:
             print(f"Error checking poller status: {e}")
             return False
     
-    def get_targets(self):
-        """Get polling targets from assets table"""
+    def get_targets(self, asset_ids=None):
+        """Get polling targets from assets table, optionally limited to asset_ids"""
         try:
             conn = self.get_db_connection()
             cursor = conn.cursor(dictionary=True)
             
+            id_filter = ""
+            params = ()
+            if asset_ids is not None:
+                if not asset_ids:
+                    conn.close()
+                    return []
+                id_filter = f"AND a.id IN ({', '.join(['%s'] * len(asset_ids))})"
+                params = tuple(asset_ids)
+
             # Query assets that have polling enabled
-            cursor.execute("""
+            cursor.execute(f"""
                 SELECT 
                     a.id, a.name, a.type, a.mac, a.poll_address,
                     a.poll_type, a.poll_username, a.poll_password, a.poll_port, a.poll_enable_password,
+                    a.poll_interval, a.poll_allow_agent, a.poll_look_for_keys,
+                    b.consecutive_failures AS breaker_failures,
+                    TIMESTAMPDIFF(SECOND, NOW(), b.opened_until) AS breaker_retry_in,
                     GROUP_CONCAT(ai.ip SEPARATOR ',') as ips
                 FROM assets a
                 LEFT JOIN asset_ips ai ON a.id = ai.asset_id
-                WHERE a.poll_enabled = TRUE
-                GROUP BY a.id, a.name, a.type, a.mac, a.poll_address, a.poll_type, a.poll_username, a.poll_password, a.poll_port, a.poll_enable_password
-            """)
+                LEFT JOIN poller_breakers b ON a.id = b.asset_id
+                WHERE a.poll_enabled = TRUE {id_filter}
+                GROUP BY a.id, a.name, a.type, a.mac, a.poll_address, a.poll_type, a.poll_username, a.poll_password, a.poll_port, a.poll_enable_password, a.poll_interval,
+                    a.poll_allow_agent, a.poll_look_for_keys, b.consecutive_failures, b.opened_until
+            """, params)
             
             assets = cursor.fetchall()
             conn.close()
@@ -1108,6 +1358,13 @@ class DatabasePoller:
             # Convert to target format
             targets = []
             for asset in assets:
+                # Supervisor workers only poll the assets hashed onto their shard;
+                # leased assets were already handed to this worker explicitly
+                if asset_ids is None and self.shard_count > 1 and shard_for(asset['id'], self.shard_count) != self.shard_index:
+                    continue
+
+                self.breakers.observe(asset['id'], asset.get('breaker_failures'), asset.get('breaker_retry_in'))
+
                 # Get primary IP (first one in the list)
                 ips_str = asset['ips']
                 self.log_to_db('debug', f"Asset {asset['name']}: raw ips from DB = '{ips_str}'", asset['name'])
@@ -1140,12 +1397,17 @@ class DatabasePoller:
                     'password': asset['poll_password'] or '',
                     'port': asset['poll_port'],
                     'device_type': asset['type'],
-                    'enable_password': asset.get('poll_enable_password')
+                    'enable_password': asset.get('poll_enable_password'),
+                    'poll_interval': asset.get('poll_interval'),
+                    'allow_agent': None if asset.get('poll_allow_agent') is None else bool(asset['poll_allow_agent']),
+                    'look_for_keys': None if asset.get('poll_look_for_keys') is None else bool(asset['poll_look_for_keys'])
                 }
                 targets.append(target)
                 
                 self.log_to_db('debug', f"Asset {asset['name']}: created target with poll_address='{poll_address}' resolved_host='{target['host']}'", asset['name'])
             
+            if asset_ids is None:
+                self.tier_cache.prune(target['asset_id'] for target in targets)
             return targets
             
         except Exception as e:
@@ -1163,9 +1425,17 @@ class DatabasePoller:
             )
             conn.commit()
             conn.close()
-            print(f"[{level.upper()}] {message}")
+            with self._log_lock:
+                print(f"{self.log_prefix()}[{level.upper()}] {message}", flush=True)
         except Exception as e:
-            print(f"[ERROR] Failed to write log: {e}")
+            with self._log_lock:
+                print(f"{self.log_prefix()}[ERROR] Failed to write log: {e}", flush=True)
+
+    def log_prefix(self):
+        """Tag console output with the shard when running under the supervisor"""
+        if self.shard_count > 1:
+            return f"[shard {self.shard_index}/{self.shard_count}] "
+        return ""
     
     def update_last_run(self):
         """Update last run timestamp"""
@@ -1183,8 +1453,39 @@ class DatabasePoller:
         except Exception as e:
             print(f"Error updating last run: {e}")
     
+    def reachability_method(self):
+        method = str(self.poller_config.get('reachability') or 'auto').strip().lower()
+        return method if method in REACHABILITY_METHODS else 'auto'
+
+    def sweep_reachability(self, targets):
+        """Check every target that gets no TCP pre-flight in one parallel sweep"""
+        method = self.reachability_method()
+        if method == 'dns':
+            return
+        preflight = self.poller_config.get('preflight')
+        hosts = [
+            target.get('resolved_host') or target.get('host')
+            for target in targets
+            if not (preflight and preflight_ports(target))
+        ]
+        hosts = [host for host in hosts if host]
+        if not hosts:
+            return
+
+        started = time.monotonic()
+        results = sweep(hosts, method, self.poller_config['ping_timeout'])
+        now = time.monotonic()
+        stale_before = now - 10 * max(MIN_POLL_INTERVAL, self.poller_config['interval'])
+        with self._reachability_lock:
+            for host, reachable in results.items():
+                self._reachability[host] = (reachable, now)
+            for host in [host for host, (_, checked) in self._reachability.items() if checked < stale_before]:
+                del self._reachability[host]
+        up = sum(1 for reachable in results.values() if reachable)
+        self.log_to_db('debug', f"Reachability sweep ({method}): {up}/{len(results)} hosts up in {now - started:.2f}s")
+
     def ping(self, host_label, resolved_host=None, timeout=None):
-        """Simple reachability check via DNS resolution"""
+        """Reachability check: the latest sweep result, or a single-host sweep"""
         if timeout is None:
             timeout = self.poller_config['ping_timeout']
 
@@ -1192,15 +1493,23 @@ class DatabasePoller:
         if not candidate:
             return False
 
-        try:
-            socket.setdefaulttimeout(timeout)
-            if is_ip_literal(candidate):
-                socket.getaddrinfo(candidate, None)
-            else:
-                socket.gethostbyname(candidate)
-            return True
-        except Exception:
-            return False
+        method = self.reachability_method()
+        if method == 'dns':
+            # Legacy behaviour: "online" only means the name resolves
+            try:
+                if is_ip_literal(candidate):
+                    socket.getaddrinfo(candidate, None)
+                else:
+                    socket.gethostbyname(candidate)
+                return True
+            except Exception:
+                return False
+
+        with self._reachability_lock:
+            cached = self._reachability.get(candidate)
+        if cached and time.monotonic() - cached[1] <= max(MIN_POLL_INTERVAL, self.poller_config['interval']):
+            return cached[0]
+        return sweep([candidate], method, timeout).get(candidate, False)
     
     def unix_probe(self, target):
         """Probe Unix-like systems (Linux, *BSD, macOS) via SSH"""
@@ -1233,54 +1542,210 @@ class DatabasePoller:
             asset['attributes']['poller']['collected_at'] = current_timestamp()
             return asset
 
-        ssh = None
+        asset_id = target.get('asset_id')
+
+        def collect_tiers(client, tiers):
+            if self.unix_collection_mode() == 'helper':
+                result = self.collect_unix_helper(client, poll_address or host, tiers, os_hint)
+                if result is not None:
+                    return result
+            known_os = self.tier_cache.cached(asset_id, 'identity').get(('attributes', 'os')) or {}
+            skips = unix_variant_skips(self.capabilities.known(asset_id))
+            # Leave out the other OS side's variants once the host's kernel is known
+            skips |= unix_foreign_commands(known_os.get('kernel_name') or known_os.get('family'))
+            ssh = self.prefetch_unix_commands(client, poll_address or host, unix_commands_for(tiers, exclude=skips))
+            collected = {}
+
+            if 'identity' in tiers:
+                os_info = collect_unix_os_info(ssh, os_hint)
+                collected['os'] = os_info
+            else:
+                os_info = known_os
+            family = os_info.get('family') or os_hint
+            kernel_release = os_info.get('kernel_release')
+            capabilities = self.capabilities.variants(asset_id, family, kernel_release)
+            if 'network' in tiers:
+                collected['network'] = collect_unix_network_info(ssh, capabilities)
+            if 'hardware' in tiers:
+                collected['hardware'] = collect_unix_hardware_info(ssh, family, capabilities)
+            collected['metrics'] = collect_unix_resource_metrics(ssh, family)
+            collected['warnings'] = ssh.warnings
+            self.capabilities.update(asset_id, family, kernel_release, capabilities)
+            return collected, collect_unix_boot_marker(ssh)
+
+        def collect(client):
+            return self.collect_tiered(target, lambda tiers: collect_tiers(client, tiers), poll_address or host)
+
         try:
             self.log_to_db('info', f"Probing Unix host {poll_address or host} (resolved: {host})...", poll_address or host)
-            ssh = connect_ssh({
+            collected, tiers = self.ssh_pool.run({
                 'host': host,
                 'username': username,
                 'password': password,
                 'port': target.get('port'),
-                'ssh_key': target.get('ssh_key')
-            }, timeout=self.poller_config['timeout'])
-
-            os_info = collect_unix_os_info(ssh, os_hint)
-            asset['attributes']['os'] = os_info
-            if os_info.get('hostname'):
-                asset['name'] = os_info['hostname']
-
-            network_info = collect_unix_network_info(ssh)
-            network_info = self.sanitize_network_info(network_info)
-            if network_info.get('interfaces'):
-                asset['attributes']['network'] = {'interfaces': network_info['interfaces']}
-            ips = network_info.get('addresses') or []
-            if ips:
-                asset['ips'] = ips
-            primary_mac = network_info.get('primary_mac')
-            if primary_mac:
-                asset['mac'] = primary_mac
+                'ssh_key': target.get('ssh_key'),
+                'allow_agent': target.get('allow_agent'),
+                'look_for_keys': target.get('look_for_keys')
+            }, collect)
 
-            hardware_info = collect_unix_hardware_info(ssh, os_info.get('family'))
+            os_info = collected.get('os')
+            if os_info:
+                asset['attributes']['os'] = os_info
+                if os_info.get('hostname'):
+                    asset['name'] = os_info['hostname']
+
+            if 'network' in collected:
+                network_info = self.sanitize_network_info(collected['network'])
+                if network_info.get('interfaces'):
+                    asset['attributes']['network'] = {'interfaces': network_info['interfaces']}
+                ips = network_info.get('addresses') or []
+                if ips:
+                    asset['ips'] = ips
+                primary_mac = network_info.get('primary_mac')
+                if primary_mac:
+                    asset['mac'] = primary_mac
+
+            hardware_info = collected.get('hardware')
             if hardware_info:
                 asset['attributes']['hardware'] = hardware_info
 
-            metrics_info = collect_unix_resource_metrics(ssh, os_info.get('family'))
+            metrics_info = collected['metrics']
             if metrics_info:
                 asset['attributes']['metrics'] = metrics_info
 
+            if collected['warnings']:
+                asset['attributes']['poller']['warnings'] = collected['warnings']
+                for warning in collected['warnings']:
+                    self.log_to_db('warning', f"{poll_address or host}: {warning}", poll_address or host)
+
+            self.tier_cache.apply(asset_id, asset, tiers)
             self.log_to_db('success', f"Successfully probed {poll_address or host}: {asset['name']}", poll_address or host)
 
         except Exception as exc:
             error_message = f"Error probing {poll_address or host}: {exc}"
             self.log_to_db('error', error_message, poll_address or host)
             asset['attributes']['poller']['error'] = str(exc)
-        finally:
-            if ssh:
-                ssh.close()
 
         asset['attributes']['poller']['collected_at'] = current_timestamp()
         return self.sanitize_asset_payload(asset)
     
+    def unix_collection_mode(self):
+        mode = str(self.poller_config.get('unix_collection') or 'serial').strip().lower()
+        # 'commands' names the same one-channel-per-command behaviour
+        return 'serial' if mode == 'commands' else mode
+
+    def collect_unix_helper(self, ssh, label, tiers, os_hint):
+        """Collect with the streamed helper script; returns (data, boot_marker), or None to fall back to commands"""
+        try:
+            document = run_unix_helper(
+                ssh,
+                tiers,
+                os_hint,
+                timeout=self.poller_config['timeout'],
+                max_bytes=self.poller_config['ssh_output_limit']
+            )
+        except Exception as e:
+            self.log_to_db('debug', f"Remote helper failed on {label}, running collector commands instead: {e}", label)
+            return None
+
+        collected = {'metrics': document['metrics'], 'warnings': []}
+        if 'identity' in tiers and isinstance(document.get('os'), dict):
+            collected['os'] = document['os']
+        if 'network' in tiers:
+            interfaces = (document.get('network') or {}).get('interfaces') or []
+            ip_addresses, primary_mac = summarize_unix_interfaces(interfaces)
+            collected['network'] = {
+                'interfaces': interfaces,
+                'primary_mac': primary_mac,
+                'addresses': ip_addresses
+            }
+        if 'hardware' in tiers:
+            collected['hardware'] = document.get('hardware') or {}
+        return collected, document.get('boot') or None
+
+    def prefetch_unix_commands(self, ssh, label, commands):
+        """Prefetch the collectors' commands as one script ('batch') or on concurrent channels ('parallel')
+
+        With unix_sftp_reads, commands that only read a file are answered
+        over SFTP first and left out of the exec prefetch.
+        """
+        mode = self.unix_collection_mode()
+        if mode == 'helper':
+            # The helper could not run on this host; the batch script is the next cheapest
+            mode = 'batch'
+        timeout = self.poller_config['timeout']
+        output_limit = self.poller_config['ssh_output_limit']
+        file_outputs = {}
+        if self.poller_config.get('unix_sftp_reads'):
+            try:
+                file_outputs = prefetch_files(ssh, commands, timeout=timeout, max_bytes=output_limit)
+            except Exception as e:
+                self.log_to_db('debug', f"SFTP file reads failed on {label}, reading files over exec: {e}", label)
+            commands = [command for command in commands if command not in file_outputs]
+        outputs = {}
+        try:
+            if mode == 'parallel':
+                outputs = prefetch_parallel(
+                    ssh,
+                    commands,
+                    timeout=timeout,
+                    max_channels=self.poller_config['ssh_channels'],
+                    max_bytes=output_limit
+                )
+            elif mode == 'batch':
+                outputs = prefetch_commands(ssh, commands, timeout=timeout, max_bytes=output_limit)
+        except Exception as e:
+            self.log_to_db('debug', f"Prefetching collector commands ({mode}) failed on {label}, running commands individually: {e}", label)
+        else:
+            if mode in ('batch', 'parallel') and not outputs:
+                # No framed sections came back (restricted shell, no sh): fall back quietly
+                self.log_to_db('debug', f"Prefetching collector commands ({mode}) returned no output on {label}; running commands individually", label)
+        outputs.update(file_outputs)
+        return PrefetchedSSH(ssh, outputs, timeout=timeout, output_limit=output_limit)
+
+    def connect_ssh(self, target):
+        """Open an SSH client, going straight to password auth when that worked last time.
+
+        Paramiko otherwise offers agent and ~/.ssh keys before the password,
+        which is slow and counts against MaxAuthTries on hardened hosts.
+        """
+        timeout = self.poller_config['timeout']
+        key = SSHConnectionPool.key_for(target)
+        with self._ssh_auth_lock:
+            remembered = self._ssh_auth_methods.get(key)
+        if remembered == 'password' and target.get('password'):
+            try:
+                return connect_ssh(dict(target, ssh_key=None, allow_agent=False, look_for_keys=False), timeout=timeout)
+            except paramiko.AuthenticationException:
+                self.log_to_db('debug', f"Remembered password auth failed for {key[2]}@{key[0]}; trying all methods", key[0])
+
+        ssh = connect_ssh(target, timeout=timeout)
+        method = ssh_auth_method(ssh)
+        with self._ssh_auth_lock:
+            if method:
+                self._ssh_auth_methods[key] = method
+            else:
+                self._ssh_auth_methods.pop(key, None)
+        return ssh
+
+    def tier_ttls(self):
+        return {tier: self.poller_config.get(f'tier_{tier}_ttl') for tier in COLLECTION_TIERS if tier != 'metrics'}
+
+    def collect_tiered(self, target, collect, label):
+        """Run collect(tiers) for the tiers due on target; returns (data, tiers collected).
+
+        collect returns (data, boot_marker). A changed boot marker drops the
+        cached tiers, and everything is collected again straight away.
+        """
+        asset_id = target.get('asset_id')
+        tiers = self.tier_cache.due(asset_id)
+        data, boot_marker = collect(tiers)
+        if self.tier_cache.observe_boot(asset_id, boot_marker) and len(tiers) < len(COLLECTION_TIERS):
+            self.log_to_db('info', f"{label} rebooted since the last poll; collecting full inventory", label)
+            tiers = set(COLLECTION_TIERS)
+            data, _ = collect(tiers)
+        return data, tiers
+
     def windows_probe(self, target):
         """Probe Windows system using WMI/WinRM collectors."""
         resolved_host = target.get('resolved_host') or target.get('host')
@@ -1393,8 +1858,15 @@ class DatabasePoller:
             except (TypeError, ValueError):
                 self.log_to_db('warning', f"Invalid WinRM port '{port_value}' for {poll_address or host}", poll_address or host)
 
+        def collect(tiers):
+            collector_target['collect_tiers'] = sorted(tiers)
+            data = collect_windows_asset(collector_target)
+            return data, (data.get('os') or {}).get('last_boot')
+
         try:
-            windows_data = collect_windows_asset(collector_target)
+            windows_data, tiers = self.collect_tiered(target, collect, poll_address or host)
+            # Win32_OperatingSystem is read on every poll, so identity is always fresh
+            tiers = tiers | {'identity'}
 
             os_info = windows_data.get('os') or {}
             if os_info:
@@ -1434,6 +1906,7 @@ class DatabasePoller:
             if warnings:
                 poller_meta['warnings'] = warnings
 
+            self.tier_cache.apply(target.get('asset_id'), asset, tiers)
             self.log_to_db('success', f"Windows probe succeeded for {poll_address or host}", poll_address or host)
 
         except WindowsProbeError as exc:
@@ -1495,12 +1968,35 @@ class DatabasePoller:
             'username': username,
             'password': password,
             'enable_password': target.get('enable_password'),
+            'allow_agent': target.get('allow_agent'),
+            'look_for_keys': target.get('look_for_keys'),
             'port': target.get('port') or 22,
-            'timeout': self.poller_config.get('timeout', 10)
+            'timeout': self.poller_config.get('timeout', 10),
+            'pipeline': self.poller_config.get('cisco_pipeline'),
+            'structured': self.poller_config.get('cisco_structured_output', True),
+            'output_limit': self.poller_config.get('ssh_output_limit')
         }
+        asset_id = target.get('asset_id')
+
+        def collect(tiers):
+            collector_target['collect_tiers'] = sorted(tiers)
+            known = self.capabilities.known(asset_id)
+            collector_target['capabilities'] = capabilities = dict(known)
+            # Kept sessions are already logged in and privileged, so a repeat
+            # poll only sends the show commands
+            data = self.cisco_sessions.run(collector_target, lambda session: collect_cisco_asset(collector_target, session))
+            # Records are tied to the software version; after an upgrade they
+            # are dropped and rediscovered on the next poll
+            version = (data.get('os') or {}).get('version')
+            if not known or self.capabilities.variants(asset_id, 'network', version):
+                self.capabilities.update(asset_id, 'network', version, capabilities)
+            uptime = parse_uptime_text((data.get('os') or {}).get('uptime'))
+            return data, boot_time_from_uptime(uptime)
 
         try:
-            cisco_data = collect_cisco_asset(collector_target)
+            cisco_data, tiers = self.collect_tiered(target, collect, poll_address or host)
+            # show version runs on every poll, so identity is always fresh
+            tiers = tiers | {'identity'}
 
             os_info = cisco_data.get('os') or {}
             if os_info:
@@ -1535,6 +2031,7 @@ class DatabasePoller:
                 poller_meta['warnings'] = warnings
 
             poller_meta['source'] = cisco_data.get('probe_source', 'cisco-ssh')
+            self.tier_cache.apply(target.get('asset_id'), asset, tiers)
             self.log_to_db('success', f"Cisco probe succeeded for {poll_address or host}", poll_address or host)
 
         except CiscoProbeError as exc:
@@ -1591,87 +2088,241 @@ class DatabasePoller:
         except Exception as e:
             self.log_to_db('error', f"Error pushing update: {type(e).__name__}: {str(e)}", asset.get('name'))
     
+    def basic_payload(self, target):
+        """Status-only asset payload for targets without collected data"""
+        resolved_host = target.get('resolved_host') or target.get('host')
+        poll_address = target.get('poll_address') or target.get('host_display') or resolved_host
+        return {
+            "id": target.get('asset_id'),
+            "name": target.get('name', poll_address or resolved_host),
+            "type": target.get('device_type', 'unknown'),
+            "ips": [resolved_host] if resolved_host else ([poll_address] if poll_address else []),
+            "mac": None,
+            "attributes": {
+                "poller": {"collected_at": current_timestamp()}
+            }
+        }
+
+    def probe(self, target):
+        """Collect an asset payload for target; returns None for unknown poll types"""
+        poll_type = target.get('type', 'ping')
+
+        if poll_type == 'ssh':
+            return self.unix_probe(target)
+        if poll_type in ('ssh_cisco', 'cisco', 'ssh-cisco'):
+            return self.cisco_probe(target)
+        if poll_type in ('wmi', 'winrm', 'windows'):
+            return self.windows_probe(target)
+        if poll_type in ['snmp', 'ping']:
+            # Just check online status for now
+            return self.basic_payload(target)
+        return None
+
+    def preflight(self, target):
+        """TCP pre-flight for protocol probes; None when disabled or not applicable"""
+        if not self.poller_config.get('preflight'):
+            return None
+        ports = preflight_ports(target)
+        host = target.get('resolved_host') or target.get('host')
+        if not ports or not host:
+            return None
+        return tcp_preflight(host, ports, self.poller_config['preflight_timeout'])
+
+    def poll_target(self, target):
+        """Probe a single target and push the result; returns the reported status"""
+        poll_type = target.get('type', 'ping')
+        resolved_host = target.get('resolved_host') or target.get('host')
+        poll_address = target.get('poll_address') or target.get('host_display') or resolved_host
+        host = resolved_host or poll_address
+        asset_name = target.get('name', poll_address or host)
+        asset_id = target.get('asset_id')
+        interval = target_interval(target, self.poller_config['interval'])
+
+        # Persistently failing targets are skipped until their backoff expires
+        if not self.breakers.allow(asset_id):
+            self.record_stats(skipped=1)
+            return 'backoff'
+
+        label = poll_address or host
+        preflight = self.preflight(target)
+        if preflight is not None and not preflight['reachable']:
+            # Nothing answered the TCP pre-flight: report offline without
+            # paying for the SSH/WMI/WinRM connect timeouts
+            self.log_to_db('info', f"Asset {asset_name} ({label}) is offline (pre-flight: {preflight['error']})", label)
+            self.push_update(self.basic_payload(target), False)
+            self.record_stats(probes=1, offline=1)
+            backoff = self.breakers.record(asset_id, interval, f"pre-flight: {preflight['error']}")
+            if backoff:
+                self.log_to_db('warning', f"Asset {asset_name} keeps failing; circuit breaker open, next attempt in {backoff:.0f}s", label)
+            return 'offline'
+
+        # Probe based on poll type
+        try:
+            if preflight is not None and preflight['open_port'] is None:
+                # The host refused every port, so the collector cannot connect either
+                asset = self.basic_payload(target)
+                refused = ', '.join(str(port) for port in preflight['refused'])
+                asset['attributes']['poller']['error'] = f"No service listening on port {refused} (connection refused)"
+                self.log_to_db('error', f"{asset['attributes']['poller']['error']}: {label}", label)
+            else:
+                asset = self.probe(target)
+        except Exception as exc:
+            self.breakers.record(asset_id, interval, exc)
+            raise
+
+        if asset is None:
+            self.log_to_db('error', f"Unknown poll type: {poll_type}", host)
+            self.record_stats(skipped=1)
+            return 'skipped'
+
+        asset = self.sanitize_asset_payload(asset)
+
+        # Reuse connection outcomes: a host that answered the pre-flight, or
+        # whose collector connected and returned data, is online
+        probe_error = asset.get('attributes', {}).get('poller', {}).get('error')
+        if preflight is not None or (probe_group(poll_type) != 'ping' and not probe_error):
+            online = True
+        else:
+            online = self.ping(poll_address or host, resolved_host)
+        status_msg = "online" if online else "offline"
+        self.log_to_db('info', f"Asset {asset_name} ({label} -> {resolved_host or 'unresolved'}) is {status_msg}", label)
+
+        # Push update to API
+        self.push_update(asset, online)
+        self.record_stats(probes=1, probe_errors=int(bool(probe_error)), **{status_msg: 1})
+
+        backoff = self.breakers.record(asset_id, interval, probe_error)
+        if backoff:
+            self.log_to_db('warning', f"Asset {asset_name} keeps failing; circuit breaker open, next attempt in {backoff:.0f}s", label)
+        return status_msg
+
+    def record_stats(self, **counts):
+        with self._stats_lock:
+            for key, value in counts.items():
+                self._stats[key] += value
+
+    def report_stats(self):
+        """Send counters gathered since the last report to the supervisor"""
+        with self._stats_lock:
+            stats, self._stats = self._stats, dict.fromkeys(STAT_KEYS, 0)
+        if self.stats_queue is not None and stats['probes'] + stats['errors'] + stats['skipped']:
+            stats['shard'] = self.shard_index
+            self.stats_queue.put(stats)
+        return stats
+
+    def get_engine(self):
+        """Return the probe execution engine, creating it on first use"""
+        if self.engine is None:
+            self.engine = create_engine(self.poller_config)
+        return self.engine
+
+    def run_staggered(self, engine, targets, window):
+        """Launch each target at its hashed phase offset within window seconds
+
+        Targets are swept for reachability just before their slot launches, so
+        a probe late in the window does not act on a result from its start.
+        """
+        cycle_start = time.monotonic()
+        schedule = staggered_offsets(targets, window, self.poller_config.get('jitter'))
+        pending = []
+        index = 0
+        while index < len(schedule):
+            delay = cycle_start + schedule[index][0] - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            # Everything due by now (more of it while a sweep ran) launches together
+            now = time.monotonic()
+            slot = []
+            while index < len(schedule) and cycle_start + schedule[index][0] <= now:
+                slot.append(schedule[index][1])
+                index += 1
+            self.sweep_reachability(slot)
+            for target in slot:
+                pending.append((target, engine.submit(self.poll_target, target)))
+
+        results = []
+        for target, future in pending:
+            error = future.exception()
+            results.append((target, None if error else future.result(), error))
+        return results
+
     def poll_targets(self):
         """Poll all configured targets"""
         targets = self.get_targets()
         
         if not targets:
             self.log_to_db('warning', "No assets enabled for polling")
-            return
-        
-        self.log_to_db('info', f"Starting poll cycle for {len(targets)} assets")
+            return self.report_stats()
         
-        for target in targets:
-            poll_type = target.get('type', 'ping')
-            resolved_host = target.get('resolved_host') or target.get('host')
-            poll_address = target.get('poll_address') or target.get('host_display') or resolved_host
-            host = resolved_host or poll_address
-            asset_name = target.get('name', poll_address or host)
-            
-            # Probe based on poll type
-            if poll_type == 'ssh':
-                asset = self.unix_probe(target)
-            elif poll_type in ('ssh_cisco', 'cisco', 'ssh-cisco'):
-                asset = self.cisco_probe(target)
-            elif poll_type in ('wmi', 'winrm', 'windows'):
-                asset = self.windows_probe(target)
-            elif poll_type in ['snmp', 'ping']:
-                # Just check online status for now
-                asset = {
-                    "id": target.get('asset_id'),
-                    "name": asset_name,
-                    "type": target.get('device_type', 'unknown'),
-                    "ips": [resolved_host] if resolved_host else ([poll_address] if poll_address else []),
-                    "mac": None,
-                    "attributes": {
-                        "poller": {"collected_at": current_timestamp()}
-                    }
-                }
-            else:
-                self.log_to_db('error', f"Unknown poll type: {poll_type}", host)
-                continue
+        engine = self.get_engine()
+        self.log_to_db('info', f"Starting poll cycle for {len(targets)} assets ({engine.describe()})")
+        started = time.time()
 
-            asset = self.sanitize_asset_payload(asset)
-            
-            # Check if host is online
-            online = self.ping(poll_address or host, resolved_host)
-            status_msg = "online" if online else "offline"
-            label = poll_address or host
-            self.log_to_db('info', f"Asset {asset_name} ({label} -> {resolved_host or 'unresolved'}) is {status_msg}", label)
-            
-            # Push update to API
-            self.push_update(asset, online)
+        if self.poller_config.get('stagger'):
+            results = self.run_staggered(engine, targets, max(MIN_POLL_INTERVAL, self.poller_config['interval']))
+        else:
+            self.sweep_reachability(targets)
+            results = engine.run_batch(self.poll_target, targets)
+
+        for target, _, error in results:
+            if error is not None:
+                label = target.get('poll_address') or target.get('host_display') or target.get('host')
+                self.log_to_db('error', f"Unhandled error polling {target.get('name') or label}: {error}", label)
+                self.record_stats(errors=1)
         
-        self.log_to_db('info', f"Poll cycle completed for {len(targets)} assets")
+        elapsed = time.time() - started
+        self.log_to_db('info', f"Poll cycle completed for {len(targets)} assets in {elapsed:.1f}s")
+        return self.report_stats()
     
     def reload_config(self):
         """Reload configuration from database"""
         try:
             old_interval = self.poller_config['interval']
+            old_engine_settings = [self.poller_config.get(key) for key in ENGINE_SETTING_KEYS]
             self.config = self.load_config_from_db()
             self.poller_config = self.config['poller']
             self.api_config = self.config['api']
             self.poller_dns_servers = self.poller_config.get('dns_servers', [])
+            self.breakers.configure(self.poller_config['breaker_threshold'], self.poller_config['breaker_max_backoff'])
+            self.ssh_pool.configure(self.poller_config['ssh_pool_size'], self.poller_config['ssh_pool_idle'])
+            self.cisco_sessions.configure(
+                self.poller_config['cisco_session_pool_size'],
+                self.poller_config['cisco_session_idle'],
+                self.poller_config['cisco_session_keepalive']
+            )
+            self.tier_cache.configure(self.tier_ttls())
             self.refresh_sanitization_rules(fetch_from_server=True)
-            self._dns_cache.clear()
-            self._dns_error_hosts.clear()
+            with self._dns_lock:
+                self._dns_cache.clear()
+                self._dns_error_hosts.clear()
             
             if old_interval != self.poller_config['interval']:
                 print(f"Updated polling interval: {old_interval}s -> {self.poller_config['interval']}s")
+            new_engine_settings = [self.poller_config.get(key) for key in ENGINE_SETTING_KEYS]
+            if old_engine_settings != new_engine_settings and self.engine is not None:
+                print(f"Updated poll engine settings: {old_engine_settings} -> {new_engine_settings}")
+                self.engine.shutdown()
+                self.engine = None
         except Exception as e:
             print(f"Error reloading config: {e}")
     
-    def run(self):
-        """Main polling loop"""
-        self.log_to_db('info', "Database-driven Asset Tracker Poller starting...")
+    def scheduler_mode(self):
+        mode = str(self.poller_config.get('scheduler') or 'cycle').strip().lower()
+        return mode if mode in ('cycle', 'due', 'lease') else 'cycle'
+
+    def run_cycles(self):
+        """Fixed global cycle: poll every asset, then sleep poller.interval"""
         config_reload_counter = 0
         
         while True:
+            cycle_started = time.monotonic()
             try:
                 # Reload config every 10 cycles to pick up changes
                 if config_reload_counter >= 10:
                     self.reload_config()
                     config_reload_counter = 0
+                    if self.scheduler_mode() != 'cycle':
+                        return
                 
                 if self.should_run():
                     self.poll_targets()
@@ -1681,15 +2332,193 @@ class DatabasePoller:
                 
                 config_reload_counter += 1
                 
-            except KeyboardInterrupt:
-                self.log_to_db('info', "Poller stopped by user")
-                break
             except Exception as e:
                 self.log_to_db('error', f"Error in poll cycle: {str(e)}")
             
-            # Wait before next cycle using configurable interval
-            time.sleep(self.poller_config['interval'])
+            # Wait before next cycle using configurable interval. A staggered
+            # cycle already spans the interval, so only sleep off the remainder.
+            interval = self.poller_config['interval']
+            if self.poller_config.get('stagger'):
+                interval = max(0, interval - (time.monotonic() - cycle_started))
+            time.sleep(interval)
+
+    def _scheduled_probe_done(self, scheduler, target, future):
+        if not future.cancelled() and future.exception() is not None:
+            label = target.get('poll_address') or target.get('host_display') or target.get('host')
+            self.log_to_db('error', f"Unhandled error polling {target.get('name') or label}: {future.exception()}", label)
+            self.record_stats(errors=1)
+        scheduler.complete(target.get('asset_id') or target.get('host'))
+
+    def run_due_schedule(self):
+        """Per-asset schedule: probe each asset when its own interval has elapsed"""
+        scheduler = DueScheduler(
+            self.poller_config['interval'],
+            stagger=self.poller_config.get('stagger'),
+            jitter=self.poller_config.get('jitter')
+        )
+        config_reload_counter = 0
+        next_refresh = 0.0
 
-if __name__ == "__main__":
+        while True:
+            try:
+                now = time.monotonic()
+                if now >= next_refresh:
+                    # Reload config every 10 target refreshes to pick up changes
+                    if config_reload_counter >= 10:
+                        self.reload_config()
+                        config_reload_counter = 0
+                        if self.scheduler_mode() != 'due':
+                            return
+                        scheduler.stagger = bool(self.poller_config.get('stagger'))
+                        scheduler.jitter = clamp_jitter(self.poller_config.get('jitter'))
+                    config_reload_counter += 1
+                    next_refresh = now + max(MIN_POLL_INTERVAL, self.poller_config['target_refresh'])
+
+                    self.report_stats()
+                    if self.should_run():
+                        tracked = scheduler.sync(self.get_targets(), self.poller_config['interval'])
+                        in_flight = scheduler.stats()['in_flight']
+                        self.log_to_db('debug', f"Scheduler tracking {tracked} assets ({in_flight} in flight)")
+                        self.update_last_run()
+                    else:
+                        scheduler.clear()
+                        self.log_to_db('info', "Poller is disabled, waiting...")
+
+                engine = self.get_engine()
+                due_targets = scheduler.pop_due()
+                if due_targets:
+                    self.sweep_reachability(due_targets)
+                for target in due_targets:
+                    future = engine.submit(self.poll_target, target)
+                    future.add_done_callback(
+                        lambda done, target=target: self._scheduled_probe_done(scheduler, target, done)
+                    )
+
+            except Exception as e:
+                self.log_to_db('error', f"Error in poll scheduler: {str(e)}")
+
+            # Sleep until the next asset is due, waking periodically to refresh targets
+            wait = min(scheduler.seconds_until_next_due(), next_refresh - time.monotonic())
+            time.sleep(max(0.05, min(wait, 5.0)))
+
+    def _leased_probe_done(self, leases, target, future):
+        if not future.cancelled() and future.exception() is not None:
+            label = target.get('poll_address') or target.get('host_display') or target.get('host')
+            self.log_to_db('error', f"Unhandled error polling {target.get('name') or label}: {future.exception()}", label)
+            self.record_stats(errors=1)
+        try:
+            leases.release(target.get('asset_id'), target_interval(target, self.poller_config['interval']))
+        except Exception as e:
+            self.log_to_db('error', f"Failed to release lease for {target.get('name')}: {e}", target.get('name'))
+
+    def run_lease_queue(self):
+        """Shared queue: claim due assets from poller_leases alongside other pollers"""
+        owner = self.poller_name if self.shard_count <= 1 else f"{self.poller_name}#{self.shard_index}"
+        leases = LeaseQueue(self.get_db_connection, owner, self.poller_config['lease_ttl'], self.log_to_db)
+        leases.start()
+        config_reload_counter = 0
+        next_refresh = 0.0
+        running = False
+
+        try:
+            while True:
+                claimed_full = False
+                try:
+                    now = time.monotonic()
+                    if now >= next_refresh:
+                        # Reload config every 10 refreshes to pick up changes
+                        if config_reload_counter >= 10:
+                            self.reload_config()
+                            config_reload_counter = 0
+                            if self.scheduler_mode() != 'lease':
+                                return
+                            leases.set_ttl(self.poller_config['lease_ttl'])
+                        config_reload_counter += 1
+                        next_refresh = now + max(MIN_POLL_INTERVAL, self.poller_config['target_refresh'])
+                        self.report_stats()
+
+                        running = self.should_run()
+                        if running:
+                            added = leases.seed()
+                            if added:
+                                self.log_to_db('debug', f"Lease queue picked up {added} new assets")
+                            self.update_last_run()
+                        else:
+                            self.log_to_db('info', "Poller is disabled, waiting...")
+
+                    if running:
+                        engine = self.get_engine()
+                        capacity = engine.max_workers - leases.held()
+                        asset_ids = leases.claim(capacity)
+                        claimed_full = capacity > 0 and len(asset_ids) == capacity
+                        targets = self.get_targets(asset_ids) if asset_ids else []
+
+                        # Assets that no longer resolve to a target go back to the queue
+                        found = {str(target.get('asset_id')) for target in targets}
+                        for asset_id in asset_ids:
+                            if asset_id not in found:
+                                leases.release(asset_id, self.poller_config['interval'])
+
+                        if targets:
+                            self.sweep_reachability(targets)
+                        for target in targets:
+                            future = engine.submit(self.poll_target, target)
+                            future.add_done_callback(
+                                lambda done, target=target: self._leased_probe_done(leases, target, done)
+                            )
+
+                except Exception as e:
+                    self.log_to_db('error', f"Error in lease queue: {str(e)}")
+
+                # Keep claiming while there is a backlog, otherwise check the queue each second
+                time.sleep(0.05 if claimed_full else 1.0)
+        finally:
+            leases.stop()
+
+    def run(self):
+        """Main polling loop"""
+        self.log_to_db('info', "Database-driven Asset Tracker Poller starting...")
+
+        while True:
+            try:
+                if self.scheduler_mode() == 'due':
+                    self.run_due_schedule()
+                elif self.scheduler_mode() == 'lease':
+                    self.run_lease_queue()
+                else:
+                    self.run_cycles()
+            except KeyboardInterrupt:
+                self.log_to_db('info', "Poller stopped by user")
+                if self.engine is not None:
+                    self.engine.shutdown(wait=False)
+                self.ssh_pool.close()
+                self.cisco_sessions.close()
+                break
+
+def run_supervisor(workers):
+    """Fork one DatabasePoller per shard and supervise them until interrupted"""
     poller = DatabasePoller()
-    poller.run()
\ No newline at end of file
+    supervisor = PollerSupervisor(
+        DatabasePoller,
+        workers,
+        poller.log_to_db,
+        report_interval=max(MIN_POLL_INTERVAL, poller.poller_config['interval'])
+    )
+    supervisor.run()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Database-driven Asset Tracker Poller")
+    parser.add_argument(
+        '--workers',
+        default=os.getenv('POLLER_WORKERS', '1'),
+        help="Worker processes to shard assets across ('auto' = one per CPU core, default 1)"
+    )
+    args = parser.parse_args()
+    workers = resolve_worker_count(args.workers)
+
+    if workers > 1:
+        run_supervisor(workers)
+    else:
+        poller = DatabasePoller()
+        poller.run()
\ No newline at end of file
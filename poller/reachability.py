@@ -0,0 +1,454 @@
+import errno
+import ipaddress
+import os
+import resource
+import selectors
+import socket
+import struct
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout, wait as wait_futures
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from poll_engines import probe_group
+
+__all__ = [
+    "tcp_preflight",
+    "preflight_ports",
+    "icmp_available",
+    "icmp_sweep",
+    "tcp_sweep",
+    "sweep",
+    "DEFAULT_PREFLIGHT_TIMEOUT",
+    "DEFAULT_SWEEP_PORTS",
+    "REACHABILITY_METHODS",
+]
+
+
+DEFAULT_PREFLIGHT_TIMEOUT = 0.8
+
+# Ports tried when sweeping hosts that do not answer ICMP: SSH, HTTPS, SMB
+# and RDP cover nearly every server, workstation and network device.
+DEFAULT_SWEEP_PORTS = (22, 443, 445, 3389)
+
+REACHABILITY_METHODS = ("auto", "icmp", "tcp", "dns")
+
+# Ports whose TCP handshake tells whether a protocol probe can possibly succeed.
+_GROUP_PORTS = {
+    "ssh": (22,),
+    "ssh_cisco": (22,),
+    "windows": (135, 5985, 5986),
+}
+
+_IN_PROGRESS = {errno.EINPROGRESS, errno.EWOULDBLOCK, errno.EALREADY}
+
+_ICMP_ECHO_REQUEST = 8
+_ICMP_ECHO_REPLY = 0
+
+
+def _socket_budget() -> int:
+    """How many sockets a sweep may hold open at once, leaving headroom for the poller."""
+    try:
+        soft, _ = resource.getrlimit(resource.RLIMIT_NOFILE)
+    except (ValueError, OSError):
+        soft = 1024
+    if soft == resource.RLIM_INFINITY:
+        soft = 4096
+    return max(16, min(2048, soft - 128))
+
+
+def preflight_ports(target: Dict[str, Any]) -> List[int]:
+    """Ports to pre-flight for ``target``; empty for poll types without a TCP service."""
+    defaults = _GROUP_PORTS.get(probe_group(target.get("type")))
+    if not defaults:
+        return []
+    ports = []
+    try:
+        explicit = int(target.get("port") or 0)
+    except (TypeError, ValueError):
+        explicit = 0
+    if explicit > 0:
+        ports.append(explicit)
+    # SSH devices on a custom port need not listen on 22; Windows hosts may
+    # answer on DCOM or either WinRM port regardless of the configured one.
+    if not ports or len(defaults) > 1:
+        ports.extend(port for port in defaults if port not in ports)
+    return ports
+
+
+def _resolve(host: str) -> Optional[Tuple[int, Tuple[Any, ...]]]:
+    try:
+        family, _, _, _, sockaddr = socket.getaddrinfo(host, None, type=socket.SOCK_STREAM)[0]
+    except (socket.gaierror, UnicodeError, IndexError):
+        return None
+    return family, sockaddr
+
+
+# getaddrinfo cannot be given a timeout, so deadline-bound lookups run here
+_RESOLVER_WORKERS = 32
+_resolver: Optional[ThreadPoolExecutor] = None
+_resolver_lock = threading.Lock()
+
+
+def _resolver_pool() -> ThreadPoolExecutor:
+    global _resolver
+    with _resolver_lock:
+        if _resolver is None:
+            _resolver = ThreadPoolExecutor(max_workers=_RESOLVER_WORKERS, thread_name_prefix="resolve")
+        return _resolver
+
+
+def _is_ip_literal(host: str) -> bool:
+    try:
+        ipaddress.ip_address(host.split("%", 1)[0])
+    except ValueError:
+        return False
+    return True
+
+
+def _resolve_within(host: str, timeout: float) -> Tuple[Optional[Tuple[int, Tuple[Any, ...]]], bool]:
+    """``_resolve`` bounded by ``timeout``; returns ``(address, timed_out)``."""
+    if _is_ip_literal(host):
+        return _resolve(host), False
+    future = _resolver_pool().submit(_resolve, host)
+    try:
+        return future.result(timeout=max(0.0, timeout)), False
+    except FutureTimeout:
+        # The lookup finishes in the background; its result is discarded
+        return None, True
+
+
+def _resolve_many(hosts: Iterable[str], timeout: float, resolve: Optional[Callable[[str], Any]] = None) -> Dict[str, Any]:
+    """``resolve(host)`` for every host at once on the resolver pool, within ``timeout`` seconds.
+
+    Lookups still running at the deadline are cancelled or left to finish in
+    the background; their hosts map to ``None`` like names that do not
+    resolve.
+    """
+    resolve = resolve or _resolve
+    hosts = list(dict.fromkeys(hosts))
+    if not hosts:
+        return {}
+    pool = _resolver_pool()
+    futures = {pool.submit(resolve, host): host for host in hosts}
+    done, late = wait_futures(futures, timeout=max(0.0, timeout))
+    for future in late:
+        future.cancel()
+    return {host: future.result() if future in done else None for future, host in futures.items()}
+
+
+def _connect_many(
+    endpoints: Iterable[Tuple[str, int]],
+    timeout: float,
+    stop_on: Tuple[str, ...] = ("open",),
+    resolved: Optional[Dict[str, Any]] = None,
+) -> Dict[Tuple[str, int], str]:
+    """Non-blocking TCP connects to many ``(host, port)`` endpoints at once.
+
+    Outcomes are ``open``, ``refused``, ``timeout``, ``unresolved`` or an errno
+    name. Once a host produces an outcome in ``stop_on`` its remaining ports
+    are skipped. At most ``_socket_budget()`` sockets are in flight, each with
+    its own ``timeout``. Addresses come from ``resolved``, as returned by
+    ``_resolve``; hosts without one are reported ``unresolved``.
+    """
+    timeout = max(0.05, float(timeout))
+    budget = _socket_budget()
+    pending = deque(endpoints)
+    outcomes: Dict[Tuple[str, int], str] = {}
+    answered = set()
+    addresses: Dict[str, Any] = dict(resolved or {})
+    deadlines: Dict[socket.socket, float] = {}
+    selector = selectors.DefaultSelector()
+
+    def _finish(sock: socket.socket, endpoint: Tuple[str, int], outcome: str) -> None:
+        selector.unregister(sock)
+        deadlines.pop(sock, None)
+        sock.close()
+        outcomes[endpoint] = outcome
+        if outcome in stop_on:
+            answered.add(endpoint[0])
+
+    try:
+        while pending or deadlines:
+            while pending and len(deadlines) < budget:
+                host, port = endpoint = pending.popleft()
+                if host in answered:
+                    continue
+                address = addresses.get(host)
+                if address is None:
+                    outcomes[endpoint] = "unresolved"
+                    continue
+                family, sockaddr = address
+                sock = socket.socket(family, socket.SOCK_STREAM)
+                sock.setblocking(False)
+                code = sock.connect_ex((sockaddr[0], port) + tuple(sockaddr[2:]))
+                if code in _IN_PROGRESS:
+                    selector.register(sock, selectors.EVENT_WRITE, endpoint)
+                    deadlines[sock] = time.monotonic() + timeout
+                    continue
+                sock.close()
+                outcome = "open" if code == 0 else "refused" if code == errno.ECONNREFUSED else errno.errorcode.get(code, str(code))
+                outcomes[endpoint] = outcome
+                if outcome in stop_on:
+                    answered.add(host)
+
+            if not deadlines:
+                continue
+            wait = max(0.0, min(deadlines.values()) - time.monotonic())
+            for key, _ in selector.select(wait):
+                code = key.fileobj.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR)
+                outcome = "open" if code == 0 else "refused" if code == errno.ECONNREFUSED else errno.errorcode.get(code, str(code))
+                _finish(key.fileobj, key.data, outcome)
+
+            now = time.monotonic()
+            for sock, deadline in list(deadlines.items()):
+                endpoint = selector.get_key(sock).data
+                if deadline <= now:
+                    _finish(sock, endpoint, "timeout")
+                elif endpoint[0] in answered:
+                    _finish(sock, endpoint, "skipped")
+    finally:
+        for sock in list(deadlines):
+            selector.unregister(sock)
+            sock.close()
+        selector.close()
+    return outcomes
+
+
+def tcp_preflight(host: str, ports: Iterable[int], timeout: float = DEFAULT_PREFLIGHT_TIMEOUT) -> Dict[str, Any]:
+    """Open non-blocking TCP connections to every port at once.
+
+    Returns ``reachable`` (the host answered on any port, including with a
+    refusal), ``open_port`` (first port that completed the handshake),
+    ``refused`` ports and an ``error`` summary when nothing answered. Name
+    resolution and the connects share the ``timeout``, so the call never
+    takes much longer than that.
+    """
+    started = time.monotonic()
+    ports = list(dict.fromkeys(ports))
+    result: Dict[str, Any] = {"reachable": False, "open_port": None, "refused": [], "error": None}
+    address, timed_out = _resolve_within(host, timeout)
+    if address is None:
+        result["error"] = f"cannot resolve {host}" + (f" within {timeout}s" if timed_out else "")
+        result["elapsed"] = time.monotonic() - started
+        return result
+    remaining = timeout - (time.monotonic() - started)
+    outcomes = _connect_many(((host, port) for port in ports), remaining, resolved={host: address})
+    errors: List[str] = []
+    for port in ports:
+        outcome = outcomes.get((host, port))
+        if outcome == "open" and result["open_port"] is None:
+            result["open_port"] = port
+        elif outcome == "refused":
+            result["refused"].append(port)
+        elif outcome == "unresolved":
+            errors = [f"cannot resolve {host}"]
+            break
+        elif outcome == "timeout":
+            errors.append(f"{port}: no answer within {timeout}s")
+        elif outcome and outcome != "skipped":
+            errors.append(f"{port}: {outcome}")
+    result["reachable"] = result["open_port"] is not None or bool(result["refused"])
+    if not result["reachable"]:
+        result["error"] = "; ".join(errors) or "no answer"
+    result["elapsed"] = time.monotonic() - started
+    return result
+
+
+def tcp_sweep(
+    hosts: Iterable[str],
+    ports: Iterable[int] = DEFAULT_SWEEP_PORTS,
+    timeout: float = 1.0,
+    resolved: Optional[Dict[str, Any]] = None,
+) -> Dict[str, bool]:
+    """Reachability by TCP connect; a refused connection also proves the host is up.
+
+    Names missing from ``resolved`` are looked up in parallel within
+    ``timeout`` before any connect starts; hosts whose lookup fails or runs
+    late count as unreachable.
+    """
+    hosts = list(dict.fromkeys(hosts))
+    ports = list(dict.fromkeys(ports))
+    addresses = {host: address for host, address in (resolved or {}).items() if address}
+    literals = [host for host in hosts if host not in addresses and _is_ip_literal(host)]
+    addresses.update((host, _resolve(host)) for host in literals)
+    addresses.update(_resolve_many((host for host in hosts if host not in addresses), timeout))
+    # Interleave by port so every host's first port is tried before any second one
+    endpoints = [(host, port) for port in ports for host in hosts]
+    outcomes = _connect_many(endpoints, timeout, stop_on=("open", "refused"), resolved=addresses)
+    reachable = {host: False for host in hosts}
+    for (host, _), outcome in outcomes.items():
+        if outcome in ("open", "refused"):
+            reachable[host] = True
+    return reachable
+
+
+def _checksum(data: bytes) -> int:
+    if len(data) % 2:
+        data += b"\x00"
+    total = sum(struct.unpack(f"!{len(data) // 2}H", data))
+    total = (total >> 16) + (total & 0xFFFF)
+    total += total >> 16
+    return ~total & 0xFFFF
+
+
+def _echo_request(ident: int, sequence: int) -> bytes:
+    payload = b"ig-asset-poller"
+    header = struct.pack("!BBHHH", _ICMP_ECHO_REQUEST, 0, 0, ident, sequence)
+    checksum = _checksum(header + payload)
+    return struct.pack("!BBHHH", _ICMP_ECHO_REQUEST, 0, checksum, ident, sequence) + payload
+
+
+def _open_icmp_socket() -> Tuple[Optional[socket.socket], bool]:
+    """Unprivileged ICMP datagram socket where the kernel allows it, else raw (root / CAP_NET_RAW)."""
+    for kind in (socket.SOCK_DGRAM, socket.SOCK_RAW):
+        try:
+            sock = socket.socket(socket.AF_INET, kind, socket.IPPROTO_ICMP)
+        except OSError:
+            continue
+        sock.setblocking(False)
+        return sock, kind == socket.SOCK_RAW
+    return None, False
+
+
+def icmp_available() -> bool:
+    sock, _ = _open_icmp_socket()
+    if sock is None:
+        return False
+    sock.close()
+    return True
+
+
+def _is_ipv4(host: str) -> bool:
+    try:
+        return isinstance(ipaddress.ip_address(host), ipaddress.IPv4Address)
+    except ValueError:
+        return False
+
+
+def _ipv4_address(host: str) -> Optional[str]:
+    try:
+        return socket.getaddrinfo(host, None, socket.AF_INET, socket.SOCK_STREAM)[0][4][0]
+    except (socket.gaierror, UnicodeError, IndexError):
+        return None
+
+
+def _ipv4_addresses(hosts: Iterable[str], timeout: float) -> Dict[str, str]:
+    """IPv4 address of each host that has one, resolving names within ``timeout`` seconds."""
+    hosts = list(hosts)
+    addresses = {host: host for host in hosts if _is_ipv4(host)}
+    names = [host for host in hosts if host not in addresses]
+    for host, address in _resolve_many(names, timeout, _ipv4_address).items():
+        if address:
+            addresses[host] = address
+    return addresses
+
+
+def icmp_sweep(
+    hosts: Iterable[str], timeout: float = 1.0, addresses: Optional[Dict[str, str]] = None
+) -> Optional[Dict[str, bool]]:
+    """Send one ICMP echo to every host with an IPv4 address and collect replies for ``timeout`` seconds.
+
+    Host names are resolved first, within ``timeout``, unless their IPv4
+    ``addresses`` are passed in. Returns ``None`` when
+    no ICMP socket can be opened. Hosts without an IPv4 address (IPv6-only,
+    unresolvable or too slow to resolve) are left out of the result, so the
+    caller can check them another way.
+    """
+    sock, raw = _open_icmp_socket()
+    if sock is None:
+        return None
+    hosts = list(dict.fromkeys(hosts))
+    if addresses is None:
+        addresses = _ipv4_addresses(hosts, timeout)
+    addresses = {host: addresses[host] for host in hosts if host in addresses}
+    reachable = {host: False for host in hosts if host in addresses}
+    # Several names may share an address; a reply marks all of them
+    by_address: Dict[str, List[str]] = {}
+    for host, address in addresses.items():
+        by_address.setdefault(address, []).append(host)
+    targets = list(by_address)
+    ident = os.getpid() & 0xFFFF
+    selector = selectors.DefaultSelector()
+    selector.register(sock, selectors.EVENT_READ)
+
+    def _drain() -> None:
+        while True:
+            try:
+                packet, (address, _) = sock.recvfrom(2048)
+            except (BlockingIOError, InterruptedError):
+                return
+            except OSError:
+                return
+            if raw:
+                # Raw sockets see every ICMP packet including the IP header
+                offset = (packet[0] & 0x0F) * 4
+                if len(packet) < offset + 8:
+                    continue
+                icmp_type, _, _, reply_ident, _ = struct.unpack("!BBHHH", packet[offset:offset + 8])
+                if icmp_type != _ICMP_ECHO_REPLY or reply_ident != ident:
+                    continue
+            elif not packet or packet[0] != _ICMP_ECHO_REPLY:
+                continue
+            for host in by_address.get(address, ()):
+                reachable[host] = True
+
+    try:
+        for sequence, host in enumerate(targets):
+            packet = _echo_request(ident, sequence & 0xFFFF)
+            while True:
+                try:
+                    sock.sendto(packet, (host, 0))
+                    break
+                except (BlockingIOError, InterruptedError):
+                    # Send buffer full: collect replies while the kernel catches up
+                    selector.select(0.01)
+                    _drain()
+                except OSError:
+                    break
+        deadline = time.monotonic() + max(0.05, float(timeout))
+        while not all(reachable.values()):
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            if selector.select(remaining):
+                _drain()
+    finally:
+        selector.close()
+        sock.close()
+    return reachable
+
+
+def sweep(
+    hosts: Iterable[str],
+    method: str = "auto",
+    timeout: float = 1.0,
+    ports: Iterable[int] = DEFAULT_SWEEP_PORTS,
+) -> Dict[str, bool]:
+    """Check many hosts at once.
+
+    ``icmp`` pings, and checks over TCP only the hosts it cannot ping (no
+    ICMP socket, or no IPv4 address). ``tcp`` connects to ``ports``, and
+    ``auto`` pings first and retries every host that did not answer over
+    TCP, so firewalls that drop ICMP do not turn live hosts offline. Names
+    are resolved once, in parallel, and the TCP check reuses the addresses
+    the ping already resolved.
+    """
+    hosts = [host for host in dict.fromkeys(hosts) if host]
+    if not hosts:
+        return {}
+    method = method if method in ("auto", "icmp", "tcp") else "auto"
+    results: Dict[str, bool] = {}
+    resolved: Dict[str, Any] = {}
+    if method in ("auto", "icmp") and icmp_available():
+        addresses = _ipv4_addresses(hosts, timeout)
+        resolved = {host: (socket.AF_INET, (address, 0)) for host, address in addresses.items()}
+        results = icmp_sweep(hosts, timeout, addresses) or {}
+    if method == "icmp":
+        remaining = [host for host in hosts if host not in results]
+    else:
+        remaining = [host for host in hosts if not results.get(host)]
+    if remaining:
+        results.update(tcp_sweep(remaining, ports, timeout, resolved=resolved))
+    return results
@@ -0,0 +1,371 @@
+import re
+import secrets
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from ssh_stream import DEFAULT_OUTPUT_LIMIT, drain_channel
+
+__all__ = [
+    "PrefetchedSSH",
+    "UNIX_PREFETCH_COMMANDS",
+    "UNIX_TIER_COMMANDS",
+    "UNIX_BOOT_COMMANDS",
+    "UNIX_LINUX_COMMANDS",
+    "UNIX_BSD_COMMANDS",
+    "unix_commands_for",
+    "unix_foreign_commands",
+    "build_batch_script",
+    "parse_batch_output",
+    "prefetch_commands",
+    "prefetch_parallel",
+    "prefetch_files",
+    "UNIX_FILE_COMMANDS",
+    "DEFAULT_SSH_CHANNELS",
+]
+
+
+# OpenSSH's default MaxSessions is 10 channels per connection; stay below it.
+DEFAULT_SSH_CHANNELS = 8
+
+# The whole batch script may return this many times the per-command output
+# limit; sections past that point are run individually instead.
+_BATCH_OUTPUT_FACTOR = 4
+
+# Threads shared by the parallel prefetches of all probes; channels beyond
+# this wait for a free thread instead of each probe starting its own.
+_CHANNEL_WORKERS = 64
+_channel_executor: Optional[ThreadPoolExecutor] = None
+_channel_lock = threading.Lock()
+
+
+# Commands the Unix collectors may issue on Linux, *BSD and macOS, grouped by
+# collection tier. Until a host's kernel is known the variants of both sides
+# are prefetched; the ones for the other side fail fast.
+UNIX_TIER_COMMANDS = {
+    "identity": (
+        "uname -s",
+        "uname -r",
+        "uname -m",
+        "hostname",
+        "cat /etc/os-release",
+        "sysctl -n kern.version",
+        "sysctl -n kern.ostype",
+    ),
+    "network": (
+        "ip -j addr show",
+        "ip -j link show",
+        "ifconfig -a",
+    ),
+    "hardware": (
+        "lscpu -J",
+        "lscpu",
+        "nproc",
+        "grep MemTotal /proc/meminfo",
+        "sysctl -n hw.model",
+        "sysctl -n hw.ncpu",
+        "sysctl -n hw.memsize",
+        "sysctl -n hw.physmem",
+    ),
+    "metrics": (
+        "uptime",
+        "cat /proc/meminfo",
+        "df -P -k",
+        "sysctl -n hw.physmem",
+        "sysctl -n hw.usermem",
+        "sysctl -n hw.pagesize",
+        "sysctl -n vm.stats.vm.v_free_count",
+        "swapctl -l -k",
+    ),
+}
+
+# Read on every poll to notice reboots, which invalidate cached tiers.
+UNIX_BOOT_COMMANDS = (
+    "cat /proc/sys/kernel/random/boot_id",
+    "sysctl -n kern.boottime",
+)
+
+
+# Variants only one side of the Linux / BSD-and-macOS split can answer.
+UNIX_LINUX_COMMANDS = frozenset({
+    "ip -j addr show",
+    "ip -j link show",
+    "lscpu -J",
+    "lscpu",
+    "grep MemTotal /proc/meminfo",
+    "cat /proc/meminfo",
+    "cat /proc/sys/kernel/random/boot_id",
+})
+UNIX_BSD_COMMANDS = frozenset({
+    "sysctl -n kern.version",
+    "sysctl -n kern.ostype",
+    "sysctl -n hw.model",
+    "sysctl -n hw.ncpu",
+    "sysctl -n hw.memsize",
+    "sysctl -n hw.physmem",
+    "sysctl -n hw.usermem",
+    "sysctl -n hw.pagesize",
+    "sysctl -n vm.stats.vm.v_free_count",
+    "swapctl -l -k",
+    "sysctl -n kern.boottime",
+})
+
+
+def unix_foreign_commands(kernel: Any) -> frozenset:
+    """Prefetch commands that cannot succeed on a host whose ``uname -s`` (or OS family) is ``kernel``."""
+    name = str(kernel or "").strip().lower()
+    if name == "linux":
+        return UNIX_BSD_COMMANDS
+    if "bsd" in name or name in ("darwin", "macos", "dragonfly"):
+        return UNIX_LINUX_COMMANDS
+    return frozenset()
+
+
+def unix_commands_for(tiers: Iterable[str], exclude: Iterable[str] = ()) -> Tuple[str, ...]:
+    """Prefetch list for the given collection tiers, boot markers included."""
+    wanted = set(tiers)
+    skipped = set(exclude)
+    commands = [
+        command
+        for tier, tier_commands in UNIX_TIER_COMMANDS.items()
+        if tier in wanted
+        for command in tier_commands
+        if command not in skipped
+    ]
+    commands.extend(command for command in UNIX_BOOT_COMMANDS if command not in skipped)
+    return tuple(dict.fromkeys(commands))
+
+
+UNIX_PREFETCH_COMMANDS = unix_commands_for(UNIX_TIER_COMMANDS)
+
+# Commands that only read a file, as (path, line filter). They can be
+# answered over SFTP without starting a remote shell.
+UNIX_FILE_COMMANDS = {
+    "cat /etc/os-release": ("/etc/os-release", None),
+    "cat /proc/meminfo": ("/proc/meminfo", None),
+    "grep MemTotal /proc/meminfo": ("/proc/meminfo", "MemTotal"),
+    "cat /proc/sys/kernel/random/boot_id": ("/proc/sys/kernel/random/boot_id", None),
+}
+
+# One SFTP read request; /proc files report a size of 0, so reads are
+# requested blind rather than sized with a stat first.
+_SFTP_CHUNK = 32768
+
+
+def build_batch_script(commands: Iterable[str], nonce: str) -> str:
+    """POSIX sh script that runs ``commands`` and frames each output with markers.
+
+    Commands read from /dev/null so none of them can swallow the rest of the
+    script from ``sh -s``'s stdin. The nonce keeps command output from ever
+    being mistaken for a marker.
+    """
+    lines = ["exec 2>/dev/null"]
+    for index, command in enumerate(commands):
+        lines.append(f"printf '%s %s\\n' '__IGB_{nonce}' {index}")
+        lines.append(f"( {command} ) </dev/null")
+        lines.append(f"printf '\\n%s %s %s\\n' '__IGE_{nonce}' {index} $?")
+    lines.append("exit 0")
+    return "\n".join(lines) + "\n"
+
+
+def parse_batch_output(
+    output: str, commands: List[str], nonce: str, max_bytes: Optional[int] = None
+) -> Dict[str, Tuple[str, int]]:
+    """Split framed script output back into ``{command: (stdout, exit_status)}``.
+
+    Sections whose end marker is missing (script cut short) are left out so
+    the caller falls back to running those commands individually. A section
+    longer than ``max_bytes`` is cut back to its last full line within the
+    limit and given an exit status of -1, like a command that did not finish.
+    """
+    pattern = re.compile(
+        rf"^__IGB_{nonce} (\d+)\n(.*?)\n__IGE_{nonce} \1 (\d+)$",
+        re.DOTALL | re.MULTILINE,
+    )
+    results: Dict[str, Tuple[str, int]] = {}
+    for match in pattern.finditer(output):
+        index = int(match.group(1))
+        if not 0 <= index < len(commands):
+            continue
+        text, status = match.group(2), int(match.group(3))
+        data = text.encode("utf-8")
+        if max_bytes is not None and len(data) > max_bytes:
+            data = data[:max_bytes]
+            text, status = data[: data.rfind(b"\n") + 1].decode("utf-8", "ignore"), -1
+        results[commands[index]] = (text.strip(), status)
+    return results
+
+
+def prefetch_commands(
+    ssh: Any, commands: Iterable[str], timeout: int = 10, max_bytes: int = DEFAULT_OUTPUT_LIMIT
+) -> Dict[str, Tuple[str, int]]:
+    """Run ``commands`` over a single exec channel and return their framed outputs.
+
+    Each section is held to ``max_bytes`` (see ``parse_batch_output``) and
+    the script's whole output to ``_BATCH_OUTPUT_FACTOR`` times that.
+    Sections cut off by that cap or by the deadline are left for the
+    collectors to run individually.
+    """
+    commands = list(dict.fromkeys(commands))
+    nonce = secrets.token_hex(8)
+    stdin, stdout, _ = ssh.exec_command("sh -s", timeout=timeout)
+    stdin.write(build_batch_script(commands, nonce))
+    stdin.flush()
+    stdin.channel.shutdown_write()
+    result = drain_channel(stdout.channel, timeout, max_bytes * _BATCH_OUTPUT_FACTOR)
+    return parse_batch_output(result.stdout.decode("utf-8", "ignore"), commands, nonce, max_bytes)
+
+
+def _run_channel(transport: Any, command: str, timeout: int, max_bytes: int) -> Tuple[str, int]:
+    channel = transport.open_session(timeout=timeout)
+    try:
+        channel.settimeout(timeout)
+        channel.exec_command(f"{command} 2>/dev/null")
+        channel.shutdown_write()
+        result = drain_channel(channel, timeout, max_bytes)
+        if result.truncated or result.timed_out:
+            # Leave it to the collectors, which report the partial output
+            raise RuntimeError(f"incomplete output from {command!r}")
+        return result.stdout.decode("utf-8", "ignore").strip(), result.exit_status
+    finally:
+        channel.close()
+
+
+def _channel_pool() -> ThreadPoolExecutor:
+    global _channel_executor
+    with _channel_lock:
+        if _channel_executor is None:
+            _channel_executor = ThreadPoolExecutor(max_workers=_CHANNEL_WORKERS, thread_name_prefix="ssh-channel")
+        return _channel_executor
+
+
+def prefetch_parallel(
+    ssh: Any,
+    commands: Iterable[str],
+    timeout: int = 10,
+    max_channels: int = DEFAULT_SSH_CHANNELS,
+    max_bytes: int = DEFAULT_OUTPUT_LIMIT,
+) -> Dict[str, Tuple[str, int]]:
+    """Run ``commands`` on concurrent exec channels of one SSH transport.
+
+    At most ``max_channels`` channels are open at a time, and the next
+    command starts as soon as one completes, so the wall time tracks the
+    slowest commands instead of the sum of all of them. The channels run on
+    a thread pool shared by every probe, which bounds the poller's threads
+    however many hosts are prefetched at once. Commands whose channel fails
+    are omitted and later run individually by the collectors.
+    """
+    pending = list(dict.fromkeys(commands))
+    transport = ssh.get_transport()
+    if transport is None or not pending:
+        return {}
+    pool = _channel_pool()
+    limit = max(1, int(max_channels or DEFAULT_SSH_CHANNELS))
+    pending.reverse()
+    running: Dict[Any, str] = {}
+    results: Dict[str, Tuple[str, int]] = {}
+    while pending or running:
+        while pending and len(running) < limit:
+            command = pending.pop()
+            running[pool.submit(_run_channel, transport, command, timeout, max_bytes)] = command
+        done, _ = wait(running, return_when=FIRST_COMPLETED)
+        for future in done:
+            command = running.pop(future)
+            try:
+                results[command] = future.result()
+            except Exception:
+                continue
+    return results
+
+
+def prefetch_files(
+    ssh: Any, commands: Iterable[str], timeout: int = 10, max_bytes: int = DEFAULT_OUTPUT_LIMIT
+) -> Dict[str, Tuple[str, int]]:
+    """Answer the file-reading ``commands`` (see ``UNIX_FILE_COMMANDS``) over one SFTP channel.
+
+    Every file is opened first and the first read of each is issued before
+    any reply is awaited, so the reads travel together instead of costing a
+    round trip per file. Each file is read once even when several commands
+    use it. Files that cannot be opened or exceed ``max_bytes`` are left
+    out, so their commands run over exec as usual.
+    """
+    wanted = [command for command in dict.fromkeys(commands) if command in UNIX_FILE_COMMANDS]
+    paths = list(dict.fromkeys(UNIX_FILE_COMMANDS[command][0] for command in wanted))
+    if not paths:
+        return {}
+    sftp = ssh.open_sftp()
+    try:
+        sftp.get_channel().settimeout(timeout)
+        handles = {}
+        for path in paths:
+            try:
+                handles[path] = sftp.open(path, "rb")
+            except IOError:
+                continue
+        for handle in handles.values():
+            handle.prefetch(min(_SFTP_CHUNK, max_bytes))
+        contents = {}
+        for path, handle in handles.items():
+            try:
+                data = handle.read(max_bytes + 1)
+            except IOError:
+                continue
+            finally:
+                handle.close()
+            if len(data) <= max_bytes:
+                # Oversized files go over exec, which reports the truncation
+                contents[path] = data.decode("utf-8", "ignore")
+    finally:
+        sftp.close()
+
+    results: Dict[str, Tuple[str, int]] = {}
+    for command in wanted:
+        path, line_filter = UNIX_FILE_COMMANDS[command]
+        if path not in contents:
+            continue
+        text = contents[path]
+        if line_filter is not None:
+            lines = [line for line in text.splitlines() if line_filter in line]
+            results[command] = ("\n".join(lines), 0 if lines else 1)
+        else:
+            results[command] = (text.strip(), 0)
+    return results
+
+
+class PrefetchedSSH:
+    """SSH client stand-in that answers prefetched commands from memory.
+
+    ``run_ssh_command`` consults ``lookup`` first; any command that was not
+    part of the batch goes to the wrapped client as before, so collectors
+    work unchanged whether or not batching is enabled. It also carries the
+    probe's per-command deadline and output limit, and collects warnings
+    about output that hit them.
+    """
+
+    def __init__(
+        self,
+        client: Any,
+        outputs: Dict[str, Tuple[str, int]],
+        timeout: Optional[int] = None,
+        output_limit: int = DEFAULT_OUTPUT_LIMIT,
+    ) -> None:
+        self.client = client
+        self.outputs = outputs
+        self.timeout = timeout
+        self.output_limit = output_limit
+        self.warnings: List[str] = []
+
+    def lookup(self, command: str) -> Optional[str]:
+        """Prefetched output of ``command``; a cut-off section also records a warning."""
+        result = self.outputs.get(command)
+        if result is None:
+            return None
+        if result[1] == -1:
+            self.warnings.append(f"Output of '{command}' exceeded {self.output_limit} bytes; using a partial result")
+        return result[0]
+
+    def exec_command(self, *args: Any, **kwargs: Any) -> Any:
+        return self.client.exec_command(*args, **kwargs)
+
+    def close(self) -> None:
+        self.client.close()
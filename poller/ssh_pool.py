@@ -0,0 +1,182 @@
+import hashlib
+import socket
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Tuple
+
+import paramiko
+
+__all__ = ["SSHConnectionPool", "credential_fingerprint", "DEFAULT_POOL_SIZE", "DEFAULT_POOL_IDLE", "DEFAULT_POOL_KEEPALIVE"]
+
+
+DEFAULT_POOL_SIZE = 256
+DEFAULT_POOL_IDLE = 300
+DEFAULT_POOL_KEEPALIVE = 30
+
+# Errors that mean the pooled transport died underneath us rather than the
+# command failing; the probe is retried once on a fresh connection.
+_DEAD_PEER_ERRORS = (paramiko.SSHException, EOFError, socket.error)
+
+# (host, port, username, credential fingerprint)
+PoolKey = Tuple[str, int, str, str]
+
+
+def credential_fingerprint(target: Dict[str, Any], fields: Tuple[str, ...] = ("password", "ssh_key")) -> str:
+    """Short digest of the target's credentials, so a login is not reused once they change."""
+    digest = hashlib.sha256()
+    for field in fields:
+        digest.update(str(target.get(field) or "").encode("utf-8", "ignore") + b"\0")
+    return digest.hexdigest()[:16]
+
+
+class SSHConnectionPool:
+    """Authenticated SSH clients kept open between poll cycles.
+
+    Clients are keyed on ``(host, port, username)`` plus a fingerprint of the
+    password and key, so changed credentials always log in afresh and the
+    idle client that used the old ones is closed. Each transport sends
+    keepalives so NAT and firewall state survive between polls; entries idle
+    for longer than ``idle_timeout`` are closed, and once ``max_size`` is
+    reached the least recently used idle client is evicted. A client whose
+    transport has died is replaced transparently, so a steady-state probe only
+    pays for opening channels. A ``max_size`` of 0 disables pooling.
+    """
+
+    def __init__(
+        self,
+        connect: Callable[[Dict[str, Any]], Any],
+        max_size: int = DEFAULT_POOL_SIZE,
+        idle_timeout: float = DEFAULT_POOL_IDLE,
+        keepalive: int = DEFAULT_POOL_KEEPALIVE,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._connect = connect
+        self._clock = clock
+        self._entries: "OrderedDict[PoolKey, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.configure(max_size, idle_timeout, keepalive)
+
+    def configure(self, max_size: Any, idle_timeout: Any, keepalive: Any = DEFAULT_POOL_KEEPALIVE) -> None:
+        self.max_size = max(0, int(max_size or 0))
+        self.idle_timeout = max(1.0, float(idle_timeout or DEFAULT_POOL_IDLE))
+        self.keepalive = max(0, int(keepalive or 0))
+        self.prune()
+
+    @staticmethod
+    def key_for(target: Dict[str, Any]) -> PoolKey:
+        return (
+            str(target.get("host") or ""),
+            int(target.get("port") or 22),
+            str(target.get("username") or ""),
+            credential_fingerprint(target),
+        )
+
+    @staticmethod
+    def _alive(client: Any) -> bool:
+        transport = client.get_transport()
+        return transport is not None and transport.is_active()
+
+    def _close(self, entries: Any) -> None:
+        for entry in entries:
+            try:
+                entry["client"].close()
+            except Exception:
+                pass
+
+    def prune(self) -> None:
+        """Close idle, dead and over-capacity clients."""
+        now = self._clock()
+        closing = []
+        with self._lock:
+            for key, entry in list(self._entries.items()):
+                if entry["users"]:
+                    continue
+                if now - entry["last_used"] > self.idle_timeout or not self._alive(entry["client"]):
+                    closing.append(self._entries.pop(key))
+            idle = [key for key, entry in self._entries.items() if not entry["users"]]
+            while len(self._entries) > self.max_size and idle:
+                closing.append(self._entries.pop(idle.pop(0)))
+        self._close(closing)
+
+    def _checkout(self, key: PoolKey, target: Dict[str, Any]) -> Tuple[Any, bool]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self._alive(entry["client"]):
+                entry["users"] += 1
+                self._entries.move_to_end(key)
+                return entry["client"], True
+            stale = [self._entries.pop(key)] if entry is not None and not entry["users"] else []
+            # Logins of the same account with credentials that have since changed
+            superseded = [other for other, item in self._entries.items() if other[:3] == key[:3] and not item["users"]]
+            stale.extend(self._entries.pop(other) for other in superseded)
+        self._close(stale)
+
+        client = self._connect(target)
+        if self.keepalive:
+            transport = client.get_transport()
+            if transport is not None:
+                transport.set_keepalive(self.keepalive)
+        if not self.max_size:
+            return client, False
+        with self._lock:
+            if key in self._entries:
+                # Another worker connected to the same endpoint meanwhile; keep
+                # ours private to this probe rather than replacing theirs
+                return client, False
+            self._entries[key] = {"client": client, "users": 1, "last_used": self._clock()}
+        self.prune()
+        return client, False
+
+    def _checkin(self, key: PoolKey, client: Any, discard: bool = False) -> None:
+        with self._lock:
+            entry = self._entries.get(key)
+            pooled = entry is not None and entry["client"] is client
+            if pooled:
+                entry["users"] = max(0, entry["users"] - 1)
+                entry["last_used"] = self._clock()
+                if discard and not entry["users"]:
+                    del self._entries[key]
+                    pooled = False
+        if not pooled:
+            self._close([{"client": client}])
+
+    def run(self, target: Dict[str, Any], func: Callable[[Any], Any]) -> Any:
+        """Call ``func(client)`` on a pooled client for ``target``.
+
+        If a reused client turns out to be dead, it is discarded and ``func``
+        runs once more on a new connection.
+        """
+        key = self.key_for(target)
+        client, reused = self._checkout(key, target)
+        try:
+            result = func(client)
+        except _DEAD_PEER_ERRORS:
+            alive = self._alive(client)
+            self._checkin(key, client, discard=True)
+            if not reused or alive:
+                raise
+            client, _ = self._checkout(key, target)
+            try:
+                result = func(client)
+            except BaseException:
+                self._checkin(key, client, discard=not self._alive(client))
+                raise
+        except BaseException:
+            self._checkin(key, client, discard=not self._alive(client))
+            raise
+        self._checkin(key, client)
+        return result
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "in_use": sum(1 for entry in self._entries.values() if entry["users"]),
+            }
+
+    def close(self) -> None:
+        with self._lock:
+            entries = list(self._entries.values())
+            self._entries.clear()
+        self._close(entries)
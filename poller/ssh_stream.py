@@ -0,0 +1,68 @@
+import select
+import time
+from typing import Any, Callable, NamedTuple
+
+__all__ = ["ChannelOutput", "drain_channel", "DEFAULT_OUTPUT_LIMIT"]
+
+
+DEFAULT_OUTPUT_LIMIT = 1024 * 1024
+_READ_CHUNK = 32768
+
+
+class ChannelOutput(NamedTuple):
+    stdout: bytes
+    stderr: bytes
+    exit_status: int
+    truncated: bool
+    timed_out: bool
+
+    def text(self) -> str:
+        """Decoded stdout; a truncated tail is cut back to the last full line."""
+        data = self.stdout
+        if self.truncated or self.timed_out:
+            data = data[: data.rfind(b"\n") + 1]
+        return data.decode("utf-8", "ignore")
+
+
+def drain_channel(
+    channel: Any,
+    timeout: float,
+    max_bytes: int = DEFAULT_OUTPUT_LIMIT,
+    clock: Callable[[], float] = time.monotonic,
+) -> ChannelOutput:
+    """Read stdout and stderr of an exec channel concurrently within bounds.
+
+    Both streams are drained as data arrives, so a command that fills the
+    stderr window can never stall stdout. Reading stops, and the channel is
+    closed, once ``timeout`` seconds have passed or either stream exceeds
+    ``max_bytes``; the result says which happened. Exit status is -1 when the
+    command did not finish.
+    """
+    deadline = clock() + timeout
+    stdout = bytearray()
+    stderr = bytearray()
+    truncated = timed_out = False
+
+    while True:
+        while channel.recv_ready() and not truncated:
+            stdout += channel.recv(_READ_CHUNK)
+            truncated = len(stdout) > max_bytes
+        while channel.recv_stderr_ready() and not truncated:
+            stderr += channel.recv_stderr(_READ_CHUNK)
+            truncated = len(stderr) > max_bytes
+        if truncated:
+            break
+        if channel.exit_status_ready() and not channel.recv_ready() and not channel.recv_stderr_ready():
+            break
+        remaining = deadline - clock()
+        if remaining <= 0:
+            timed_out = True
+            break
+        # The channel's fileno becomes readable on stdout, stderr or close
+        select.select([channel], [], [], min(remaining, 1.0))
+
+    finished = not truncated and not timed_out
+    exit_status = channel.recv_exit_status() if finished else -1
+    if not finished:
+        channel.close()
+    return ChannelOutput(bytes(stdout[:max_bytes]), bytes(stderr[:max_bytes]), exit_status, truncated, timed_out)
@@ -0,0 +1,58 @@
+import json
+import os
+import shlex
+from typing import Any, Dict, Iterable
+
+from ssh_stream import DEFAULT_OUTPUT_LIMIT, drain_channel
+
+__all__ = ["UnixHelperError", "build_helper_script", "run_unix_helper", "HELPER_SCRIPT_PATH"]
+
+
+HELPER_SCRIPT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "unix_helper.sh")
+
+with open(HELPER_SCRIPT_PATH, "r", encoding="utf-8") as _handle:
+    _HELPER_SCRIPT = _handle.read()
+
+
+class UnixHelperError(RuntimeError):
+    """Raised when the remote helper did not produce a usable document."""
+
+
+def build_helper_script(tiers: Iterable[str], os_hint: str = "linux") -> str:
+    """The helper script with the tiers to collect and the OS hint filled in."""
+    prelude = (
+        f"IG_TIERS={shlex.quote(' '.join(sorted(tiers)))}\n"
+        f"IG_OS_HINT={shlex.quote(os_hint or 'linux')}\n"
+    )
+    return prelude + _HELPER_SCRIPT
+
+
+def run_unix_helper(
+    ssh: Any,
+    tiers: Iterable[str],
+    os_hint: str = "linux",
+    timeout: int = 10,
+    max_bytes: int = DEFAULT_OUTPUT_LIMIT,
+) -> Dict[str, Any]:
+    """Stream the helper to ``sh -s`` on one exec channel and decode its JSON.
+
+    The result has ``os``, ``network`` and ``hardware`` sections for the
+    requested tiers, ``metrics`` always, and the host's ``boot`` marker.
+    """
+    stdin, stdout, _ = ssh.exec_command("sh -s", timeout=timeout)
+    stdin.write(build_helper_script(tiers, os_hint))
+    stdin.flush()
+    stdin.channel.shutdown_write()
+    result = drain_channel(stdout.channel, timeout, max_bytes)
+    if result.truncated:
+        raise UnixHelperError(f"helper output exceeded {max_bytes} bytes")
+    if result.timed_out:
+        raise UnixHelperError(f"helper did not finish within {timeout}s")
+    try:
+        document = json.loads(result.stdout.decode("utf-8", "ignore"))
+    except ValueError as exc:
+        raise UnixHelperError(f"helper returned invalid JSON (exit status {result.exit_status}): {exc}") from exc
+    if not isinstance(document, dict) or not isinstance(document.get("metrics"), dict):
+        raise UnixHelperError("helper returned an unexpected document")
+    return document
+
@@ -0,0 +1,274 @@
+# Remote collector for unix_probe (poller.unix_collection = helper).
+#
+# Streamed to `sh -s` over the probe's SSH connection and never installed on
+# the host. The poller prepends IG_TIERS (collection tiers to read) and
+# IG_OS_HINT. Prints a single JSON document:
+#   {"os": {...}, "network": {"interfaces": [...]}, "hardware": {...},
+#    "metrics": {...}, "boot": "..."}
+# using the attribute shapes of the command collectors in poller_db.py.
+# Only POSIX sh and awk are needed; facts come from /proc and /sys on Linux
+# and from sysctl on BSD and macOS.
+#
+# The body is one brace group, so sh has read the whole script before any
+# command runs and nothing can consume the rest of it from stdin.
+
+{
+exec 2>/dev/null
+LC_ALL=C
+export LC_ALL
+PATH=$PATH:/sbin:/usr/sbin:/usr/local/sbin
+
+want() {
+    case " $IG_TIERS " in *" $1 "*) return 0 ;; esac
+    return 1
+}
+
+# JSON string literal; multi-line values keep their line breaks
+js() {
+    printf '%s\n' "$1" | awk 'BEGIN { ORS = "" }
+        { gsub(/\\/, "\\\\"); gsub(/"/, "\\\""); gsub(/\t/, "\\t"); gsub(/[\001-\037\177]/, "")
+          s = (NR > 1 ? s "\\n" : "") $0 }
+        END { print "\"" s "\"" }'
+}
+
+# JSON integer, or null for anything that is not a plain number
+jn() {
+    case "$1" in
+        '' | *[!0-9]*) printf null ;;
+        *) printf '%s' "$1" | awk '{ sub(/^0+/, ""); print ($0 == "" ? "0" : $0) }' | tr -d '\n' ;;
+    esac
+}
+
+# Appends "key":value to the object being built in $obj
+field() {
+    [ -n "$2" ] || return 0
+    obj="$obj${obj:+,}\"$1\":$2"
+}
+sfield() {
+    [ -n "$2" ] || return 0
+    field "$1" "$(js "$2")"
+}
+nfield() {
+    case "$2" in '' | *[!0-9]*) return 0 ;; esac
+    field "$1" "$(jn "$2")"
+}
+
+lower() {
+    printf '%s' "$1" | tr 'ABCDEFGHIJKLMNOPQRSTUVWXYZ' 'abcdefghijklmnopqrstuvwxyz'
+}
+
+kernel_name=$(uname -s)
+kernel_lower=$(lower "$kernel_name")
+family=$(lower "${IG_OS_HINT:-linux}")
+case $family in *bsd*) family=bsd ;; esac
+distribution=
+os_id=
+case $kernel_lower in
+    '') ;;
+    openbsd | freebsd | netbsd | dragonfly) family=bsd; distribution=$kernel_name; os_id=$kernel_lower ;;
+    *bsd*) family=bsd; distribution=$kernel_name ;;
+    linux | gnu/linux) family=linux ;;
+    darwin | macos | 'mac os x') family=macos ;;
+    *) family=$kernel_lower ;;
+esac
+
+os_release() {
+    awk -v key="$1" 'index($0, "=") {
+        k = substr($0, 1, index($0, "=") - 1); gsub(/^[ \t]+|[ \t]+$/, "", k)
+        if (k != key) next
+        v = substr($0, index($0, "=") + 1); gsub(/^[ \t]+|[ \t]+$/, "", v); gsub(/^"+|"+$/, "", v)
+        print v; exit
+    }' /etc/os-release
+}
+
+sections=
+
+if want identity; then
+    os_name=
+    os_version=
+    if [ -s /etc/os-release ]; then
+        os_name=$(os_release PRETTY_NAME)
+        [ -n "$os_name" ] || os_name=$(os_release NAME)
+        os_version=$(os_release VERSION)
+        [ -n "$os_version" ] || os_version=$(os_release VERSION_ID)
+        release_id=$(os_release ID)
+        if [ -n "$release_id" ]; then
+            os_id=$release_id
+            distro_id=$(lower "$release_id")
+            case $distro_id in
+                *bsd*)
+                    family=bsd
+                    distribution=$(os_release NAME)
+                    [ -n "$distribution" ] || distribution=${kernel_name:-$distro_id}
+                    ;;
+                *) family=$distro_id ;;
+            esac
+        fi
+    else
+        case "$kernel_lower $IG_OS_HINT" in
+            *bsd*)
+                family=bsd
+                os_version=$(sysctl -n kern.version)
+                os_name=$(sysctl -n kern.ostype)
+                if [ -n "$os_name" ]; then
+                    [ -n "$distribution" ] || distribution=$os_name
+                    [ -n "$os_id" ] || os_id=$(lower "$os_name")
+                fi
+                ;;
+        esac
+    fi
+    case $family in *bsd*) [ -n "$distribution" ] || distribution=$kernel_name ;; esac
+    if [ -n "$distribution" ] && [ -z "$os_id" ]; then
+        os_id=$(lower "$distribution" | tr ' ' '-')
+    fi
+
+    obj=
+    sfield family "$family"
+    sfield kernel_name "$kernel_name"
+    sfield kernel_release "$(uname -r)"
+    sfield architecture "$(uname -m)"
+    sfield hostname "$(hostname)"
+    sfield name "$os_name"
+    sfield version "$os_version"
+    sfield id "$os_id"
+    sfield distribution "$distribution"
+    sections="$sections${sections:+,}\"os\":{$obj}"
+fi
+
+# Loopback addresses are left out, as the command collectors do
+interfaces_awk='
+function q(s) { gsub(/\\/, "\\\\", s); gsub(/"/, "\\\"", s); return "\"" s "\"" }
+function add(i, a,    ip) {
+    ip = a; sub(/\/.*/, "", ip); sub(/%.*/, "", ip)
+    if (ip ~ /^127\./ || ip == "::1") return
+    addrs[i] = addrs[i] (addrs[i] == "" ? "" : ",") q(a)
+}
+END {
+    printf "["
+    for (i = 1; i <= n; i++)
+        printf "%s{\"name\":%s,\"addresses\":[%s],\"mac\":%s,\"is_up\":%s}", (i > 1 ? "," : ""), q(name[i]), addrs[i], (mac[i] == "" ? "null" : q(mac[i])), (up[i] ? "true" : "false")
+    printf "]"
+}'
+
+# Linux: links from /sys (in ifindex order), addresses from one `ip -o addr`
+linux_interfaces() {
+    {
+        for dev in /sys/class/net/*; do
+            [ -r "$dev/ifindex" ] || continue
+            flags=$(cat "$dev/flags")
+            printf 'L %s %s %s %s\n' "$(cat "$dev/ifindex")" "${dev##*/}" "$(( ${flags:-0} & 1 ))" "$(cat "$dev/address")"
+        done | sort -n -k 2
+        printf '%s\n' "$1"
+    } | awk '
+        $1 == "L" { n++; name[n] = $3; up[n] = $4; mac[n] = $5; index_of[$3] = n; next }
+        $3 == "inet" || $3 == "inet6" { dev = $2; sub(/@.*/, "", dev); if (dev in index_of) add(index_of[dev], $4) }
+    '"$interfaces_awk"
+}
+
+# BSD, macOS and Linux without iproute2: the same rules as parse_ifconfig
+ifconfig_interfaces() {
+    ifconfig -a | awk '
+        /^[ \t]*$/ { next }
+        /^[^ \t]/ {
+            n++; nm = $0; sub(/:.*/, "", nm); gsub(/^[ \t]+|[ \t]+$/, "", nm); name[n] = nm; mac[n] = ""
+            flags = ""
+            if (index($0, "<") && index($0, ">")) { flags = substr($0, index($0, "<") + 1); flags = substr(flags, 1, index(flags, ">") - 1) }
+            up[n] = (flags != "" ? (("," flags ",") ~ /,UP,/) : (index($0, "UP") > 0))
+            next
+        }
+        n == 0 { next }
+        $1 == "inet" || $1 == "inet6" { if (NF >= 2) add(n, $2); next }
+        match($0, /(ether|lladdr|address)[ \t]+[0-9A-Fa-f:]+/) {
+            m = substr($0, RSTART, RLENGTH); sub(/^[a-z]+[ \t]+/, "", m)
+            if (length(m) >= 6) mac[n] = tolower(m)
+        }
+    '"$interfaces_awk"
+}
+
+if want network; then
+    ip_addrs=
+    [ -d /sys/class/net ] && ip_addrs=$(ip -o addr show)
+    if [ -n "$ip_addrs" ]; then
+        interfaces=$(linux_interfaces "$ip_addrs")
+    else
+        interfaces=$(ifconfig_interfaces)
+    fi
+    sections="$sections${sections:+,}\"network\":{\"interfaces\":${interfaces:-[]}}"
+fi
+
+if want hardware; then
+    obj=
+    if [ -r /proc/cpuinfo ]; then
+        sfield cpu_model "$(awk -F: '/^model name/ { sub(/^[ \t]+/, "", $2); print $2; exit }' /proc/cpuinfo)"
+        nfield cpu_count "$(awk '/^processor[ \t]*:/ { n++ } END { if (n) print n }' /proc/cpuinfo)"
+        sfield architecture "$(uname -m)"
+        mem_kb=$(awk '$1 == "MemTotal:" { print $2; exit }' /proc/meminfo)
+        case $mem_kb in '' | *[!0-9]*) ;; *) nfield memory_bytes "$((mem_kb * 1024))" ;; esac
+    else
+        sfield cpu_model "$(sysctl -n hw.model)"
+        nfield cpu_count "$(sysctl -n hw.ncpu)"
+        sfield architecture "$(uname -m)"
+        mem=$(sysctl -n hw.memsize)
+        [ -n "$mem" ] || mem=$(sysctl -n hw.physmem)
+        nfield memory_bytes "$mem"
+    fi
+    sections="$sections${sections:+,}\"hardware\":{$obj}"
+fi
+
+# Metrics are collected on every poll
+obj=
+if [ -r /proc/loadavg ]; then
+    load=$(awk '{ print $1, $2, $3 }' /proc/loadavg)
+else
+    load=$(sysctl -n vm.loadavg | tr -d '{}')
+fi
+set -- $load
+case "$1$2$3" in
+    *[!0-9.]* | '') ;;
+    *) field cpu_load "{\"1m\":$1,\"5m\":$2,\"15m\":$3}" ;;
+esac
+metrics=$obj
+
+obj=
+if [ -r /proc/meminfo ]; then
+    eval "$(awk '$1 ~ /^(MemTotal|MemAvailable|MemFree|SwapTotal|SwapFree):$/ && $2 ~ /^[0-9]+$/ { k = $1; sub(/:$/, "", k); print "mem_" k "=" $2 }' /proc/meminfo)"
+    [ -z "$mem_MemTotal" ] || nfield total_bytes "$((mem_MemTotal * 1024))"
+    [ -z "$mem_MemAvailable" ] || nfield available_bytes "$((mem_MemAvailable * 1024))"
+    [ -z "$mem_MemFree" ] || nfield free_bytes "$((mem_MemFree * 1024))"
+    [ -z "$mem_SwapTotal" ] || nfield swap_total_bytes "$((mem_SwapTotal * 1024))"
+    [ -z "$mem_SwapFree" ] || nfield swap_free_bytes "$((mem_SwapFree * 1024))"
+else
+    nfield total_bytes "$(sysctl -n hw.physmem)"
+    nfield user_bytes "$(sysctl -n hw.usermem)"
+    page_size=$(sysctl -n hw.pagesize)
+    free_pages=$(sysctl -n vm.stats.vm.v_free_count)
+    case "$page_size:$free_pages" in
+        *[!0-9:]* | :* | *:) ;;
+        *) nfield free_bytes "$((page_size * free_pages))" ;;
+    esac
+    set -- $(swapctl -l -k | awk 'NR > 1 && NF >= 4 && $2 ~ /^[0-9]+$/ && $4 ~ /^[0-9]+$/ { t += $2; f += $4 } END { printf "%d %d", t, f }')
+    [ "${1:-0}" = 0 ] || nfield swap_total_bytes "$(($1 * 1024))"
+    [ "${2:-0}" = 0 ] || nfield swap_free_bytes "$(($2 * 1024))"
+fi
+[ -z "$obj" ] || metrics="$metrics${metrics:+,}\"memory\":{$obj}"
+
+disks=$(df -P -k | awk '
+    function q(s) { gsub(/\\/, "\\\\", s); gsub(/"/, "\\\"", s); return "\"" s "\"" }
+    function num(s) { return s ~ /^[0-9]+$/ ? s : "null" }
+    NR == 1 || NF < 6 { next }
+    {
+        mount = $6
+        for (i = 7; i <= NF; i++) mount = mount " " $i
+        size = num($2); used = num($3); avail = num($4)
+        if (size == "null" || used == "null" || avail == "null") size = used = avail = "null"
+        printf "%s{\"filesystem\":%s,\"size_kb\":%s,\"used_kb\":%s,\"available_kb\":%s,\"capacity\":%s,\"mount\":%s}", (n++ ? "," : ""), q($1), size, used, avail, q($5), q(mount)
+    }')
+[ -z "$disks" ] || metrics="$metrics${metrics:+,}\"disks\":[$disks]"
+sections="$sections${sections:+,}\"metrics\":{$metrics}"
+
+boot=$(cat /proc/sys/kernel/random/boot_id)
+[ -n "$boot" ] || boot=$(sysctl -n kern.boottime)
+[ -z "$boot" ] || sections="$sections,\"boot\":$(js "$boot")"
+
+printf '{%s}\n' "$sections"
+} </dev/null
@@ -1,6 +1,6 @@
 import datetime
 import json
-from typing import Any, Dict, List, Optional, Sequence, Tuple
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
 
 import requests
 
@@ -46,16 +46,26 @@ function Get-AppInventory {
 
 $os = Get-CimInstance -ClassName Win32_OperatingSystem |
       Select-Object Caption, Version, BuildNumber, CSName, OSArchitecture, LastBootUpTime, TotalVisibleMemorySize, FreePhysicalMemory
-$computer = Get-CimInstance -ClassName Win32_ComputerSystem |
-            Select-Object Manufacturer, Model, TotalPhysicalMemory, NumberOfProcessors, NumberOfLogicalProcessors, Name
-$processors = Get-CimInstance -ClassName Win32_Processor |
-             Select-Object Name, NumberOfCores, NumberOfLogicalProcessors, MaxClockSpeed
-$interfaces = Get-CimInstance -ClassName Win32_NetworkAdapterConfiguration -Filter "IPEnabled = TRUE" |
-             Select-Object Description, MACAddress, IPAddress, IPSubnet, DefaultIPGateway, DHCPEnabled
+$computer = $null
+$processors = @()
+if (__COLLECT_HARDWARE__) {
+    $computer = Get-CimInstance -ClassName Win32_ComputerSystem |
+                Select-Object Manufacturer, Model, TotalPhysicalMemory, NumberOfProcessors, NumberOfLogicalProcessors, Name
+    $processors = Get-CimInstance -ClassName Win32_Processor |
+                 Select-Object Name, NumberOfCores, NumberOfLogicalProcessors, MaxClockSpeed
+}
+$interfaces = @()
+if (__COLLECT_NETWORK__) {
+    $interfaces = Get-CimInstance -ClassName Win32_NetworkAdapterConfiguration -Filter "IPEnabled = TRUE" |
+                 Select-Object Description, MACAddress, IPAddress, IPSubnet, DefaultIPGateway, DHCPEnabled
+}
 $disks = Get-CimInstance -ClassName Win32_LogicalDisk |
          Where-Object { $_.DriveType -eq 3 } |
          Select-Object DeviceID, Size, FreeSpace, FileSystem, VolumeName
-$applications = Get-AppInventory -MaxItems __APP_LIMIT__
+$applications = @()
+if (__APP_LIMIT__ -gt 0) {
+    $applications = Get-AppInventory -MaxItems __APP_LIMIT__
+}
 
 $payload = @{
     os = $os
@@ -140,15 +150,21 @@ def _collect_via_wmi(target: Dict[str, Any]) -> Dict[str, Any]:
         services = i_wbem_login.NTLMLogin(namespace, None, None)
         i_wbem_login.RemRelease()
 
+        tiers = _collection_tiers(target)
         os_rows = _wmi_query(services, "SELECT Caption, Version, BuildNumber, CSName, OSArchitecture, LastBootUpTime, TotalVisibleMemorySize, FreePhysicalMemory FROM Win32_OperatingSystem")
-        computer_rows = _wmi_query(services, "SELECT Manufacturer, Model, TotalPhysicalMemory, NumberOfProcessors, NumberOfLogicalProcessors, Name FROM Win32_ComputerSystem")
-        processor_rows = _wmi_query(services, "SELECT Name, NumberOfCores, NumberOfLogicalProcessors, MaxClockSpeed FROM Win32_Processor")
-        interface_rows = _wmi_query(services, "SELECT Description, MACAddress, IPAddress, IPSubnet, DefaultIPGateway, DHCPEnabled FROM Win32_NetworkAdapterConfiguration WHERE IPEnabled = TRUE")
+        computer_rows: List[Dict[str, Any]] = []
+        processor_rows: List[Dict[str, Any]] = []
+        if "hardware" in tiers:
+            computer_rows = _wmi_query(services, "SELECT Manufacturer, Model, TotalPhysicalMemory, NumberOfProcessors, NumberOfLogicalProcessors, Name FROM Win32_ComputerSystem")
+            processor_rows = _wmi_query(services, "SELECT Name, NumberOfCores, NumberOfLogicalProcessors, MaxClockSpeed FROM Win32_Processor")
+        interface_rows: List[Dict[str, Any]] = []
+        if "network" in tiers:
+            interface_rows = _wmi_query(services, "SELECT Description, MACAddress, IPAddress, IPSubnet, DefaultIPGateway, DHCPEnabled FROM Win32_NetworkAdapterConfiguration WHERE IPEnabled = TRUE")
         disk_rows = _wmi_query(services, "SELECT DeviceID, Size, FreeSpace, FileSystem, VolumeName FROM Win32_LogicalDisk WHERE DriveType = 3")
 
         apps_rows: List[Dict[str, Any]] = []
         collect_apps = _bool_with_default(target.get("collect_applications"), True)
-        if collect_apps:
+        if collect_apps and "applications" in tiers:
             app_limit = _int_with_default(target.get("applications_limit"), 200)
             if app_limit > 0:
                 try:
@@ -197,11 +213,16 @@ def _collect_via_winrm(target: Dict[str, Any]) -> Dict[str, Any]:
         transport = "ntlm"
     elif isinstance(transport, str):
         transport = transport.lower()
+    tiers = _collection_tiers(target)
     collect_apps = _bool_with_default(target.get("collect_applications"), True)
     app_limit = _int_with_default(target.get("applications_limit"), 200)
-    if not collect_apps or app_limit <= 0:
+    if not collect_apps or app_limit <= 0 or "applications" not in tiers:
         app_limit = 0
-    script = _WINRM_COLLECTION_SCRIPT_TEMPLATE.replace("__APP_LIMIT__", str(app_limit))
+    script = (
+        _WINRM_COLLECTION_SCRIPT_TEMPLATE.replace("__APP_LIMIT__", str(app_limit))
+        .replace("__COLLECT_HARDWARE__", "$true" if "hardware" in tiers else "$false")
+        .replace("__COLLECT_NETWORK__", "$true" if "network" in tiers else "$false")
+    )
     validate_cert = _bool_with_default(target.get("winrm_validate_cert"), False)
     read_timeout = _int_with_default(target.get("winrm_read_timeout"), 30)
     operation_timeout = _int_with_default(target.get("winrm_operation_timeout"), 20)
@@ -607,6 +628,14 @@ def _normalize_wmi_value(value: Any) -> Any:
     return value
 
 
+def _collection_tiers(target: Dict[str, Any]) -> Set[str]:
+    """Tiers requested by the poller; everything when it did not ask for a subset."""
+    tiers = target.get("collect_tiers")
+    if tiers is None:
+        return {"identity", "hardware", "network", "applications", "metrics"}
+    return set(tiers)
+
+
 def _auth_context(target: Dict[str, Any]) -> Dict[str, Any]:
     raw_username = target.get("username")
     password = target.get("password")
@@ -243,6 +243,17 @@ switch ($action) {
     echo json_encode(PollerController::saveSanitizationRules($in));
     break;
 
+  case 'poller_breakers':
+    require_login(); require_role('admin');
+    echo json_encode(PollerController::getBreakers());
+    break;
+
+  case 'poller_breaker_reset':
+    require_login(); require_role('admin');
+    $assetId = $_GET['asset_id'] ?? '';
+    echo json_encode(PollerController::resetBreaker($assetId));
+    break;
+
   case 'poller_logs':
     require_login();
     $since = $_GET['since'] ?? null;
@@ -800,6 +800,9 @@ const loadSettingsData = () => {
     el('#poller-interval').value = config.interval || 30;
     el('#poller-timeout').value = config.timeout || 10;
     el('#poller-ping-timeout').value = config.ping_timeout || 1;
+    el('#poller-concurrency').value = config.concurrency || 1;
+    el('#poller-engine').value = config.engine || 'threads';
+    el('#poller-scheduler').value = config.scheduler || 'cycle';
     el('#poller-api-url').value = config.api_url || '';
     el('#poller-api-key').value = config.api_key || '';
   });
@@ -855,6 +858,9 @@ const setupSettingsListeners = () => {
       interval: el('#poller-interval').value,
       timeout: el('#poller-timeout').value,
       ping_timeout: el('#poller-ping-timeout').value,
+      concurrency: el('#poller-concurrency').value,
+      engine: el('#poller-engine').value,
+      scheduler: el('#poller-scheduler').value,
       api_url: el('#poller-api-url').value,
       api_key: el('#poller-api-key').value
     };
@@ -1148,6 +1154,71 @@ const setupSettingsListeners = () => {
     refreshPollerInstances();
   }
 
+  const breakerList = el('#poller-breakers-list');
+  const BREAKER_STATE_LABELS = { open: 'backing off', half_open: 'retry pending', closed: 'failing' };
+
+  const renderBreakers = (breakers = []) => {
+    if (!breakerList) return;
+    if (!Array.isArray(breakers) || breakers.length === 0) {
+      breakerList.innerHTML = '<div class="muted">No assets are currently failing.</div>';
+      return;
+    }
+
+    breakerList.innerHTML = '';
+    breakers.forEach(breaker => {
+      const row = document.createElement('div');
+      row.className = 'poller-instance-row';
+      const stateLabel = BREAKER_STATE_LABELS[breaker.state] || breaker.state;
+      const retry = breaker.state === 'open' && breaker.opened_until ? ` until ${escapeHtml(breaker.opened_until)}` : '';
+      row.innerHTML = `
+        <div class="poller-instance-name">
+          <strong>${escapeHtml(breaker.name || breaker.asset_id)}</strong> <span class="badge">${escapeHtml(stateLabel)}</span>
+          <div class="muted small">${escapeHtml(String(breaker.consecutive_failures))} consecutive failures${retry}</div>
+        </div>
+        <div class="poller-instance-input muted small">${escapeHtml(breaker.last_error || '')}</div>
+        <div class="poller-instance-actions">
+          <button type="button" class="btn btn-outline-secondary btn-sm" data-action="reset">Reset</button>
+        </div>
+      `;
+
+      const resetBtn = row.querySelector('[data-action="reset"]');
+      if (resetBtn) {
+        resetBtn.onclick = () => {
+          api(`poller_breaker_reset&asset_id=${encodeURIComponent(breaker.asset_id)}`, 'POST', {}).then(res => {
+            if (res.success) {
+              showAlert('poller-breakers-status', `Backoff reset for ${breaker.name || breaker.asset_id}`, 'success');
+              refreshBreakers();
+            } else {
+              showAlert('poller-breakers-status', res.message || 'Failed to reset backoff', 'error');
+            }
+          }).catch(err => {
+            showAlert('poller-breakers-status', `Failed to reset backoff: ${err.message}`, 'error');
+          });
+        };
+      }
+
+      breakerList.appendChild(row);
+    });
+  };
+
+  const refreshBreakers = () => {
+    if (!breakerList) return Promise.resolve();
+    return api('poller_breakers').then(res => {
+      if (res.success) {
+        renderBreakers(res.breakers || []);
+      } else {
+        showAlert('poller-breakers-status', res.message || 'Failed to load backed-off assets', 'error');
+      }
+    }).catch(err => {
+      showAlert('poller-breakers-status', `Failed to load backed-off assets: ${err.message}`, 'error');
+    });
+  };
+
+  if (breakerList) {
+    el('#refresh-poller-breakers').onclick = refreshBreakers;
+    refreshBreakers();
+  }
+
   // Polling Log Viewer - Simple load on demand
   let lastLogId = 0;
   let autoRefresh = false;
@@ -1864,6 +1935,9 @@ const editAsset = (id) => {
       el('#asset-poll-username').value = a.poll_username || '';
       el('#asset-poll-password').value = a.poll_password || '';
       el('#asset-poll-port').value = a.poll_port || '';
+      el('#asset-poll-interval').value = a.poll_interval || '';
+      el('#asset-poll-allow-agent').value = a.poll_allow_agent === null || a.poll_allow_agent === undefined ? '' : String(Number(a.poll_allow_agent));
+      el('#asset-poll-look-for-keys').value = a.poll_look_for_keys === null || a.poll_look_for_keys === undefined ? '' : String(Number(a.poll_look_for_keys));
     el('#asset-poll-enable-password').value = a.poll_enable_password || '';
     updateEnablePasswordVisibility();
       
@@ -2017,6 +2091,9 @@ const setupAllHandlers = () => {
     el('#asset-poll-username').value = '';
     el('#asset-poll-password').value = '';
     el('#asset-poll-port').value = '';
+    el('#asset-poll-interval').value = '';
+    el('#asset-poll-allow-agent').value = '';
+    el('#asset-poll-look-for-keys').value = '';
     el('#asset-poll-enable-password').value = '';
     updateEnablePasswordVisibility();
     el('#modal-title').textContent = 'Add Asset';
@@ -2079,6 +2156,9 @@ const setupAllHandlers = () => {
         poll_username: el('#asset-poll-username').value || null,
         poll_password: el('#asset-poll-password').value || null,
         poll_port: el('#asset-poll-port').value ? parseInt(el('#asset-poll-port').value) : null,
+        poll_interval: el('#asset-poll-interval').value ? parseInt(el('#asset-poll-interval').value) : null,
+        poll_allow_agent: el('#asset-poll-allow-agent').value !== '' ? el('#asset-poll-allow-agent').value === '1' : null,
+        poll_look_for_keys: el('#asset-poll-look-for-keys').value !== '' ? el('#asset-poll-look-for-keys').value === '1' : null,
         poll_enable_password: enablePassword !== '' ? enablePassword : null
       };
 
@@ -66,7 +66,7 @@ class AgentController {
     $asset_id = $asset['id'] ?? null;
 
     $currentTimestamp = date('Y-m-d H:i:s');
-    $onlineStatus = ($payload['online_status'] ?? true) ? 'online' : 'offline';
+    $onlineStatus = self::normalizeOnlineStatus($payload['online_status'] ?? true);
 
     $updateData = [
       'last_seen' => $currentTimestamp,
@@ -97,6 +97,12 @@ class AgentController {
       $pollerErrorMessage = trim((string)$pollerMeta['error']);
     }
 
+    // An offline host has nothing to collect; record the status change only
+    if ($onlineStatus === 'offline') {
+      $attributeArray = [];
+      $pollerErrorMessage = null;
+    }
+
     if ($pollerErrorMessage) {
       http_response_code(422);
       echo json_encode([
@@ -184,4 +190,13 @@ class AgentController {
       }
     }
   }
+
+  private static function normalizeOnlineStatus($value) {
+    // Pollers send "online"/"offline" strings; older agents send booleans
+    if (is_bool($value)) {
+      return $value ? 'online' : 'offline';
+    }
+    $text = strtolower(trim((string)$value));
+    return in_array($text, ['offline', 'false', '0', 'no', 'down'], true) ? 'offline' : 'online';
+  }
 }
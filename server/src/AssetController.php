@@ -1,8 +1,11 @@
 <?php
 require_once __DIR__ . '/db.php';
 require_once __DIR__ . '/utils.php';
+require_once __DIR__ . '/PollerController.php';
 
 class AssetController {
+  private const POLL_CREDENTIAL_FIELDS = ['poll_address','poll_type','poll_username','poll_password','poll_port','poll_enable_password','poll_allow_agent','poll_look_for_keys'];
+
   public static function list($search='') {
     $pdo = DB::conn();
     if ($search) {
@@ -157,7 +160,7 @@ class AssetController {
       }
     }
 
-    $stmt = $pdo->prepare("INSERT INTO assets (id,name,type,mac,poll_address,owner_user_id,source,poll_enabled,poll_type,poll_username,poll_password,poll_port,poll_enable_password) VALUES (?,?,?,?,?,?,?,?,?,?,?,?,?)");
+    $stmt = $pdo->prepare("INSERT INTO assets (id,name,type,mac,poll_address,owner_user_id,source,poll_enabled,poll_type,poll_username,poll_password,poll_port,poll_enable_password,poll_interval,poll_allow_agent,poll_look_for_keys) VALUES (?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?)");
     $stmt->execute([
       $id,
       $data['name'] ?? 'Unnamed',
@@ -171,7 +174,10 @@ class AssetController {
       $data['poll_username'] ?? null,
       $data['poll_password'] ?? null,
       $data['poll_port'] ?? null,
-      $data['poll_enable_password'] ?? null
+      $data['poll_enable_password'] ?? null,
+      self::normalizePollInterval($data['poll_interval'] ?? null),
+      self::normalizeOptionalBool($data['poll_allow_agent'] ?? null),
+      self::normalizeOptionalBool($data['poll_look_for_keys'] ?? null)
     ]);
     if (!empty($data['ips'])) self::set_ips($id, $data['ips'], $actor);
     if (!empty($data['attributes'])) self::set_attributes($id, $data['attributes'], $actor);
@@ -186,13 +192,23 @@ class AssetController {
     $old = $stmt->fetch();
     if (!$old) { http_response_code(404); echo json_encode(['error'=>'not_found']); return; }
 
-  $fields = ['name','type','mac','poll_address','owner_user_id','online_status','last_seen','poll_enabled','poll_type','poll_username','poll_password','poll_port','poll_enable_password'];
+  $fields = ['name','type','mac','poll_address','owner_user_id','online_status','last_seen','poll_enabled','poll_type','poll_username','poll_password','poll_port','poll_enable_password','poll_interval','poll_allow_agent','poll_look_for_keys'];
 
     if (array_key_exists('poll_address', $data)) {
       $pollAddress = trim((string)$data['poll_address']);
       $data['poll_address'] = $pollAddress === '' ? null : $pollAddress;
     }
 
+    if (array_key_exists('poll_interval', $data)) {
+      $data['poll_interval'] = self::normalizePollInterval($data['poll_interval']);
+    }
+
+    foreach (['poll_allow_agent', 'poll_look_for_keys'] as $option) {
+      if (array_key_exists($option, $data)) {
+        $data[$option] = self::normalizeOptionalBool($data[$option]);
+      }
+    }
+
     if (array_key_exists('owner_user_id', $data)) {
       $value = $data['owner_user_id'];
       if ($value === '' || $value === null) {
@@ -214,19 +230,43 @@ class AssetController {
     if ($sets) {
       $vals[] = $id;
       $pdo->prepare("UPDATE assets SET " . implode(',', $sets) . " WHERE id=?")->execute($vals);
+      $credentialsChanged = false;
       foreach ($fields as $f) {
         if (array_key_exists($f, $data) && $old[$f] !== $data[$f]) {
           if (!in_array($f, $logIgnoredFields, true)) {
             change_log($id, $_SESSION['user']['username'] ?? $actor, $actor, $f, $old[$f], $data[$f]);
           }
+          if (in_array($f, self::POLL_CREDENTIAL_FIELDS, true) && (string)$old[$f] !== (string)$data[$f]) {
+            $credentialsChanged = true;
+          }
         }
       }
+      // New credentials deserve a fresh attempt instead of waiting out the backoff
+      if ($credentialsChanged) {
+        PollerController::resetBreaker($id);
+      }
     }
     if (isset($data['ips'])) self::set_ips($id, $data['ips'], $actor);
     if (isset($data['attributes'])) self::set_attributes($id, $data['attributes'], $actor);
     echo json_encode(['success'=>true]);
   }
 
+  private static function normalizePollInterval($value) {
+    if ($value === null || $value === '' || !is_numeric($value)) {
+      return null;
+    }
+    $seconds = (int)$value;
+    return $seconds > 0 ? $seconds : null;
+  }
+
+  private static function normalizeOptionalBool($value) {
+    if ($value === null || $value === '') {
+      return null;
+    }
+    $parsed = filter_var($value, FILTER_VALIDATE_BOOLEAN, FILTER_NULL_ON_FAILURE);
+    return $parsed === null ? null : ($parsed ? 1 : 0);
+  }
+
   public static function delete($id) {
     $pdo = DB::conn();
     $pdo->prepare("DELETE FROM assets WHERE id=?")->execute([$id]);
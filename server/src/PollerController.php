@@ -249,6 +249,34 @@ class PollerController {
         'interval' => '30',
         'timeout' => '10', 
         'ping_timeout' => '1',
+        'concurrency' => '1',
+        'engine' => 'threads',
+        'protocol_concurrency' => '{}',
+        'scheduler' => 'cycle',
+        'target_refresh' => '60',
+        'stagger' => 'false',
+        'jitter' => '0',
+        'lease_ttl' => '120',
+        'breaker_threshold' => '3',
+        'breaker_max_backoff' => '3600',
+        'preflight' => 'false',
+        'preflight_timeout' => '0.8',
+        'reachability' => 'auto',
+        'unix_collection' => 'serial',
+        'unix_sftp_reads' => 'false',
+        'cisco_pipeline' => 'false',
+        'cisco_structured_output' => 'true',
+        'cisco_session_pool_size' => '64',
+        'cisco_session_idle' => '300',
+        'cisco_session_keepalive' => '60',
+        'ssh_pool_size' => '256',
+        'ssh_pool_idle' => '300',
+        'ssh_channels' => '8',
+        'ssh_output_limit' => '1048576',
+        'tier_identity_ttl' => '86400',
+        'tier_hardware_ttl' => '86400',
+        'tier_network_ttl' => '3600',
+        'tier_applications_ttl' => '86400',
         'api_url' => 'http://localhost:8080/api.php',
         'api_key' => 'POLLR_ABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789',
         'targets' => '[]'
@@ -277,6 +305,34 @@ class PollerController {
         'interval' => 'Polling interval in seconds',
         'timeout' => 'Connection timeout in seconds',
         'ping_timeout' => 'Ping timeout in seconds', 
+        'concurrency' => 'Maximum number of assets probed in parallel',
+        'engine' => 'Probe execution engine (threads or asyncio)',
+        'protocol_concurrency' => 'Per-protocol probe limits for the asyncio engine (JSON)',
+        'scheduler' => 'Poll scheduling mode (cycle, due or lease)',
+        'target_refresh' => 'Seconds between asset list refreshes in due-time and lease scheduling',
+        'stagger' => 'Spread probe start times by a hash of the asset id',
+        'jitter' => 'Random start-time jitter as a fraction of the interval (0-0.5)',
+        'lease_ttl' => 'Seconds an asset lease is held before another poller may take it over',
+        'breaker_threshold' => 'Consecutive probe failures before an asset is backed off (0 disables)',
+        'breaker_max_backoff' => 'Longest backoff in seconds for a failing asset',
+        'preflight' => 'Check SSH/DCOM/WinRM ports with a quick TCP connect before probing',
+        'preflight_timeout' => 'Seconds to wait for the TCP pre-flight before marking a host offline',
+        'reachability' => 'Online check method: auto (ICMP then TCP), icmp, tcp or dns (legacy)',
+        'unix_collection' => 'How SSH collectors run their commands: batch (one script), parallel (concurrent channels), helper (one script that returns JSON) or serial (one channel per command, the default; also accepted as commands)',
+        'unix_sftp_reads' => 'Read /etc and /proc files over one SFTP channel instead of running cat/grep over exec',
+        'cisco_pipeline' => 'Send all Cisco show commands in one write and split the output by the echoed prompts',
+        'cisco_structured_output' => 'Use "| json" output on Cisco devices that support it (detected once per device) instead of parsing CLI text',
+        'cisco_session_pool_size' => 'Maximum logged-in Cisco CLI sessions kept open between polls (0 logs out after every probe)',
+        'cisco_session_idle' => 'Seconds a kept Cisco session may go unused by probes before it is logged out',
+        'cisco_session_keepalive' => 'Seconds between empty-line keepalives on idle Cisco sessions; keep below the device exec-timeout (0 disables)',
+        'ssh_pool_size' => 'Maximum SSH connections kept open between polls (0 disables pooling)',
+        'ssh_pool_idle' => 'Seconds an unused pooled SSH connection is kept before closing',
+        'ssh_channels' => 'Concurrent exec channels per SSH connection when unix_collection is parallel',
+        'ssh_output_limit' => 'Maximum bytes read from one SSH command before its output is truncated',
+        'tier_identity_ttl' => 'Seconds OS identity facts are reused before being collected again (0 = every poll)',
+        'tier_hardware_ttl' => 'Seconds hardware facts are reused before being collected again (0 = every poll)',
+        'tier_network_ttl' => 'Seconds interface and address data is reused before being collected again (0 = every poll)',
+        'tier_applications_ttl' => 'Seconds the Windows application inventory is reused before being collected again (0 = every poll)',
         'api_url' => 'API endpoint URL',
         'api_key' => 'API authentication key',
         'targets' => 'Polling targets configuration'
@@ -474,6 +530,43 @@ class PollerController {
     }
   }
   
+  public static function getBreakers() {
+    try {
+      $pdo = DB::conn();
+      $stmt = $pdo->query("
+        SELECT b.asset_id, a.name, a.poll_type, a.poll_address,
+               b.consecutive_failures, b.last_error, b.last_failure_at, b.opened_until,
+               CASE
+                 WHEN b.opened_until IS NULL THEN 'closed'
+                 WHEN b.opened_until > NOW() THEN 'open'
+                 ELSE 'half_open'
+               END AS state
+        FROM poller_breakers b
+        JOIN assets a ON a.id = b.asset_id
+        ORDER BY b.consecutive_failures DESC, a.name ASC
+      ");
+      return ['success' => true, 'breakers' => $stmt->fetchAll(PDO::FETCH_ASSOC)];
+    } catch (Exception $e) {
+      return ['success' => false, 'message' => $e->getMessage(), 'breakers' => []];
+    }
+  }
+
+  public static function resetBreaker($assetId) {
+    $assetId = trim((string)$assetId);
+    if ($assetId === '') {
+      return ['success' => false, 'message' => 'Asset id is required'];
+    }
+
+    try {
+      $pdo = DB::conn();
+      $stmt = $pdo->prepare("DELETE FROM poller_breakers WHERE asset_id = ?");
+      $stmt->execute([$assetId]);
+      return ['success' => true, 'reset' => $stmt->rowCount() > 0];
+    } catch (Exception $e) {
+      return ['success' => false, 'message' => $e->getMessage()];
+    }
+  }
+  
   public static function getLogs($since = null) {
     try {
       $pdo = DB::conn();
@@ -0,0 +1,3 @@
+-- Patch: per-asset polling interval used by the due-time poll scheduler
+ALTER TABLE assets
+  ADD COLUMN poll_interval INT NULL AFTER poll_enable_password;
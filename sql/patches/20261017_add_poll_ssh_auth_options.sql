@@ -0,0 +1,4 @@
+-- Patch: per-asset SSH auth options; NULL keeps the poller default
+ALTER TABLE assets
+  ADD COLUMN poll_allow_agent BOOLEAN NULL AFTER poll_interval,
+  ADD COLUMN poll_look_for_keys BOOLEAN NULL AFTER poll_allow_agent;
@@ -0,0 +1,9 @@
+-- Patch: circuit breaker state for persistently failing poll targets
+CREATE TABLE IF NOT EXISTS poller_breakers (
+  asset_id             CHAR(36) NOT NULL PRIMARY KEY,
+  consecutive_failures INT NOT NULL DEFAULT 0,
+  last_error           TEXT NULL,
+  last_failure_at      DATETIME NULL,
+  opened_until         DATETIME NULL, -- NULL while below the failure threshold
+  FOREIGN KEY (asset_id) REFERENCES assets(id) ON DELETE CASCADE
+) ENGINE=InnoDB;
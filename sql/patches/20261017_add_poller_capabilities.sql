@@ -0,0 +1,11 @@
+-- Patch: command variants that worked per asset, so probes skip failing fallbacks
+CREATE TABLE IF NOT EXISTS poller_capabilities (
+  asset_id       CHAR(36) NOT NULL,
+  capability     VARCHAR(64) NOT NULL,
+  variant        VARCHAR(255) NOT NULL,
+  os_family      VARCHAR(64) NULL,
+  kernel_release VARCHAR(128) NULL, -- entries are dropped when OS family or kernel changes
+  updated_at     DATETIME NOT NULL,
+  PRIMARY KEY (asset_id, capability),
+  FOREIGN KEY (asset_id) REFERENCES assets(id) ON DELETE CASCADE
+) ENGINE=InnoDB;
@@ -0,0 +1,13 @@
+-- Patch: shared lease queue so several named pollers can split the polled fleet
+CREATE TABLE IF NOT EXISTS poller_leases (
+  asset_id       CHAR(36) NOT NULL PRIMARY KEY,
+  poller_name    VARCHAR(100) NULL,
+  lease_token    CHAR(32) NULL,
+  lease_expires  DATETIME NULL,
+  acquired_at    DATETIME NULL,
+  last_polled_at DATETIME NULL,
+  next_due_at    DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+  INDEX idx_poller_leases_due (next_due_at),
+  INDEX idx_poller_leases_owner (poller_name, lease_token),
+  FOREIGN KEY (asset_id) REFERENCES assets(id) ON DELETE CASCADE
+) ENGINE=InnoDB;
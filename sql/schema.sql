@@ -27,6 +27,9 @@ CREATE TABLE IF NOT EXISTS assets (
   poll_password VARCHAR(190),
   poll_port     INT NULL,
   poll_enable_password VARCHAR(255),
+  poll_interval INT NULL, -- seconds; NULL uses the poller.interval setting
+  poll_allow_agent   BOOLEAN NULL, -- SSH agent keys; NULL uses the poller default
+  poll_look_for_keys BOOLEAN NULL, -- ~/.ssh keys on the poller; NULL uses the poller default
   owner_user_id BIGINT,
   online_status ENUM('online','offline','unknown') DEFAULT 'unknown',
   last_seen     DATETIME NULL,
@@ -58,6 +61,42 @@ CREATE TABLE IF NOT EXISTS asset_attributes (
   FOREIGN KEY (asset_id) REFERENCES assets(id) ON DELETE CASCADE
 ) ENGINE=InnoDB;
 
+-- Poller lease queue (poller.scheduler = lease)
+CREATE TABLE IF NOT EXISTS poller_leases (
+  asset_id       CHAR(36) NOT NULL PRIMARY KEY,
+  poller_name    VARCHAR(100) NULL,
+  lease_token    CHAR(32) NULL,
+  lease_expires  DATETIME NULL,
+  acquired_at    DATETIME NULL,
+  last_polled_at DATETIME NULL,
+  next_due_at    DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+  INDEX idx_poller_leases_due (next_due_at),
+  INDEX idx_poller_leases_owner (poller_name, lease_token),
+  FOREIGN KEY (asset_id) REFERENCES assets(id) ON DELETE CASCADE
+) ENGINE=InnoDB;
+
+-- Poller circuit breakers (consecutive probe failures per asset)
+CREATE TABLE IF NOT EXISTS poller_breakers (
+  asset_id             CHAR(36) NOT NULL PRIMARY KEY,
+  consecutive_failures INT NOT NULL DEFAULT 0,
+  last_error           TEXT NULL,
+  last_failure_at      DATETIME NULL,
+  opened_until         DATETIME NULL, -- NULL while below the failure threshold
+  FOREIGN KEY (asset_id) REFERENCES assets(id) ON DELETE CASCADE
+) ENGINE=InnoDB;
+
+-- Poller command capabilities (working command variant per asset)
+CREATE TABLE IF NOT EXISTS poller_capabilities (
+  asset_id       CHAR(36) NOT NULL,
+  capability     VARCHAR(64) NOT NULL,
+  variant        VARCHAR(255) NOT NULL,
+  os_family      VARCHAR(64) NULL,
+  kernel_release VARCHAR(128) NULL, -- entries are dropped when OS family or kernel changes
+  updated_at     DATETIME NOT NULL,
+  PRIMARY KEY (asset_id, capability),
+  FOREIGN KEY (asset_id) REFERENCES assets(id) ON DELETE CASCADE
+) ENGINE=InnoDB;
+
 -- Change Log / Timeline
 CREATE TABLE IF NOT EXISTS changes (
   id          BIGINT PRIMARY KEY AUTO_INCREMENT,